@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Batch execution for Gemini agents.
+Packages many agent invocations into one asynchronous batch job, polls for
+completion and returns the responses in request order.
+"""
+
+import json
+import tempfile
+import time
+from pathlib import Path
+
+# Batch job states (names as reported by the google-genai SDK)
+COMPLETED_STATES = {"JOB_STATE_SUCCEEDED", "JOB_STATE_FAILED", "JOB_STATE_CANCELLED", "JOB_STATE_EXPIRED"}
+
+GENERATION_CONFIG = {"temperature": 0.2, "topP": 0.95, "maxOutputTokens": 8192}
+
+
+def build_request_line(key, system_instruction, prompt):
+    """Builds one JSONL line of a Gemini batch input file."""
+    return {
+        "key": key,
+        "request": {
+            "contents": [{"role": "user", "parts": [{"text": prompt}]}],
+            "systemInstruction": {"parts": [{"text": system_instruction}]},
+            "generationConfig": GENERATION_CONFIG,
+        },
+    }
+
+
+def response_text(response):
+    """Extracts text from a GenerateContentResponse JSON object."""
+    candidates = (response or {}).get("candidates") or []
+    if not candidates:
+        return None
+    parts = (candidates[0].get("content") or {}).get("parts") or []
+    text = "".join(part.get("text", "") for part in parts)
+    return text or None
+
+
+class GeminiBatchBackend:
+    """Gemini Batch API backend (file-based JSONL input and output)."""
+
+    def __init__(self, client, model_id):
+        self.client = client
+        self.model_id = model_id
+
+    def submit(self, requests, display_name="agent-batch"):
+        """Uploads requests as JSONL and creates a batch job. Returns the job name."""
+        from google.genai import types
+
+        with tempfile.NamedTemporaryFile("w", suffix=".jsonl", delete=False, encoding="utf-8") as f:
+            for request in requests:
+                f.write(json.dumps(build_request_line(**request), ensure_ascii=False) + "\n")
+            input_path = f.name
+
+        try:
+            uploaded = self.client.files.upload(
+                file=input_path,
+                config=types.UploadFileConfig(display_name=display_name, mime_type="jsonl"),
+            )
+        finally:
+            Path(input_path).unlink(missing_ok=True)
+
+        job = self.client.batches.create(
+            model=self.model_id,
+            src=uploaded.name,
+            config={"display_name": display_name},
+        )
+        return job.name
+
+    def state(self, job_name):
+        """Returns the job state name, e.g. 'JOB_STATE_RUNNING'."""
+        return self.client.batches.get(name=job_name).state.name
+
+    def results(self, job_name):
+        """Returns {key: response text or None} for a completed job."""
+        job = self.client.batches.get(name=job_name)
+        if job.state.name != "JOB_STATE_SUCCEEDED" or not job.dest or not job.dest.file_name:
+            return {}
+
+        content = self.client.files.download(file=job.dest.file_name).decode("utf-8")
+        results = {}
+        for line in content.splitlines():
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            if item.get("error"):
+                print(f"❌ Batch request {item.get('key')} failed: {item['error']}")
+                results[item.get("key")] = None
+            else:
+                results[item.get("key")] = response_text(item.get("response"))
+        return results
+
+
+class FakeBatchBackend:
+    """
+    Local in-memory backend for testing batch mode without API calls.
+
+    Jobs report JOB_STATE_RUNNING for `polls_until_done` polls, then succeed.
+    `responder(request)` produces each response text.
+    """
+
+    def __init__(self, responder=None, polls_until_done=1):
+        self.responder = responder or self.default_responder
+        self.polls_until_done = polls_until_done
+        self.jobs = {}
+
+    @staticmethod
+    def default_responder(request):
+        return json.dumps({"key": request["key"], "notes": "fake batch response"})
+
+    def submit(self, requests, display_name="agent-batch"):
+        job_name = f"batches/fake-{len(self.jobs) + 1}"
+        self.jobs[job_name] = {"requests": list(requests), "polls": 0}
+        return job_name
+
+    def state(self, job_name):
+        job = self.jobs[job_name]
+        job["polls"] += 1
+        return "JOB_STATE_SUCCEEDED" if job["polls"] > self.polls_until_done else "JOB_STATE_RUNNING"
+
+    def results(self, job_name):
+        return {r["key"]: self.responder(r) for r in self.jobs[job_name]["requests"]}
+
+
+def run_batch(backend, requests, poll_interval=30.0, timeout=None, display_name="agent-batch"):
+    """
+    Submits requests as one batch job and waits for completion.
+
+    Args:
+        backend: GeminiBatchBackend or FakeBatchBackend
+        requests: List of {'key', 'system_instruction', 'prompt'} dictionaries
+        poll_interval: Seconds between state polls
+        timeout: Maximum seconds to wait (None = no limit)
+
+    Returns:
+        Response texts in request order (None for failed requests)
+    """
+    if not requests:
+        return []
+
+    job_name = backend.submit(requests, display_name=display_name)
+    print(f"📦 Submitted batch job {job_name} with {len(requests)} requests")
+
+    started = time.monotonic()
+    state = backend.state(job_name)
+    while state not in COMPLETED_STATES:
+        if timeout is not None and time.monotonic() - started > timeout:
+            print(f"❌ Batch job {job_name} still {state} after {timeout:.0f}s")
+            return [None] * len(requests)
+        time.sleep(poll_interval)
+        state = backend.state(job_name)
+
+    print(f"📦 Batch job {job_name} finished: {state} ({time.monotonic() - started:.0f}s)")
+    results = backend.results(job_name)
+    return [results.get(r["key"]) for r in requests]
@@ -5,18 +5,37 @@
 """
 
 import os
+import re
 import sys
+import json
 import argparse
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# Shared article_search toolkit lives in tools/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "tools"))
 
-try:
-    from google import genai
-    from google.genai import types
-except ImportError:
-    print("Error: 'google-genai' package is not installed.")
-    print("Please install it using: pip install google-genai")
-    sys.exit(1)
+from article_search.text_extractor import TextCache, update_text_cache, chunk_text, DEFAULT_TEXT_CACHE
+from gemini_batch import GeminiBatchBackend, FakeBatchBackend, run_batch
+from quota_policy import QuotaPolicy, DEFAULT_FALLBACK_MODELS
+
+
+def load_genai():
+    """
+    Imports the google-genai SDK on first use.
+
+    The SDK takes a noticeable share of startup time, so --help and runs
+    that never call the API (e.g. --batch-backend fake) skip loading it.
+    """
+    try:
+        from google import genai
+        from google.genai import types
+    except ImportError:
+        print("Error: 'google-genai' package is not installed.")
+        print("Please install it using: pip install google-genai")
+        sys.exit(1)
+    return genai, types
 
 
 def check_api_keys():
@@ -43,6 +62,7 @@ def list_available_models():
     print("\n📋 Fetching available models...\n")
     
     try:
+        genai, _ = load_genai()
         api_key = check_api_keys()
         client = genai.Client(api_key=api_key)
         
@@ -130,20 +150,21 @@ def load_gem_instruction(gem_name):
     return gem_path.read_text(encoding="utf-8")
 
 
-def run_agent(agent_name, input_context, output_file=None, model_id="gemini-2.5-flash"):
-    """Runs a specific agent with the provided input context."""
-    print(f"🤖 Invoking Agent: {agent_name} using {model_id}...")
-    
-    # Initialize client
+def create_client():
+    """Creates a Gemini client from the configured API key."""
+    genai, _ = load_genai()
     api_key = check_api_keys()
-    client = genai.Client(api_key=api_key)
-    
-    try:
-        system_instruction = load_gem_instruction(agent_name)
-    except FileNotFoundError as e:
-        print(f"❌ {e}")
-        return None
-    
+    return genai.Client(api_key=api_key)
+
+
+def generate_content(client, model_id, system_instruction, prompt, policy=None, label=None):
+    """
+    Sends one prompt to the model and returns the response text.
+
+    With a QuotaPolicy, quota/overload errors are retried and may fall back
+    to other models in the policy's chain.
+    """
+    _, types = load_genai()
     config = types.GenerateContentConfig(
         system_instruction=system_instruction,
         temperature=0.2,
@@ -151,27 +172,101 @@ def run_agent(agent_name, input_context, output_file=None, model_id="gemini-2.5-
         max_output_tokens=8192,
     )
 
-    prompt = f"CONTEXT:\n{input_context}\n\nTASK:\nPerform your role as defined."
-    
-    try:
+    def call(model):
         response = client.models.generate_content(
-            model=model_id,
+            model=model,
             contents=prompt,
             config=config
         )
-        content = response.text
-        
-        if output_file:
-            directory = os.path.dirname(output_file)
-            if directory:
-                os.makedirs(directory, exist_ok=True)
-            with open(output_file, "w", encoding="utf-8") as f:
-                f.write(content)
-            print(f"✅ Output saved to {output_file}")
-        else:
-            print("Output:")
-            print(content)
-            
+        return response.text
+
+    if policy is None:
+        return call(model_id)
+    return policy.call(call, label=label or model_id, preferred=model_id)
+
+
+def generate_many(client, model_id, system_instruction, prompts, max_concurrency=8, policy=None):
+    """
+    Runs independent prompts in parallel with a concurrency cap.
+
+    Returns the response texts in prompt order; failed calls yield None.
+    """
+    def call(item):
+        index, prompt = item
+        try:
+            return generate_content(client, model_id, system_instruction, prompt,
+                                    policy=policy, label=f"call {index + 1}/{len(prompts)}")
+        except Exception as e:
+            print(f"❌ Call {index + 1}/{len(prompts)} failed: {e}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as executor:
+        return list(executor.map(call, enumerate(prompts)))
+
+
+def interactive_runner(model_id, max_concurrency=8, policy=None):
+    """Returns runner(system_instruction, prompts) using parallel interactive calls."""
+    client = create_client()
+    return lambda system_instruction, prompts: generate_many(
+        client, model_id, system_instruction, prompts, max_concurrency, policy
+    )
+
+
+def batch_runner(backend, poll_interval=30.0):
+    """Returns runner(system_instruction, prompts) submitting all prompts as one batch job."""
+    def runner(system_instruction, prompts):
+        requests = [
+            {"key": f"req-{i}", "system_instruction": system_instruction, "prompt": prompt}
+            for i, prompt in enumerate(prompts)
+        ]
+        return run_batch(backend, requests, poll_interval=poll_interval)
+    return runner
+
+
+def save_output(content, output_file=None):
+    """Writes agent output to a file (creating directories) or prints it."""
+    if output_file:
+        directory = os.path.dirname(output_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(output_file, "w", encoding="utf-8") as f:
+            f.write(content)
+        print(f"✅ Output saved to {output_file}")
+    else:
+        print("Output:")
+        print(content)
+
+
+def agent_prompt(input_context):
+    """Wraps agent input context into the standard task prompt."""
+    return f"CONTEXT:\n{input_context}\n\nTASK:\nPerform your role as defined."
+
+
+def run_agent(agent_name, input_context, output_file=None, model_id="gemini-2.5-flash", policy=None):
+    """
+    Runs a specific agent with the provided input context.
+
+    Quota (429) and overload (503) errors are retried with backoff and model
+    fallback by the policy (a single-model policy is used if none is given).
+    """
+    print(f"🤖 Invoking Agent: {agent_name} using {model_id}...")
+    
+    # Initialize client
+    client = create_client()
+    
+    try:
+        system_instruction = load_gem_instruction(agent_name)
+    except FileNotFoundError as e:
+        print(f"❌ {e}")
+        return None
+
+    prompt = agent_prompt(input_context)
+    if policy is None:
+        policy = QuotaPolicy([model_id])
+    
+    try:
+        content = generate_content(client, model_id, system_instruction, prompt, policy=policy, label=agent_name)
+        save_output(content, output_file)
         return content
         
     except Exception as e:
@@ -181,7 +276,7 @@ def run_agent(agent_name, input_context, output_file=None, model_id="gemini-2.5-
         if "429" in error_msg or "RESOURCE_EXHAUSTED" in error_msg:
             print("\n💡 Quota exceeded. Solutions:")
             print("   1. Wait for quota to reset (shown in error message)")
-            print("   2. Switch to a different model (gemini-1.5-flash has higher quotas)")
+            print("   2. Add fallbacks with --fallback-models (gemini-1.5-flash has higher quotas)")
             print("   3. Upgrade to paid tier: https://ai.google.dev/pricing")
             print("   4. Use --list-models to see what's available")
         elif "503" in error_msg or "UNAVAILABLE" in error_msg:
@@ -198,6 +293,192 @@ def run_agent(agent_name, input_context, output_file=None, model_id="gemini-2.5-
         return None
 
 
+def run_agents_batch(jobs, backend, poll_interval=30.0):
+    """
+    Runs several agent invocations as one batch job.
+
+    Args:
+        jobs: List of (agent_name, input_context, output_file) tuples
+        backend: Batch backend (see gemini_batch)
+        poll_interval: Seconds between job state polls
+
+    Returns:
+        List of output texts in job order (None for failed jobs)
+    """
+    requests = []
+    for i, (agent_name, input_context, _) in enumerate(jobs):
+        requests.append({
+            "key": f"{agent_name}-{i}",
+            "system_instruction": load_gem_instruction(agent_name),
+            "prompt": agent_prompt(input_context),
+        })
+
+    results = run_batch(backend, requests, poll_interval=poll_interval)
+    for (agent_name, _, output_file), content in zip(jobs, results):
+        if content is None:
+            print(f"❌ Batch job for agent {agent_name} returned no output")
+            continue
+        save_output(content, output_file)
+    return results
+
+
+ANALYZER_MAP_TASK = """You are reading part {index} of {total} of the paper file "{name}".
+Extract notes from THIS PART ONLY. Return ONLY valid JSON with keys:
+"title", "authors", "publication", "models", "datasets", "approach", "baselines",
+"metrics", "key_findings", "limitations", "key_citations", "notes".
+Use empty strings or lists for anything not present in this part."""
+
+ANALYZER_REDUCE_TASK = """Below are partial notes extracted from consecutive parts of the paper file "{name}".
+Merge them into a single analysis of the whole paper.
+
+TASK:
+Perform your role as defined. Return ONLY valid JSON matching your output schema."""
+
+
+def parse_json_response(text):
+    """Parses a JSON object from a model response, tolerating markdown fences."""
+    if not text:
+        return None
+    cleaned = re.sub(r"^```(?:json)?\s*|\s*```$", "", text.strip())
+    try:
+        return json.loads(cleaned)
+    except json.JSONDecodeError:
+        # Fall back to the outermost object in the response
+        start, end = cleaned.find("{"), cleaned.rfind("}")
+        if start == -1 or end <= start:
+            return None
+        try:
+            return json.loads(cleaned[start:end + 1])
+        except json.JSONDecodeError:
+            return None
+
+
+def citation_key(analysis, existing_keys):
+    """Builds a unique 'Surname2023' key matching papers_analyzed.json."""
+    authors = analysis.get("authors") or ["Unknown"]
+    first = str(authors[0])
+    surname = first.split(",")[0] if "," in first else first.split()[-1] if first.split() else "Unknown"
+    surname = re.sub(r"[^A-Za-z]", "", surname) or "Unknown"
+
+    publication = analysis.get("publication") or {}
+    year = analysis.get("year") or publication.get("year") or "NoDate"
+
+    base = f"{surname}{year}"
+    key = base
+    suffix = ord("a")
+    while key in existing_keys:
+        key = f"{base}{chr(suffix)}"
+        suffix += 1
+    return key
+
+
+def to_analysis_entry(analysis, pdf_path):
+    """Adds the flat fields used by existing papers_analyzed.json entries."""
+    entry = dict(analysis)
+    publication = entry.get("publication") or {}
+    entry.setdefault("year", publication.get("year"))
+    entry.setdefault("journal", publication.get("venue"))
+    entry["source_pdf"] = str(pdf_path)
+    return entry
+
+
+def analyze_papers(pdf_paths, config, runner, chunk_tokens=6000, text_cache=DEFAULT_TEXT_CACHE,
+                   extract_workers=None, retry_failed=False):
+    """
+    Map-reduce analysis of PDFs with the analyzer gem.
+
+    Text comes from the shared page-level extraction cache, so only new or
+    changed PDFs are parsed. Each paper is split into token-bounded chunks; chunk notes are extracted
+    in parallel (map) and merged into one schema-conforming analysis per paper
+    (reduce). Papers that fit into a single chunk are analyzed in one call.
+
+    Args:
+        runner: Callable(system_instruction, prompts) -> responses, from
+            interactive_runner or batch_runner
+
+    Returns:
+        Dict mapping PDF path to parsed analysis (None if the paper failed)
+    """
+    system_instruction = load_gem_instruction("analyzer")
+
+    # Extract (cached) and chunk
+    paper_chunks = {}
+    with TextCache(text_cache) as cache:
+        hashes = update_text_cache(pdf_paths, cache, workers=extract_workers,
+                                   retry_failed=retry_failed)
+        for pdf_path in pdf_paths:
+            if str(pdf_path) not in hashes:
+                print(f"❌ Text extraction failed: {pdf_path}")
+                continue
+            chunks = chunk_text(cache.get_text(hashes[str(pdf_path)]), max_tokens=chunk_tokens)
+            if chunks:
+                paper_chunks[pdf_path] = chunks
+            else:
+                print(f"⚠️  No extractable text: {pdf_path}")
+
+    # Map: notes for every chunk of every multi-chunk paper in one parallel pass
+    map_jobs = [
+        (pdf_path, ANALYZER_MAP_TASK.format(index=i, total=len(chunks), name=Path(pdf_path).name) + f"\n\nTEXT:\n{chunk}")
+        for pdf_path, chunks in paper_chunks.items() if len(chunks) > 1
+        for i, chunk in enumerate(chunks, 1)
+    ]
+    print(f"🗺️  Map: {len(map_jobs)} chunk calls across {len(paper_chunks)} papers")
+    map_results = runner(system_instruction, [p for _, p in map_jobs]) if map_jobs else []
+
+    notes = {}
+    for (pdf_path, _), result in zip(map_jobs, map_results):
+        notes.setdefault(pdf_path, []).append(result or "{}")
+
+    # Reduce: one call per paper
+    reduce_paths = list(paper_chunks)
+    reduce_prompts = []
+    for pdf_path in reduce_paths:
+        if pdf_path in notes:
+            parts = "\n\n".join(f"--- PART {i} ---\n{n}" for i, n in enumerate(notes[pdf_path], 1))
+            reduce_prompts.append(
+                f"CONTEXT:\nResearch Config:\n{config}\n\n"
+                + ANALYZER_REDUCE_TASK.format(name=Path(pdf_path).name)
+                + f"\n\nPARTIAL NOTES:\n{parts}"
+            )
+        else:
+            reduce_prompts.append(
+                f"CONTEXT:\nResearch Config:\n{config}\n\nPaper file: {Path(pdf_path).name}\n\n"
+                f"TEXT:\n{paper_chunks[pdf_path][0]}\n\nTASK:\nPerform your role as defined."
+            )
+    print(f"🧩 Reduce: {len(reduce_prompts)} paper calls")
+    reduce_results = runner(system_instruction, reduce_prompts)
+
+    analyses = {}
+    for pdf_path, result in zip(reduce_paths, reduce_results):
+        analyses[pdf_path] = parse_json_response(result)
+        if analyses[pdf_path] is None:
+            print(f"⚠️  Invalid analysis JSON for {pdf_path}")
+    return analyses
+
+
+def write_analyses(analyses, output_file):
+    """Merges per-paper analyses into papers_analyzed.json, keeping existing entries."""
+    output_path = Path(output_file)
+    existing = {}
+    if output_path.exists():
+        try:
+            existing = json.loads(output_path.read_text(encoding="utf-8"))
+        except json.JSONDecodeError:
+            print(f"⚠️  Existing {output_path} is not valid JSON, overwriting")
+
+    # Re-analyzed PDFs replace their previous entries
+    analyzed = {str(p) for p, a in analyses.items() if a}
+    existing = {k: v for k, v in existing.items() if v.get("source_pdf") not in analyzed}
+
+    for pdf_path, analysis in analyses.items():
+        if analysis:
+            existing[citation_key(analysis, existing)] = to_analysis_entry(analysis, pdf_path)
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(json.dumps(existing, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"✅ {len(analyzed)} analyses saved to {output_path}")
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Gemini Scientific Article Orchestrator",
@@ -215,6 +496,12 @@ def main():
   
   # Run with Gemini 1.5 Flash (older, higher quotas)
   python3 gems/orchestrator_gemini.py --agent writer-intro --model gemini-1.5-flash
+  
+  # Re-analyze all PDFs as asynchronous batch jobs (no per-minute quota)
+  python3 gems/orchestrator_gemini.py --agent analyzer --batch
+
+  # Dry-run the pipeline with the local fake backend (outputs go to a scratch directory)
+  python3 gems/orchestrator_gemini.py --agent analyzer --batch --batch-backend fake --output-root /tmp/fake-run
         """
     )
     
@@ -235,6 +522,89 @@ def main():
         help="List all available models for your API key"
     )
     
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=8,
+        help="Maximum parallel model calls for the analyzer (default: 8)"
+    )
+    
+    parser.add_argument(
+        "--chunk-tokens",
+        type=int,
+        default=6000,
+        help="Maximum estimated tokens per analyzer text chunk (default: 6000)"
+    )
+    
+    parser.add_argument(
+        "--text-cache",
+        type=Path,
+        default=DEFAULT_TEXT_CACHE,
+        help=f"Extracted PDF text cache (default: {DEFAULT_TEXT_CACHE})"
+    )
+    
+    parser.add_argument(
+        "--extract-workers",
+        type=int,
+        default=None,
+        help="Processes for PDF text extraction (default: CPU count)"
+    )
+    
+    parser.add_argument(
+        "--retry-failed",
+        action="store_true",
+        help="Extract PDFs again whose text extraction failed in an earlier run"
+    )
+    
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Submit calls as one asynchronous batch job instead of interactive requests"
+    )
+    
+    parser.add_argument(
+        "--batch-backend",
+        choices=["gemini", "fake"],
+        default="gemini",
+        help="Batch backend: Gemini Batch API or local fake for testing (default: gemini)"
+    )
+    
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=30.0,
+        help="Seconds between batch job status polls (default: 30)"
+    )
+    
+    parser.add_argument(
+        "--output-root",
+        type=Path,
+        default=None,
+        help="Directory for analysis/, sections/, review/ and final_manuscript.md "
+             "(default: current directory; a new temporary directory with --batch-backend fake)"
+    )
+    
+    parser.add_argument(
+        "--fallback-models",
+        nargs="*",
+        default=DEFAULT_FALLBACK_MODELS,
+        help=f"Models tried in order when --model is out of quota or overloaded (default: {' '.join(DEFAULT_FALLBACK_MODELS)})"
+    )
+    
+    parser.add_argument(
+        "--max-retries",
+        type=int,
+        default=6,
+        help="Maximum attempts per call across the model chain (default: 6)"
+    )
+    
+    parser.add_argument(
+        "--run-log",
+        type=Path,
+        default=Path("logs/agent_runs.jsonl"),
+        help="JSONL log of which model served each call (default: logs/agent_runs.jsonl)"
+    )
+    
     args = parser.parse_args()
     
     # Handle --list-models flag
@@ -247,61 +617,103 @@ def main():
     def read_if_exists(path):
         return Path(path).read_text(encoding="utf-8") if Path(path).exists() else ""
 
+    # Placeholder output of the fake backend must never reach the real analysis and manuscript files
+    fake = args.batch and args.batch_backend == "fake"
+    output_root = args.output_root
+    if fake and output_root is None:
+        output_root = Path(tempfile.mkdtemp(prefix="fake-batch-"))
+    output_root = output_root or Path(".")
+    if fake and output_root.resolve() == Path.cwd().resolve():
+        print("❌ --batch-backend fake cannot write to the project directory; choose another --output-root")
+        return
+    if output_root != Path("."):
+        print(f"📁 Outputs go to {output_root}")
+
+    def output_path(path):
+        return str(output_root / path)
+
     # Load common data
     config = read_if_exists("input/research_config.md")
-    analysis = read_if_exists("analysis/papers_analyzed.json")
+    analysis = read_if_exists(output_path("analysis/papers_analyzed.json"))
+
+    policy = QuotaPolicy([args.model] + args.fallback_models, max_attempts=args.max_retries, run_log=args.run_log)
+
+    backend = None
+    if args.batch:
+        if args.batch_backend == "fake":
+            backend = FakeBatchBackend()
+        else:
+            backend = GeminiBatchBackend(create_client(), args.model)
+
+    def invoke(agent_name, context, output_file):
+        if backend is not None:
+            print(f"🤖 Invoking Agent: {agent_name} via batch ({args.batch_backend})...")
+            run_agents_batch([(agent_name, context, output_file)], backend, args.poll_interval)
+        else:
+            run_agent(agent_name, context, output_file, model_id=args.model, policy=policy)
 
     # Dispatch based on agent
     if args.agent == "analyzer":
-        # In a real scenario, we would read PDF text here. 
-        # For this context, we pass the file list and config.
-        import glob
-        pdf_list = glob.glob("papers/downloaded/*.pdf")
-        context = f"Research Config:\n{config}\n\nFiles to analyze: {pdf_list}\n(Note: This agent expects extracted text from PDFs. Ensure text is provided or extracted.)"
-        run_agent("analyzer", context, "analysis/papers_analyzed.json", model_id=args.model)
+        pdf_list = sorted(Path("papers/downloaded").glob("*.pdf"))
+        if not pdf_list:
+            print("❌ No PDFs found in papers/downloaded/")
+            return
+        print(f"🤖 Invoking Agent: analyzer using {args.model} on {len(pdf_list)} PDFs...")
+        if backend is not None:
+            runner = batch_runner(backend, args.poll_interval)
+        else:
+            runner = interactive_runner(args.model, args.max_concurrency, policy)
+        analyses = analyze_papers(
+            pdf_list, config, runner,
+            chunk_tokens=args.chunk_tokens,
+            text_cache=args.text_cache,
+            extract_workers=args.extract_workers,
+            retry_failed=args.retry_failed
+        )
+        write_analyses(analyses, output_path("analysis/papers_analyzed.json"))
 
     elif args.agent == "writer-intro":
         context = f"Research Config:\n{config}\n\nAnalysis Data:\n{analysis}"
-        run_agent("writer-intro", context, "sections/introduction.md", model_id=args.model)
+        invoke("writer-intro", context, output_path("sections/introduction.md"))
 
     elif args.agent == "writer-methods":
-        intro = read_if_exists("sections/introduction.md")
+        intro = read_if_exists(output_path("sections/introduction.md"))
         context = f"Research Config:\n{config}\n\nAnalysis Data:\n{analysis}\n\nContext - Introduction:\n{intro}"
-        run_agent("writer-methods", context, "sections/methods.md", model_id=args.model)
+        invoke("writer-methods", context, output_path("sections/methods.md"))
 
     elif args.agent == "writer-results":
-        methods = read_if_exists("sections/methods.md")
+        methods = read_if_exists(output_path("sections/methods.md"))
         context = f"Research Config:\n{config}\n\nAnalysis Data:\n{analysis}\n\nContext - Methods:\n{methods}"
-        run_agent("writer-results", context, "sections/results.md", model_id=args.model)
+        invoke("writer-results", context, output_path("sections/results.md"))
 
     elif args.agent == "writer-discussion":
-        intro = read_if_exists("sections/introduction.md")
-        results = read_if_exists("sections/results.md")
+        intro = read_if_exists(output_path("sections/introduction.md"))
+        results = read_if_exists(output_path("sections/results.md"))
         context = f"Research Config:\n{config}\n\nContext - Introduction:\n{intro}\n\nContext - Results:\n{results}"
-        run_agent("writer-discussion", context, "sections/discussion.md", model_id=args.model)
+        invoke("writer-discussion", context, output_path("sections/discussion.md"))
 
     elif args.agent == "reviewer":
         # Load all available sections
         full_draft = ""
         for sec in ["introduction", "methods", "results", "discussion"]:
-            content = read_if_exists(f"sections/{sec}.md")
+            content = read_if_exists(output_path(f"sections/{sec}.md"))
             if content:
                 full_draft += f"\n\n--- SECTION: {sec.upper()} ---\n{content}"
         
         context = f"Research Config:\n{config}\n\nFull Draft to Review:\n{full_draft}"
-        run_agent("reviewer", context, "review/feedback.md", model_id=args.model)
+        invoke("reviewer", context, output_path("review/feedback.md"))
 
     elif args.agent == "editor":
         # Load draft and feedback
         full_draft = ""
         for sec in ["introduction", "methods", "results", "discussion"]:
-            content = read_if_exists(f"sections/{sec}.md")
+            content = read_if_exists(output_path(f"sections/{sec}.md"))
             if content:
                 full_draft += f"\n\n--- SECTION: {sec.upper()} ---\n{content}"
         
-        feedback = read_if_exists("review/feedback.md")
+        feedback = read_if_exists(output_path("review/feedback.md"))
         context = f"Research Config:\n{config}\n\nFull Draft:\n{full_draft}\n\nReviewer Feedback:\n{feedback}"
-        run_agent("editor", context, "final_manuscript.md", model_id=args.model)
+        invoke("editor", context, output_path("final_manuscript.md"))
 
     else:
         parser.print_help()
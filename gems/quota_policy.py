@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Quota-aware retry and model fallback for Gemini calls.
+Retries 429/503 errors with the server-provided or jittered exponential
+delay, tracks per-model quota per time window (minute, hour, day), falls
+back through a model chain and records which model actually served each call.
+"""
+
+import json
+import random
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+
+DEFAULT_FALLBACK_MODELS = ["gemini-1.5-flash"]
+QUOTA_WINDOW = 60.0  # Window assumed when a quota error doesn't name one
+QUOTA_WINDOWS = {"PerMinute": 60.0, "PerHour": 3600.0, "PerDay": 86400.0}
+
+_RETRY_DELAY_PATTERNS = [
+    re.compile(r"retryDelay['\"]?\s*[:=]\s*['\"]?(\d+(?:\.\d+)?)s"),
+    re.compile(r"retry in (\d+(?:\.\d+)?)\s*s", re.IGNORECASE),
+    re.compile(r"retry after (\d+(?:\.\d+)?)\s*sec", re.IGNORECASE),
+]
+_QUOTA_ID_PATTERN = re.compile(r"quotaId['\"]?\s*[:=]\s*['\"]?([\w.-]+)")
+_QUOTA_VALUE_PATTERN = re.compile(r"quotaValue['\"]?\s*[:=]\s*['\"]?(\d+)")
+
+
+def classify_error(error):
+    """Returns 'quota', 'unavailable', 'not_found' or None for other errors."""
+    message = str(error)
+    if "429" in message or "RESOURCE_EXHAUSTED" in message:
+        return "quota"
+    if "503" in message or "UNAVAILABLE" in message:
+        return "unavailable"
+    if "404" in message or "NOT_FOUND" in message:
+        return "not_found"
+    return None
+
+
+def parse_retry_delay(error):
+    """Extracts the server-suggested retry delay in seconds, if present."""
+    message = str(error)
+    for pattern in _RETRY_DELAY_PATTERNS:
+        match = pattern.search(message)
+        if match:
+            return float(match.group(1))
+    return None
+
+
+def quota_window(quota_id):
+    """Window in seconds of a quota id such as 'GenerateRequestsPerDayPerProjectPerModel'."""
+    for marker, window in QUOTA_WINDOWS.items():
+        if marker in quota_id:
+            return window
+    return QUOTA_WINDOW
+
+
+def parse_quota_violations(error):
+    """
+    Extracts the violated quotas of a quota error.
+
+    Returns:
+        List of (quota_id, window_seconds, request_limit) tuples; request_limit
+        is None for token quotas or when no quotaValue is reported
+    """
+    message = str(error)
+    ids = list(_QUOTA_ID_PATTERN.finditer(message))
+    violations = []
+    for i, match in enumerate(ids):
+        quota_id = match.group(1)
+        end = ids[i + 1].start() if i + 1 < len(ids) else len(message)
+        value = _QUOTA_VALUE_PATTERN.search(message, match.end(), end)
+        limit = int(value.group(1)) if value and "Token" not in quota_id else None
+        violations.append((quota_id, quota_window(quota_id), limit))
+    if not violations:
+        # Older error format: a bare quotaValue, taken as a per-minute request limit
+        value = _QUOTA_VALUE_PATTERN.search(message)
+        if value:
+            violations.append(("", QUOTA_WINDOW, int(value.group(1))))
+    return violations
+
+
+class QuotaPolicy:
+    """
+    Retry/fallback policy shared by all calls of a run (thread-safe).
+
+    Each model keeps a cooldown deadline, a log of recent call timestamps
+    and, once quota errors report them, its request limit per window. A
+    per-minute quota is retried after the server delay; an exhausted hourly
+    or daily quota puts the model aside for the whole window, so calls move
+    on to the fallback models. Calls go to the first model in the chain with
+    remaining quota, and a call fails instead of waiting longer than
+    max_delay for a model to free up.
+    """
+
+    def __init__(self, model_chain, max_attempts=6, base_delay=2.0, max_delay=120.0, run_log=None):
+        self.model_chain = list(dict.fromkeys(model_chain))
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.run_log = Path(run_log) if run_log else None
+        self.records = []
+        self._lock = threading.Lock()
+        self._cooldown_until = {}
+        self._calls = {model: deque() for model in self.model_chain}
+        self._limits = {}  # model -> {window seconds: request limit}
+        self._disabled = set()
+
+    def _prune_calls(self, model, now):
+        """Drops call timestamps older than the longest known window."""
+        calls = self._calls.setdefault(model, deque())
+        cutoff = now - max(self._limits.get(model, {QUOTA_WINDOW: None}))
+        while calls and calls[0] < cutoff:
+            calls.popleft()
+        return calls
+
+    def remaining_quota(self, model):
+        """Requests left in the tightest window, or None if no limit is known."""
+        limits = self._limits.get(model)
+        if not limits:
+            return None
+        now = time.monotonic()
+        calls = self._prune_calls(model, now)
+        return max(0, min(limit - sum(1 for t in calls if t >= now - window)
+                          for window, limit in limits.items()))
+
+    def _quota_ready_at(self, model, now):
+        """Time at which every known window has a free request again."""
+        calls = self._prune_calls(model, now)
+        ready_at = now
+        for window, limit in self._limits.get(model, {}).items():
+            recent = [t for t in calls if t >= now - window]
+            if len(recent) >= limit:
+                ready_at = max(ready_at, recent[len(recent) - limit] + window)
+        return ready_at
+
+    def backoff_delay(self, attempt):
+        """Full-jitter exponential backoff for the given attempt number."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def _reserve_model(self, chain):
+        """Picks the first usable model, or returns (None, wait) if all are cooling down."""
+        with self._lock:
+            now = time.monotonic()
+            earliest = None
+            for model in chain:
+                if model in self._disabled:
+                    continue
+                ready_at = self._cooldown_until.get(model, 0.0)
+                if self.remaining_quota(model) == 0:
+                    ready_at = max(ready_at, self._quota_ready_at(model, now))
+                if ready_at <= now:
+                    self._calls.setdefault(model, deque()).append(now)
+                    return model, 0.0
+                earliest = ready_at if earliest is None else min(earliest, ready_at)
+            if earliest is None:
+                return None, None
+            return None, earliest - now
+
+    def _penalize(self, model, kind, error, attempt):
+        with self._lock:
+            if kind == "not_found":
+                self._disabled.add(model)
+                return 0.0
+            violations = parse_quota_violations(error) if kind == "quota" else []
+            for _, window, limit in violations:
+                if limit:
+                    self._limits.setdefault(model, {})[window] = limit
+            window = max((window for _, window, _ in violations), default=QUOTA_WINDOW)
+            delay = parse_retry_delay(error)
+            if window > QUOTA_WINDOW:
+                # An hourly or daily quota won't reset within a retry delay
+                delay = window
+            elif delay is not None:
+                delay += random.uniform(0, 1.0)
+            else:
+                delay = self.backoff_delay(attempt)
+            self._cooldown_until[model] = time.monotonic() + delay
+            return delay
+
+    def call(self, fn, label="call", preferred=None):
+        """
+        Runs fn(model_id) with retries and fallback.
+
+        Args:
+            fn: Callable taking a model ID and returning the result
+            label: Description recorded in the run log
+            preferred: Model to try first (defaults to the head of the chain)
+
+        Returns:
+            Result of the first successful call; re-raises the last error
+        """
+        chain = self.model_chain if preferred is None else [preferred] + [m for m in self.model_chain if m != preferred]
+        started = time.monotonic()
+        attempts = []
+        last_error = None
+
+        for attempt in range(self.max_attempts):
+            model, wait = self._reserve_model(chain)
+            if model is None:
+                if wait is None:
+                    break  # Every model in the chain is unavailable
+                if wait > self.max_delay:
+                    print(f"❌ All models out of quota for {wait / 60:.0f} more minutes ({label})")
+                    break
+                print(f"⏳ All models cooling down, waiting {wait:.1f}s ({label})")
+                time.sleep(wait)
+                model, _ = self._reserve_model(chain)
+                if model is None:
+                    continue
+
+            try:
+                result = fn(model)
+            except Exception as e:
+                kind = classify_error(e)
+                if kind is None:
+                    self._record(label, chain[0], model, attempts + [model], started, "error")
+                    raise
+                last_error = e
+                attempts.append(model)
+                delay = self._penalize(model, kind, e, attempt)
+                print(f"⚠️  {kind} on {model} ({label}), attempt {attempt + 1}/{self.max_attempts}; "
+                      f"cooling down {delay:.1f}s")
+                continue
+
+            attempts.append(model)
+            if model != chain[0]:
+                print(f"↪️  {label} served by fallback model {model}")
+            self._record(label, chain[0], model, attempts, started, "ok")
+            return result
+
+        self._record(label, chain[0], None, attempts, started, "failed")
+        if last_error is not None:
+            raise last_error
+        raise RuntimeError(f"No usable model in chain {chain}")
+
+    def _record(self, label, requested, used, attempts, started, status):
+        record = {
+            "time": datetime.now().isoformat(),
+            "label": label,
+            "requested_model": requested,
+            "model_used": used,
+            "attempts": attempts,
+            "elapsed_s": round(time.monotonic() - started, 2),
+            "status": status,
+        }
+        with self._lock:
+            self.records.append(record)
+            if self.run_log:
+                self.run_log.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.run_log, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(record) + "\n")
@@ -3,68 +3,173 @@
 Unified toolkit for searching and managing academic literature
 """
 
-from .search_apis import (
-    search_semantic_scholar,
-    search_arxiv,
-    fetch_arxiv_by_id,
-    normalize_paper_s2,
-    normalize_paper_arxiv
-)
-
-from .pdf_downloader import (
-    download_pdf,
-    download_arxiv_pdf,
-    batch_download_pdfs
-)
-
-from .relevance_scorer import (
-    calculate_relevance,
-    score_atmospheric_profile_paper,
-    score_ml_weather_paper,
-    filter_by_relevance
-)
-
-from .catalog_builder import (
-    build_catalog,
-    load_catalog,
-    merge_catalogs,
-    export_to_bibtex,
-    create_links_file
-)
-
-from .report_generator import (
-    generate_search_report,
-    generate_summary_report
-)
+import importlib
+from typing import Dict, List
 
-__version__ = "1.0.0"
-__all__ = [
+# Public names by submodule. Submodules are imported on first attribute
+# access (PEP 562), so "import article_search" stays cheap and heavy
+# dependencies (requests, pyarrow, pypdf) load only when actually used.
+_EXPORTS: Dict[str, List[str]] = {
     # Search APIs
-    'search_semantic_scholar',
-    'search_arxiv',
-    'fetch_arxiv_by_id',
-    'normalize_paper_s2',
-    'normalize_paper_arxiv',
+    'search_apis': [
+        'S2_DELAY',
+        'ARXIV_DELAY',
+        'OPENALEX_DELAY',
+        'CROSSREF_DELAY',
+        'search_semantic_scholar',
+        'search_arxiv',
+        'search_openalex',
+        'search_crossref',
+        'fetch_arxiv_by_id',
+        'normalize_paper_s2',
+        'normalize_paper_arxiv',
+        'normalize_paper_openalex',
+        'normalize_paper_crossref',
+        'fetch_semantic_scholar_batch',
+        'fetch_arxiv_batch',
+        'fetch_openalex_batch',
+        'fetch_crossref_batch',
+        'fetch_semantic_scholar_edges',
+        'match_semantic_scholar_title',
+        'paper_id_s2',
+        'paper_id_arxiv',
+        'paper_id_openalex',
+        'paper_id_crossref',
+        'relevance_view_s2',
+        'relevance_view_openalex',
+        'relevance_view_crossref',
+    ],
+    'arxiv_atom': ['iter_arxiv_entries'],
+    'http_session': ['get_session', 'close_session'],
+
+    # Search Sources
+    'sources': [
+        'SearchSource',
+        'SOURCES',
+        'register_source',
+        'get_source',
+        'select_sources',
+    ],
 
     # PDF Downloader
-    'download_pdf',
-    'download_arxiv_pdf',
-    'batch_download_pdfs',
+    'pdf_downloader': [
+        'download_pdf',
+        'download_arxiv_pdf',
+        'batch_download_pdfs',
+        'fetch_pdf',
+        'probe_pdf_size',
+    ],
+    'download_scheduler': [
+        'schedule_downloads',
+        'load_deferred',
+    ],
 
     # Relevance Scoring
-    'calculate_relevance',
-    'score_atmospheric_profile_paper',
-    'score_ml_weather_paper',
-    'filter_by_relevance',
+    'relevance_scorer': [
+        'calculate_relevance',
+        'score_atmospheric_profile_paper',
+        'score_ml_weather_paper',
+        'filter_by_relevance',
+        'prefilter_by_relevance',
+        'calculate_fulltext_relevance',
+        'rescore_with_fulltext',
+        'ATMOSPHERIC_PROFILE_KEYWORDS',
+        'ML_WEATHER_KEYWORDS',
+    ],
 
     # Catalog Builder
-    'build_catalog',
-    'load_catalog',
-    'merge_catalogs',
-    'export_to_bibtex',
-    'create_links_file',
+    'catalog_builder': [
+        'build_catalog',
+        'carry_over_metadata',
+        'load_catalog',
+        'save_catalog',
+        'merge_catalogs',
+        'export_to_bibtex',
+        'bibtex_key',
+        'export_to_parquet',
+        'load_catalog_arrow',
+        'create_links_file',
+    ],
+    'catalog_refresh': [
+        'refresh_papers',
+        'refresh_catalog',
+    ],
+
+    # Statistics and Ranking
+    'catalog_stats': ['CatalogStats'],
+    'ranking': [
+        'top_k_by_relevance',
+        'top_k_per_group',
+        'TopK',
+    ],
 
     # Report Generator
-    'generate_search_report',
-    'generate_summary_report',
-]
+    'report_generator': [
+        'generate_search_report',
+        'generate_summary_report',
+        'iter_search_report',
+    ],
+
+    # Text Extraction
+    'text_extractor': [
+        'extract_pdf_pages',
+        'extract_pdf_text',
+        'chunk_text',
+        'TextCache',
+        'update_text_cache',
+    ],
+
+    # Citation Graph
+    'citation_graph': [
+        'CitationCache',
+        'expand_citations',
+        'pagerank',
+        'write_adjacency',
+        'load_adjacency',
+        'seed_id',
+    ],
+
+    # Similarity Index
+    'vector_index': [
+        'VectorIndex',
+        'HashingSVDEmbedder',
+        'paper_text',
+    ],
+
+    # Subtopic Clustering
+    'clustering': [
+        'SubtopicModel',
+        'assign_subtopics',
+        'cluster_catalog',
+        'minibatch_kmeans',
+    ],
+
+    # Checkpointed Runs
+    'search_run': ['SearchRun'],
+    'paper_registry': ['PaperRegistry', 'KnownPaperSet', 'title_fingerprint'],
+
+    # Instrumentation
+    'instrumentation': ['Profiler', 'get_profiler'],
+}
+
+_LAZY = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__version__ = "1.0.0"
+__all__ = [name for names in _EXPORTS.values() for name in names]
+
+
+def __getattr__(name: str):
+    """Import the submodule that provides name on first access"""
+    module = _LAZY.get(name)
+    if module is not None:
+        value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    elif name in _EXPORTS:
+        value = importlib.import_module(f'.{name}', __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY) | set(_EXPORTS))
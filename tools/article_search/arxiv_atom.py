@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Streaming parser for arXiv API Atom feeds
+Extracts only the fields used by normalize_paper_arxiv, one entry at a time
+"""
+
+import xml.etree.ElementTree as ET
+from typing import BinaryIO, Dict, Iterator, Optional
+
+ATOM = '{http://www.w3.org/2005/Atom}'
+ARXIV_ERROR_ID = 'arxiv.org/api/errors'
+
+_ENTRY = f'{ATOM}entry'
+_ID = f'{ATOM}id'
+_TITLE = f'{ATOM}title'
+_SUMMARY = f'{ATOM}summary'
+_PUBLISHED = f'{ATOM}published'
+_AUTHOR = f'{ATOM}author'
+_NAME = f'{ATOM}name'
+_LINK = f'{ATOM}link'
+_CATEGORY = f'{ATOM}category'
+
+
+def _clean(text: Optional[str]) -> str:
+    return (text or '').replace('\n', ' ').strip()
+
+
+def parse_arxiv_entry(entry: ET.Element) -> Optional[Dict]:
+    """
+    Convert one Atom <entry> element to a paper dictionary
+
+    Returns:
+        Paper dictionary (same fields as search_arxiv results), or None for
+        arXiv error entries and entries without a publication date
+    """
+    entry_id = entry.findtext(_ID) or ''
+    published = entry.findtext(_PUBLISHED) or ''
+    if ARXIV_ERROR_ID in entry_id:
+        print(f"arXiv API error: {_clean(entry.findtext(_SUMMARY))}")
+        return None
+    if len(published) < 4:
+        return None
+
+    url = entry_id
+    for link in entry.iter(_LINK):
+        if link.get('rel', 'alternate') == 'alternate':
+            url = link.get('href', entry_id)
+            break
+
+    return {
+        'arxiv_id': entry_id.split('/abs/')[-1],
+        'title': _clean(entry.findtext(_TITLE)),
+        'authors': [_clean(author.findtext(_NAME)) for author in entry.iter(_AUTHOR)],
+        'year': int(published[:4]),
+        'abstract': _clean(entry.findtext(_SUMMARY)),
+        'published': published,
+        'url': url,
+        'pdf_url': url.replace('/abs/', '/pdf/') + '.pdf',
+        'categories': [category.get('term') for category in entry.iter(_CATEGORY)]
+    }
+
+
+def iter_arxiv_entries(source: BinaryIO) -> Iterator[Dict]:
+    """
+    Yield papers from an arXiv Atom feed while it is being read
+
+    Each <entry> is converted as soon as its closing tag is parsed and then
+    dropped from the tree, so memory stays bounded by one entry regardless
+    of the page size.
+
+    Args:
+        source: Binary file-like object (e.g. an HTTP response stream)
+
+    Yields:
+        Paper dictionaries in feed order
+    """
+    root = None
+    for event, elem in ET.iterparse(source, events=('start', 'end')):
+        if root is None:
+            root = elem
+        elif event == 'end' and elem.tag == _ENTRY:
+            paper = parse_arxiv_entry(elem)
+            root.clear()
+            if paper is not None:
+                yield paper
@@ -4,18 +4,157 @@
 Creates structured JSON catalogs with metadata
 """
 
+import gzip
+import hashlib
+import io
 import json
+import os
+import re
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Optional
-from collections import Counter
+from typing import Any, Iterable, Iterator, List, Dict, Optional, Tuple
+
+from . import instrumentation
+from .catalog_stats import CatalogStats
+from .ranking import catalog_key, top_k_by_relevance, top_k_per_group
+
+# Optional fast JSON backends (stdlib json is the fallback)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+msgspec = None
+if orjson is None:
+    try:
+        import msgspec
+    except ImportError:
+        pass
+
+# Optional zstd compression for .json.zst catalogs
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+GZIP_MAGIC = b'\x1f\x8b'
+ZSTD_LEVEL = 10
+
+# Search metadata that build_catalog computes from the papers
+STATS_METADATA = frozenset({'total_papers', 'downloaded_pdfs', 'links_only', 'year_range', 'sources', 'avg_relevance',
+                            'papers_considered'})
+
+
+def json_backend() -> str:
+    """Name of the JSON backend in use ('orjson', 'msgspec' or 'json')"""
+    if orjson is not None:
+        return 'orjson'
+    if msgspec is not None:
+        return 'msgspec'
+    return 'json'
+
+
+def dumps_json(obj: Any, compact: bool = False) -> bytes:
+    """
+    Serialize to UTF-8 JSON bytes with the fastest available backend
+
+    Args:
+        obj: JSON-compatible object
+        compact: No indentation or extra whitespace
+
+    Returns:
+        Encoded JSON
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if not compact:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+
+    if msgspec is not None:
+        try:
+            data = msgspec.json.encode(obj)
+            return data if compact else msgspec.json.format(data, indent=2)
+        except TypeError:
+            pass  # e.g. non-string keys, handled by stdlib below
+
+    if compact:
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def loads_json(data: bytes) -> Any:
+    """Parse JSON bytes with the fastest available backend"""
+    if orjson is not None:
+        return orjson.loads(data)
+    if msgspec is not None:
+        return msgspec.json.decode(data)
+    return json.loads(data)
+
+
+def save_catalog(catalog: Dict, output_file: Path, compact: bool = False):
+    """
+    Write catalog JSON, compressed according to the file suffix
+
+    '.zst' files are zstd-compressed (requires 'zstandard'), '.gz' files
+    gzip-compressed; anything else is plain JSON. The file is replaced
+    atomically so readers never see a partial catalog.
+
+    Args:
+        catalog: Catalog dictionary
+        output_file: Target path
+        compact: Compact JSON instead of indented
+    """
+    output_file = Path(output_file)
+    with instrumentation.span('catalog.serialize'):
+        data = dumps_json(catalog, compact=compact)
+
+    if output_file.suffix in ('.zst', '.gz'):
+        with instrumentation.span('catalog.compress'):
+            if output_file.suffix == '.zst':
+                if zstandard is None:
+                    raise ImportError(
+                        "Writing .zst catalogs requires 'zstandard'. Install it using: pip install zstandard"
+                    )
+                data = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+            else:
+                data = gzip.compress(data, mtime=0)
+
+    with instrumentation.span('catalog.write'):
+        tmp_file = output_file.with_name(output_file.name + '.tmp')
+        with open(tmp_file, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_file, output_file)
+    instrumentation.count('catalog.bytes', len(data))
+
+
+def carry_over_metadata(previous: Dict, exclude: Iterable[str] = ()) -> Dict:
+    """
+    Metadata of an existing catalog to keep when it is rebuilt
+
+    Statistics are dropped, since build_catalog recomputes them from the papers.
+
+    Args:
+        previous: 'search_metadata' of the existing catalog
+        exclude: Further keys to drop (e.g. 'query' and 'date' to take the new ones)
+
+    Returns:
+        Metadata dictionary for build_catalog
+    """
+    dropped = STATS_METADATA.union(exclude)
+    return {key: value for key, value in previous.items() if key not in dropped}
 
 
 def build_catalog(
     papers: List[Dict],
     query: str,
     output_file: Path,
-    metadata: Optional[Dict] = None
+    metadata: Optional[Dict] = None,
+    stats: Optional[CatalogStats] = None,
+    max_papers: Optional[int] = None,
+    compact: bool = False,
+    vector_index=None
 ) -> Dict:
     """
     Build structured catalog from paper list
@@ -25,63 +164,78 @@ def build_catalog(
         query: Search query description
         output_file: Path to save catalog JSON
         metadata: Additional metadata to include
+        stats: Precomputed statistics of papers (computed in one pass if None)
+        max_papers: Keep only the top N papers (heap selection instead of a full sort);
+            statistics then describe the kept papers and 'papers_considered' the input
+        compact: Write compact JSON (use a .json.zst or .json.gz path to compress)
+        vector_index: Optional VectorIndex; catalog papers not indexed yet are appended
 
     Returns:
         Complete catalog dictionary
     """
-    # Calculate statistics
-    year_range = f"{min(p['year'] for p in papers if p.get('year'))}-{max(p['year'] for p in papers if p.get('year'))}" if papers else "N/A"
-    downloaded_count = sum(1 for p in papers if p.get('local_path'))
-
-    # Count by subtopic
-    subtopic_counts = Counter(p.get('subtopic', 'general') for p in papers)
-
-    # Count by source
-    source_counts = Counter(p.get('source', 'unknown') for p in papers)
+    selected = top_k_by_relevance(papers, max_papers, key=catalog_key)
+    truncated = len(selected) < len(papers)
+    if stats is None or truncated:
+        stats = CatalogStats.from_papers(selected)
 
     # Build catalog
     catalog = {
         "search_metadata": {
             "query": query,
             "date": datetime.now().isoformat(),
-            "total_papers": len(papers),
-            "downloaded_pdfs": downloaded_count,
-            "links_only": len(papers) - downloaded_count,
-            "year_range": year_range,
-            "sources": list(source_counts.keys()),
-            "avg_relevance": round(sum(p.get('relevance_score', 0) for p in papers) / len(papers), 2) if papers else 0
+            "total_papers": stats.total,
+            "downloaded_pdfs": stats.downloaded,
+            "links_only": stats.total - stats.downloaded,
+            "year_range": stats.year_range,
+            "sources": list(stats.source_counts.keys()),
+            "avg_relevance": round(stats.avg_relevance, 2)
         },
-        "subtopic_counts": dict(subtopic_counts),
-        "source_counts": dict(source_counts),
-        "papers": sorted(papers, key=lambda x: (-x.get('relevance_score', 0), -x.get('year', 0)))
+        "subtopic_counts": dict(stats.subtopic_counts),
+        "source_counts": dict(stats.source_counts),
+        "papers": selected
     }
+    if truncated:
+        catalog["search_metadata"]["papers_considered"] = len(papers)
 
     # Add custom metadata
     if metadata:
         catalog["search_metadata"].update(metadata)
 
     # Save catalog
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(catalog, f, indent=2, ensure_ascii=False)
+    save_catalog(catalog, output_file, compact=compact)
+
+    if vector_index is not None:
+        vector_index.add_papers(catalog["papers"])
 
     return catalog
 
 
 def load_catalog(catalog_file: Path) -> Optional[Dict]:
-    """Load existing catalog from file"""
+    """Load existing catalog from file (plain, zstd or gzip, detected from content)"""
     try:
-        with open(catalog_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        with open(catalog_file, 'rb') as f:
+            data = f.read()
+
+        if data.startswith(ZSTD_MAGIC):
+            if zstandard is None:
+                raise ImportError("Reading .zst catalogs requires 'zstandard'. Install it using: pip install zstandard")
+            data = zstandard.ZstdDecompressor().stream_reader(io.BytesIO(data)).read()
+        elif data.startswith(GZIP_MAGIC):
+            data = gzip.decompress(data)
+
+        return loads_json(data)
     except Exception as e:
         print(f"Error loading catalog: {e}")
         return None
 
 
-def merge_catalogs(catalog1: Dict, catalog2: Dict, output_file: Path) -> Dict:
+def merge_catalogs(catalog1: Dict, catalog2: Dict, output_file: Path, subtopic_model=None) -> Dict:
     """
     Merge two catalogs, removing duplicates
 
-    Deduplication based on paper ID or normalized title
+    Deduplication based on paper ID or normalized title. With a
+    SubtopicModel, the merged papers get cluster labels as subtopics
+    instead of whatever each search was run with.
     """
     papers1 = catalog1.get('papers', [])
     papers2 = catalog2.get('papers', [])
@@ -104,49 +258,230 @@ def merge_catalogs(catalog1: Dict, catalog2: Dict, output_file: Path) -> Dict:
 
     # Rebuild catalog
     merged_query = f"{catalog1['search_metadata'].get('query', '')} + {catalog2['search_metadata'].get('query', '')}"
-    return build_catalog(merged_papers, merged_query, output_file)
+    metadata = None
+    if subtopic_model is not None:
+        subtopic_model.assign(merged_papers)
+        metadata = {'subtopic_terms': subtopic_model.cluster_terms()}
+    return build_catalog(merged_papers, merged_query, output_file, metadata=metadata)
+
+
+_BIBTEX_KEY_LINE = re.compile(r'^\s*@\w+\s*\{\s*([^,\s]+)\s*,')
+
+
+def bibtex_key(paper: Dict, hash_length: int = 8) -> str:
+    """
+    Stable citation key: FirstAuthorSurname + year + hash of paper id
 
+    The key depends only on the paper itself (not its position in a list),
+    so regenerated bibliographies keep the same keys.
+    """
+    first_author = paper['authors'][0].split()[-1] if paper.get('authors') and paper['authors'][0].split() else 'Unknown'
+    first_author = re.sub(r'[^A-Za-z0-9]', '', first_author) or 'Unknown'
+    year = paper.get('year') or 'NoDate'
+    identity = paper.get('id') or (paper.get('title') or '').lower().replace(' ', '')
+    digest = hashlib.sha1(identity.encode('utf-8')).hexdigest()
+    return f"{first_author}{year}_{digest[:hash_length]}"
+
+
+def read_bibtex_keys(bib_file: Path) -> set:
+    """Parse citation keys of an existing .bib file, line by line"""
+    keys = set()
+    if not Path(bib_file).exists():
+        return keys
+    with open(bib_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            match = _BIBTEX_KEY_LINE.match(line)
+            if match:
+                keys.add(match.group(1))
+    return keys
+
+
+def format_bibtex_entry(paper: Dict, key: str) -> str:
+    """Render one BibTeX entry"""
+    year = paper.get('year', 'NoDate')
+
+    # Determine entry type
+    if paper.get('source') == 'arxiv':
+        entry_type = 'article'
+        journal = 'arXiv preprint'
+        note = f"arXiv:{paper.get('arxiv_id') or paper.get('id', '').split(':', 1)[-1]}"
+    else:
+        entry_type = 'article'
+        journal = paper.get('venue', 'Unknown Journal')
+        note = ''
+
+    lines = [
+        f"@{entry_type}{{{key},\n",
+        f"  title = {{{paper.get('title', 'Untitled')}}},\n",
+        f"  author = {{{' and '.join(paper.get('authors', ['Unknown']))}}},\n",
+        f"  year = {{{year}}},\n",
+        f"  journal = {{{journal}}},\n"
+    ]
+
+    if note:
+        lines.append(f"  note = {{{note}}},\n")
+
+    if paper.get('url'):
+        lines.append(f"  url = {{{paper['url']}}},\n")
+
+    lines.append("}\n\n")
+    return ''.join(lines)
+
+
+def iter_bibtex_entries(papers: Iterable[Dict], skip_keys: Optional[set] = None) -> Iterator[Tuple[str, str]]:
+    """
+    Yield (key, entry) for papers whose key is not in skip_keys
 
-def export_to_bibtex(papers: List[Dict], output_file: Path):
+    Two different papers mapping to the same key within one run get a
+    longer hash for the later one.
+    """
+    skip_keys = skip_keys if skip_keys is not None else set()
+    run_keys = {}
+
+    for paper in papers:
+        identity = paper.get('id') or paper.get('title')
+        hash_length = 8
+        key = bibtex_key(paper, hash_length)
+        while key in run_keys and run_keys[key] != identity and hash_length < 40:
+            hash_length += 4
+            key = bibtex_key(paper, hash_length)
+
+        if key in run_keys or key in skip_keys:
+            continue
+        run_keys[key] = identity
+        yield key, format_bibtex_entry(paper, key)
+
+
+def export_to_bibtex(papers: Iterable[Dict], output_file: Path, incremental: bool = False) -> int:
     """
     Export papers to BibTeX format
 
-    Basic implementation for common fields
+    Entries are streamed to the file. Citation keys are stable across runs
+    (author + year + hash of paper id). In incremental mode the existing
+    file is kept and only papers whose key is not yet present are appended.
+
+    Args:
+        papers: Paper dictionaries
+        output_file: Output .bib path
+        incremental: Append new entries instead of rewriting the file
+
+    Returns:
+        Number of entries written
     """
-    with open(output_file, 'w', encoding='utf-8') as f:
-        for i, paper in enumerate(papers, 1):
-            # Generate citation key
-            first_author = paper['authors'][0].split()[-1] if paper.get('authors') else 'Unknown'
-            year = paper.get('year', 'NoDate')
-            key = f"{first_author}{year}_{i}"
-
-            # Determine entry type
-            if paper.get('source') == 'arxiv':
-                entry_type = 'article'
-                journal = 'arXiv preprint'
-                note = f"arXiv:{paper.get('arxiv_id', '')}"
-            else:
-                entry_type = 'article'
-                journal = paper.get('venue', 'Unknown Journal')
-                note = ''
+    existing_keys = read_bibtex_keys(output_file) if incremental else set()
+    written = 0
+
+    with open(output_file, 'a' if incremental else 'w', encoding='utf-8') as f:
+        for _, entry in iter_bibtex_entries(papers, existing_keys):
+            f.write(entry)
+            written += 1
+
+    return written
+
+
+# Column name -> Arrow type name for Parquet exports
+PARQUET_COLUMNS = {
+    'id': 'string',
+    'source': 'string',
+    'title': 'string',
+    'authors': 'list<string>',
+    'year': 'int32',
+    'abstract': 'string',
+    'citations': 'int64',
+    'venue': 'string',
+    'url': 'string',
+    'pdf_url': 'string',
+    'pdf_available': 'bool',
+    'local_path': 'string',
+    'subtopic': 'string',
+    'relevance_score': 'float64',
+    'categories': 'list<string>'
+}
+
+
+def _require_pyarrow():
+    """Import pyarrow on first use (it adds a noticeable delay to startup)"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Parquet export requires 'pyarrow'. Install it using: pip install pyarrow") from None
+    return pa, pq
+
+
+def _parquet_schema(pa):
+    types = {
+        'string': pa.string(),
+        'list<string>': pa.list_(pa.string()),
+        'int32': pa.int32(),
+        'int64': pa.int64(),
+        'bool': pa.bool_(),
+        'float64': pa.float64()
+    }
+    return pa.schema([(name, types[type_name]) for name, type_name in PARQUET_COLUMNS.items()])
 
-            # Write entry
-            f.write(f"@{entry_type}{{{key},\n")
-            f.write(f"  title = {{{paper.get('title', 'Untitled')}}},\n")
-            f.write(f"  author = {{{' and '.join(paper.get('authors', ['Unknown']))}}},\n")
-            f.write(f"  year = {{{year}}},\n")
-            f.write(f"  journal = {{{journal}}},\n")
 
-            if note:
-                f.write(f"  note = {{{note}}},\n")
+def export_to_parquet(
+    papers: List[Dict],
+    output_file: Path,
+    row_group_size: int = 10000,
+    compression: str = 'zstd'
+):
+    """
+    Export papers to a typed columnar Parquet file
+
+    Authors and categories are list columns. Rows are written in batches of
+    row_group_size, so memory stays bounded for large catalogs.
+
+    Args:
+        papers: List of paper dictionaries
+        output_file: Output .parquet path
+        row_group_size: Papers per row group
+        compression: Parquet compression codec
+    """
+    pa, pq = _require_pyarrow()
+    schema = _parquet_schema(pa)
+    list_columns = {name for name, type_name in PARQUET_COLUMNS.items() if type_name.startswith('list')}
+
+    with pq.ParquetWriter(str(output_file), schema, compression=compression) as writer:
+        for start in range(0, len(papers), row_group_size):
+            batch = papers[start:start + row_group_size]
+            columns = {
+                name: [(p.get(name) or []) if name in list_columns else p.get(name) for p in batch]
+                for name in PARQUET_COLUMNS
+            }
+            writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+
+
+def load_catalog_arrow(
+    parquet_file: Path,
+    columns: Optional[List[str]] = None,
+    filters: Optional[List] = None,
+    as_pandas: bool = False
+):
+    """
+    Load a Parquet catalog export, reading only the requested columns
 
-            if paper.get('url'):
-                f.write(f"  url = {{{paper['url']}}},\n")
+    Args:
+        parquet_file: Parquet file written by export_to_parquet
+        columns: Columns to read (None = all), e.g. ['year', 'relevance_score', 'subtopic']
+        filters: Optional pyarrow row filters, e.g. [('year', '>=', 2022)]
+        as_pandas: Return a pandas DataFrame instead of a pyarrow Table
 
-            f.write("}\n\n")
+    Returns:
+        pyarrow Table or pandas DataFrame
+    """
+    _, pq = _require_pyarrow()
+    table = pq.read_table(str(parquet_file), columns=columns, filters=filters)
+    return table.to_pandas() if as_pandas else table
 
 
-def create_links_file(papers: List[Dict], output_file: Path, group_by: str = 'subtopic'):
+def create_links_file(
+    papers: List[Dict],
+    output_file: Path,
+    group_by: str = 'subtopic',
+    max_per_group: Optional[int] = None
+):
     """
     Create text file with all paper links grouped by category
 
@@ -154,14 +489,10 @@ def create_links_file(papers: List[Dict], output_file: Path, group_by: str = 'su
         papers: List of papers
         output_file: Output text file path
         group_by: Field to group by ('subtopic', 'year', 'source')
+        max_per_group: Only list the N most relevant papers of each group
     """
-    # Group papers
-    groups = {}
-    for paper in papers:
-        key = paper.get(group_by, 'other')
-        if key not in groups:
-            groups[key] = []
-        groups[key].append(paper)
+    # Group papers, ranked by relevance within each group
+    groups = top_k_per_group(papers, max_per_group, group_by=group_by)
 
     with open(output_file, 'w', encoding='utf-8') as f:
         f.write("=" * 80 + "\n")
@@ -173,7 +504,7 @@ def create_links_file(papers: List[Dict], output_file: Path, group_by: str = 'su
             f.write(f"{group_name.upper().replace('_', ' ')}\n")
             f.write(f"{'=' * 80}\n\n")
 
-            for paper in sorted(group_papers, key=lambda x: -x.get('relevance_score', 0)):
+            for paper in group_papers:
                 f.write(f"Title: {paper['title']}\n")
                 f.write(f"Authors: {', '.join(paper.get('authors', [])[:5])}\n")
                 if len(paper.get('authors', [])) > 5:
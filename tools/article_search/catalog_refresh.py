@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Metadata refresh for existing catalogs
+Re-fetches catalogued papers in bulk, applies changed fields and re-ranks
+"""
+
+import json
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .search_apis import (
+    ARXIV_BATCH_SIZE,
+    S2_BATCH_SIZE,
+    arxiv_base_id,
+    fetch_arxiv_batch,
+    fetch_semantic_scholar_batch,
+    normalize_paper_arxiv,
+    normalize_paper_s2
+)
+from .relevance_scorer import score_atmospheric_profile_paper
+from .sources import SOURCES
+from .catalog_builder import build_catalog, carry_over_metadata, load_catalog
+
+# Fields taken from each source on refresh
+S2_REFRESH_FIELDS = ('title', 'abstract', 'year', 'citations', 'venue', 'pdf_url', 'pdf_available')
+ARXIV_REFRESH_FIELDS = ('title', 'abstract', 'authors', 'pdf_url', 'categories')
+SOURCE_REFRESH_FIELDS = ('title', 'abstract', 'year', 'citations', 'venue', 'pdf_url', 'pdf_available')
+
+# Fields read by the relevance scorers
+SCORED_FIELDS = {'title', 'abstract', 'citations'}
+
+
+def apply_updates(paper: Dict, updates: Dict) -> List[str]:
+    """
+    Copy changed, non-empty values into paper
+
+    Returns:
+        Names of the fields that changed
+    """
+    changed = []
+    for field, value in updates.items():
+        if value in (None, '', []) or paper.get(field) == value:
+            continue
+        paper[field] = value
+        changed.append(field)
+    return changed
+
+
+def _rescore(paper: Dict, scorer_func):
+    """Rescore from metadata, keeping any full-text bonus on top"""
+    score = scorer_func(paper)
+    if 'abstract_score' in paper:
+        bonus = paper['relevance_score'] - paper['abstract_score']
+        paper['abstract_score'] = round(score, 1)
+        score = min(10.0, score + bonus)
+    paper['relevance_score'] = round(score, 1)
+
+
+def _arxiv_chunks(base_ids: List[str], stored: List[Dict]) -> List[Dict]:
+    """
+    Keep arXiv id chunks stable across refreshes of a growing catalog
+
+    Stored chunks keep their ids in order, so their validators stay valid.
+    A chunk that lost ids drops its validators. New ids fill the last chunk
+    (only that one is fetched unconditionally), then start new chunks.
+    """
+    wanted = set(base_ids)
+    placed = set()
+    chunks = []
+    for chunk in stored:
+        ids = [base_id for base_id in chunk.get('ids', []) if base_id in wanted and base_id not in placed]
+        if not ids:
+            continue
+        placed.update(ids)
+        chunks.append(chunk if len(ids) == len(chunk['ids']) else {'ids': ids})
+
+    for base_id in base_ids:
+        if base_id in placed:
+            continue
+        if not chunks or len(chunks[-1]['ids']) >= ARXIV_BATCH_SIZE:
+            chunks.append({'ids': []})
+        chunks[-1] = {'ids': chunks[-1]['ids'] + [base_id]}
+    return chunks
+
+
+def _validators_file(catalog_file: Path) -> Path:
+    return Path(str(catalog_file) + '.refresh.json')
+
+
+def refresh_papers(
+    papers: List[Dict],
+    scorer_func=None,
+    validators: Optional[Dict[str, Dict]] = None,
+    sources: Optional[List[str]] = None
+) -> Counter:
+    """
+    Refresh paper metadata in place with bulk requests
+
+    Semantic Scholar papers (and citation counts of arXiv papers) come from
+    /paper/batch, 500 ids per request. arXiv papers are fetched by id_list in
+    chunks kept stable across refreshes (validators['arxiv_chunks']), each
+    sent with the ETag / Last-Modified of its previous response. Papers of the other registered sources (OpenAlex, Crossref,
+    plugins) go through their SearchSource.lookup bulk requests. Papers of
+    sources that are not selected or not registered are counted as skipped.
+    Papers whose title, abstract or citations changed are rescored.
+
+    Args:
+        papers: Catalog papers (updated in place)
+        scorer_func: Scoring function (uses atmospheric_profile by default)
+        validators: Conditional-request validators, {'arxiv_chunks': [{'ids', 'etag', 'modified'}]}
+            (updated in place)
+        sources: Sources to refresh (names in article_search.SOURCES; None = all)
+
+    Returns:
+        Counter of requests, updated/rescored/skipped papers and changed fields
+        ('lookup:<source>' / 'found:<source>' for registry lookups,
+        'skipped:<source>' per source not refreshed)
+    """
+    if scorer_func is None:
+        scorer_func = score_atmospheric_profile_paper
+    if validators is None:
+        validators = {}
+    if sources is None:
+        sources = list(SOURCES)
+
+    counters = Counter(papers=len(papers))
+    changed_fields = {}
+
+    def update(paper, updates):
+        changed = apply_updates(paper, updates)
+        if changed:
+            changed_fields.setdefault(id(paper), (paper, set()))[1].update(changed)
+
+    s2_papers = {}
+    arxiv_papers = {}
+    other_papers = {}  # source name -> {lookup id: [papers]}
+    for p in papers:
+        source = p.get('source')
+        if source not in sources or source not in SOURCES:
+            counters['skipped'] += 1
+            counters[f"skipped:{source}"] += 1
+        elif source == 'semantic_scholar':
+            s2_papers[p['id'][len('s2:'):]] = p
+        elif source == 'arxiv':
+            arxiv_papers.setdefault(arxiv_base_id(p['id'][len('arxiv:'):]), []).append(p)
+        else:
+            lookup_id = SOURCES[source].lookup_key(p)
+            if lookup_id is None:
+                counters['skipped'] += 1
+                counters[f"skipped:{source}"] += 1
+            else:
+                other_papers.setdefault(source, {}).setdefault(lookup_id, []).append(p)
+
+    # Semantic Scholar metadata, plus citation counts for arXiv papers
+    if 'semantic_scholar' in sources:
+        lookup_ids = list(s2_papers) + [f"ARXIV:{base_id}" for base_id in arxiv_papers]
+        results = fetch_semantic_scholar_batch(lookup_ids)
+        counters['s2_requests'] += -(-len(lookup_ids) // S2_BATCH_SIZE)
+
+        for paper_id, raw in results.items():
+            if paper_id.startswith('ARXIV:'):
+                for paper in arxiv_papers[paper_id[len('ARXIV:'):]]:
+                    update(paper, {'citations': raw.get('citationCount')})
+            else:
+                paper = s2_papers[paper_id]
+                normalized = normalize_paper_s2(raw, paper.get('subtopic', 'general'))
+                update(paper, {field: normalized[field] for field in S2_REFRESH_FIELDS})
+
+    # Latest arXiv versions, conditional per chunk
+    if 'arxiv' in sources:
+        chunks = _arxiv_chunks(sorted(arxiv_papers), validators.get('arxiv_chunks', []))
+        validators.clear()  # Validators of earlier formats or dropped chunks
+        validators['arxiv_chunks'] = chunks
+        for chunk in chunks:
+            results, cached = fetch_arxiv_batch(chunk['ids'], chunk.get('etag'), chunk.get('modified'))
+            chunk.update(cached)
+            counters['arxiv_requests'] += 1
+            if results is None:
+                counters['arxiv_not_modified'] += 1
+                continue
+
+            for base_id, raw in results.items():
+                for paper in arxiv_papers.get(base_id, []):
+                    normalized = normalize_paper_arxiv(raw, paper.get('subtopic', 'general'))
+                    update(paper, {field: normalized[field] for field in ARXIV_REFRESH_FIELDS})
+
+    # Other registered sources through their bulk lookup
+    for name, by_id in other_papers.items():
+        source = SOURCES[name]
+        results = source.lookup(list(by_id))
+        counters[f"lookup:{name}"] += len(by_id)
+        counters[f"found:{name}"] += len(results)
+        for lookup_id, raw in results.items():
+            for paper in by_id.get(lookup_id, []):
+                normalized = source.normalize(raw, paper.get('subtopic', 'general'))
+                update(paper, {field: normalized.get(field) for field in SOURCE_REFRESH_FIELDS})
+
+    for paper, fields in changed_fields.values():
+        counters['updated'] += 1
+        for field in fields:
+            counters[f"field:{field}"] += 1
+        if fields & SCORED_FIELDS:
+            _rescore(paper, scorer_func)
+            counters['rescored'] += 1
+
+    return counters
+
+
+def refresh_catalog(
+    catalog_file: Path,
+    output_file: Optional[Path] = None,
+    scorer_func=None,
+    sources: Optional[List[str]] = None,
+    conditional: bool = True,
+    compact: bool = False,
+    catalog: Optional[Dict] = None
+) -> Optional[Dict]:
+    """
+    Refresh a saved catalog and write it back re-ranked
+
+    Conditional-request validators are kept next to each catalog in
+    <catalog>.refresh.json: they describe the responses that catalog
+    already contains. They are read from catalog_file's and written,
+    after the refreshed catalog is saved, next to output_file.
+
+    Args:
+        catalog_file: Catalog to refresh
+        output_file: Where to write the refreshed catalog (default: overwrite)
+        scorer_func: Scoring function (uses atmospheric_profile by default)
+        sources: Sources to refresh (None = all registered)
+        conditional: Send ETag / If-Modified-Since validators
+        compact: Write compact JSON
+        catalog: Already loaded contents of catalog_file (loaded from disk if None)
+
+    Returns:
+        Refreshed catalog dictionary with a 'refresh_stats' entry in its metadata,
+        or None if the catalog could not be loaded
+    """
+    if catalog is None:
+        catalog = load_catalog(catalog_file)
+        if catalog is None:
+            return None
+
+    output_file = output_file or catalog_file
+    source_validators = _validators_file(catalog_file)
+    validators = {}
+    if conditional and source_validators.exists():
+        with open(source_validators, 'r', encoding='utf-8') as f:
+            validators = json.load(f)
+
+    papers = catalog.get('papers', [])
+    counters = refresh_papers(papers, scorer_func=scorer_func, validators=validators, sources=sources)
+
+    previous = catalog.get('search_metadata', {})
+    metadata = carry_over_metadata(previous)
+    metadata['refreshed'] = datetime.now().isoformat()
+    metadata['refresh_stats'] = dict(counters)
+
+    refreshed = build_catalog(
+        papers,
+        query=previous.get('query', ''),
+        output_file=output_file,
+        metadata=metadata,
+        compact=compact
+    )
+
+    # Only once the updates are saved may later refreshes skip them
+    validators_file = _validators_file(output_file)
+    tmp_file = validators_file.with_name(validators_file.name + '.tmp')
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(validators, f, indent=2)
+    tmp_file.replace(validators_file)
+    return refreshed
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Single-pass statistics for paper collections
+Shared by catalog building and report generation
+"""
+
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional
+
+from .ranking import TopK
+
+
+class CatalogStats:
+    """
+    Incremental accumulator of catalog/report statistics
+
+    One pass over the papers yields totals, download count, year range,
+    average relevance, subtopic and source counts, per-subtopic average
+    relevance and the top-k papers of each subtopic (bounded heaps).
+    Papers can be added at any time with add() / update().
+    """
+
+    def __init__(self, top_k: int = 3):
+        self.top_k = top_k
+        self.total = 0
+        self.downloaded = 0
+        self.relevance_sum = 0.0
+        self.year_min: Optional[int] = None
+        self.year_max: Optional[int] = None
+        self.subtopic_counts = Counter()
+        self.source_counts = Counter()
+        self.subtopic_relevance = defaultdict(float)
+        self._subtopic_top = {}
+
+    @classmethod
+    def from_papers(cls, papers: Iterable[Dict], top_k: int = 3) -> 'CatalogStats':
+        """Build statistics from papers in a single pass"""
+        return cls(top_k=top_k).update(papers)
+
+    def update(self, papers: Iterable[Dict]) -> 'CatalogStats':
+        """Add several papers"""
+        for paper in papers:
+            self.add(paper)
+        return self
+
+    def add(self, paper: Dict):
+        """Add one paper"""
+        self.total += 1
+        if paper.get('local_path'):
+            self.downloaded += 1
+
+        score = paper.get('relevance_score', 0)
+        self.relevance_sum += score
+
+        year = paper.get('year')
+        if year:
+            self.year_min = year if self.year_min is None else min(self.year_min, year)
+            self.year_max = year if self.year_max is None else max(self.year_max, year)
+
+        subtopic = paper.get('subtopic', 'general')
+        self.subtopic_counts[subtopic] += 1
+        self.subtopic_relevance[subtopic] += score
+        self.source_counts[paper.get('source', 'unknown')] += 1
+
+        # Keep the k best per subtopic; earlier papers win ties
+        if subtopic not in self._subtopic_top:
+            self._subtopic_top[subtopic] = TopK(self.top_k)
+        self._subtopic_top[subtopic].push(paper)
+
+    @property
+    def year_range(self) -> str:
+        if self.year_min is None:
+            return "N/A"
+        return f"{self.year_min}-{self.year_max}"
+
+    @property
+    def avg_relevance(self) -> float:
+        return self.relevance_sum / self.total if self.total else 0
+
+    def subtopic_avg_relevance(self, subtopic: str) -> float:
+        count = self.subtopic_counts[subtopic]
+        return self.subtopic_relevance[subtopic] / count if count else 0
+
+    def top_in_subtopic(self, subtopic: str) -> List[Dict]:
+        """Top-k papers of a subtopic, best first"""
+        top = self._subtopic_top.get(subtopic)
+        return top.items() if top else []
@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""
+Citation-graph expansion
+Crawls Semantic Scholar references and citations outward from seed papers, with an on-disk edge cache
+"""
+
+import heapq
+import json
+import sqlite3
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from . import instrumentation
+from .catalog_builder import load_catalog, save_catalog
+from .relevance_scorer import score_atmospheric_profile_paper
+from .search_apis import (
+    arxiv_base_id,
+    fetch_semantic_scholar_batch,
+    fetch_semantic_scholar_edges,
+    normalize_paper_s2,
+    relevance_view_s2
+)
+
+DEFAULT_CITATION_CACHE = Path("papers/citation_cache.sqlite")
+DIRECTIONS = ('references', 'citations')
+
+
+class CitationCache:
+    """
+    SQLite cache of citation edges and Semantic Scholar paper records
+
+    edges    - (citing, cited) pairs
+    expanded - papers whose references/citations were fetched, so empty
+               edge lists are cached too
+    papers   - raw Semantic Scholar records by requested id
+    """
+
+    def __init__(self, cache_file: Path = DEFAULT_CITATION_CACHE):
+        self.cache_file = Path(cache_file)
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.cache_file))
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS edges (
+                citing TEXT NOT NULL, cited TEXT NOT NULL, PRIMARY KEY (citing, cited)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS edges_cited ON edges (cited);
+            CREATE TABLE IF NOT EXISTS expanded (
+                paper_id TEXT NOT NULL, direction TEXT NOT NULL, fetched REAL NOT NULL,
+                PRIMARY KEY (paper_id, direction)
+            );
+            CREATE TABLE IF NOT EXISTS papers (
+                paper_id TEXT PRIMARY KEY, data TEXT NOT NULL, fetched REAL NOT NULL
+            );
+        """)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+    def neighbors(self, paper_id: str, direction: str, max_age_days: Optional[float] = None) -> Optional[List[str]]:
+        """Cached neighbor ids, or None if the edges were never fetched (or are older than max_age_days)"""
+        row = self.conn.execute(
+            "SELECT fetched FROM expanded WHERE paper_id = ? AND direction = ?", (paper_id, direction)
+        ).fetchone()
+        if row is None or (max_age_days is not None and time.time() - row[0] > max_age_days * 86400):
+            return None
+        if direction == 'references':
+            query = "SELECT cited FROM edges WHERE citing = ?"
+        else:
+            query = "SELECT citing FROM edges WHERE cited = ?"
+        return [neighbor for (neighbor,) in self.conn.execute(query, (paper_id,))]
+
+    def store_neighbors(self, paper_id: str, direction: str, neighbor_ids: List[str]):
+        if direction == 'references':
+            edges = ((paper_id, neighbor) for neighbor in neighbor_ids)
+        else:
+            edges = ((neighbor, paper_id) for neighbor in neighbor_ids)
+        self.conn.executemany("INSERT OR IGNORE INTO edges (citing, cited) VALUES (?, ?)", edges)
+        self.conn.execute(
+            "INSERT OR REPLACE INTO expanded (paper_id, direction, fetched) VALUES (?, ?, ?)",
+            (paper_id, direction, time.time())
+        )
+        self.conn.commit()
+
+    def get_papers(self, paper_ids: Iterable[str]) -> Dict[str, Dict]:
+        """Cached raw records for the ids that have one"""
+        papers = {}
+        paper_ids = list(paper_ids)
+        for start in range(0, len(paper_ids), 500):
+            chunk = paper_ids[start:start + 500]
+            rows = self.conn.execute(
+                f"SELECT paper_id, data FROM papers WHERE paper_id IN ({','.join('?' * len(chunk))})", chunk
+            )
+            papers.update((paper_id, json.loads(data)) for paper_id, data in rows)
+        return papers
+
+    def store_papers(self, papers: Dict[str, Dict]):
+        now = time.time()
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO papers (paper_id, data, fetched) VALUES (?, ?, ?)",
+            ((paper_id, json.dumps(raw, ensure_ascii=False), now) for paper_id, raw in papers.items())
+        )
+        self.conn.commit()
+
+    def edges_among(self, paper_ids: Iterable[str]) -> Dict[str, List[str]]:
+        """Adjacency (citing -> cited) restricted to edges between the given papers"""
+        nodes = set(paper_ids)
+        ordered = sorted(nodes)
+        adjacency = {}
+        for start in range(0, len(ordered), 500):
+            chunk = ordered[start:start + 500]
+            rows = self.conn.execute(
+                f"SELECT citing, cited FROM edges WHERE citing IN ({','.join('?' * len(chunk))})", chunk
+            )
+            for citing, cited in rows:
+                if cited in nodes:
+                    adjacency.setdefault(citing, []).append(cited)
+        return adjacency
+
+
+def seed_id(paper: Dict) -> Optional[str]:
+    """
+    Semantic Scholar lookup id of a catalog paper
+
+    Returns:
+        Paper id, "ARXIV:<id>" or "DOI:<doi>", or None if the paper has no usable identifier
+    """
+    paper_id = paper.get('id', '')
+    if paper_id.startswith('s2:'):
+        return paper_id[len('s2:'):]
+    if paper_id.startswith('arxiv:'):
+        return f"ARXIV:{arxiv_base_id(paper_id[len('arxiv:'):])}"
+    if paper.get('doi'):
+        return f"DOI:{paper['doi']}"
+    return None
+
+
+def _lookup(paper_ids: List[str], cache: CitationCache, counters: Counter) -> Dict[str, Dict]:
+    """Raw records from the cache, fetching the missing ones with bulk requests"""
+    found = cache.get_papers(paper_ids)
+    counters['lookup_cached'] += len(found)
+    missing = [paper_id for paper_id in paper_ids if paper_id not in found]
+    if missing:
+        fetched = fetch_semantic_scholar_batch(missing)
+        counters['lookup_fetched'] += len(fetched)
+        cache.store_papers(fetched)
+        found.update(fetched)
+    return found
+
+
+def expand_citations(
+    seed_ids: List[str],
+    cache: CitationCache,
+    scorer_func=None,
+    min_score: float = 5.0,
+    max_depth: int = 2,
+    max_papers: int = 500,
+    max_fetches: Optional[int] = 200,
+    directions: Iterable[str] = DIRECTIONS,
+    max_edges: int = 1000,
+    batch_nodes: int = 20,
+    subtopic: str = "citation_graph",
+    max_age_days: Optional[float] = None
+) -> Tuple[List[Dict], Dict[str, List[str]], Counter]:
+    """
+    Breadth-first citation crawl from seed papers
+
+    Papers are expanded depth by depth; within a depth the most relevant
+    papers go first, so budget limits cut off the least promising part of
+    the frontier. Edges come from the cache when present, otherwise from
+    the Semantic Scholar edge endpoints. Neighbor metadata for a batch of
+    expanded papers is fetched with one bulk lookup and scored; neighbors
+    below min_score are neither kept nor expanded.
+
+    Args:
+        seed_ids: Semantic Scholar ids (or "ARXIV:", "DOI:" prefixed ids); seeds are kept regardless of score
+        cache: Edge and metadata cache
+        scorer_func: Scoring function (uses atmospheric_profile by default)
+        min_score: Minimum relevance score for discovered papers
+        max_depth: Citation hops from the seeds
+        max_papers: Stop adding papers at this catalog size
+        max_fetches: Edge lists fetched from the API (None = unlimited; cached lists are free)
+        directions: 'references' (papers cited) and/or 'citations' (citing papers)
+        max_edges: Neighbors fetched per paper and direction
+        batch_nodes: Papers expanded per bulk metadata lookup
+        subtopic: Subtopic of the normalized papers
+        max_age_days: Refetch cached edge lists older than this
+
+    Returns:
+        (papers with 'depth' and 'relevance_score', adjacency citing -> cited among them, crawl counters)
+    """
+    if scorer_func is None:
+        scorer_func = score_atmospheric_profile_paper
+
+    counters = Counter()
+    papers: Dict[str, Dict] = {}
+    rejected = set()
+    frontier = []  # (depth, -score, order, S2 id)
+
+    def add(raw: Dict, depth: int, score: float):
+        paper = normalize_paper_s2(raw, subtopic)
+        paper['relevance_score'] = round(score, 1)
+        paper['depth'] = depth
+        papers[raw['paperId']] = paper
+        if depth < max_depth:
+            heapq.heappush(frontier, (depth, -score, len(papers), raw['paperId']))
+
+    seeds = _lookup(list(dict.fromkeys(seed_ids)), cache, counters)
+    for requested in seed_ids:
+        raw = seeds.get(requested)
+        if raw is None or not raw.get('paperId'):
+            counters['seeds_missing'] += 1
+            print(f"  Seed not found: {requested}")
+        elif raw['paperId'] not in papers:
+            add(raw, 0, scorer_func(relevance_view_s2(raw)))
+
+    fetches = 0
+    while frontier and len(papers) < max_papers:
+        depth = frontier[0][0]
+        batch = []
+        while frontier and frontier[0][0] == depth and len(batch) < batch_nodes:
+            batch.append(heapq.heappop(frontier)[3])
+
+        candidates = {}
+        for paper_id in batch:
+            for direction in directions:
+                neighbor_ids = cache.neighbors(paper_id, direction, max_age_days)
+                if neighbor_ids is None:
+                    if max_fetches is not None and fetches >= max_fetches:
+                        counters['budget_skipped'] += 1
+                        continue
+                    fetches += 1
+                    neighbor_ids = fetch_semantic_scholar_edges(paper_id, direction, max_edges)
+                    if neighbor_ids is None:
+                        counters['fetch_errors'] += 1
+                        continue
+                    cache.store_neighbors(paper_id, direction, neighbor_ids)
+                    counters['edges_fetched'] += 1
+                else:
+                    counters['edges_cached'] += 1
+                counters['edge_lists'] += 1
+                for neighbor in neighbor_ids:
+                    if neighbor not in papers and neighbor not in rejected:
+                        candidates[neighbor] = None
+
+        if not candidates:
+            continue
+        candidates = sorted(candidates)  # Cached edge lists come back in index order
+        print(f"  Depth {depth + 1}: scoring {len(candidates)} neighbors of {len(batch)} papers "
+              f"({len(papers)} kept, {fetches} fetches)")
+
+        scored = []
+        with instrumentation.span('citations.score'):
+            found = _lookup(candidates, cache, counters)
+            for neighbor in candidates:
+                raw = found.get(neighbor)
+                if raw is None:
+                    continue
+                score = scorer_func(relevance_view_s2(raw))
+                if score < min_score or not raw.get('paperId'):
+                    rejected.add(neighbor)
+                    counters['below_threshold'] += 1
+                else:
+                    scored.append((score, neighbor, raw))
+
+        scored.sort(key=lambda item: -item[0])
+        for score, neighbor, raw in scored:
+            if len(papers) >= max_papers:
+                counters['budget_papers'] += 1
+                continue
+            if raw['paperId'] not in papers:
+                add(raw, depth + 1, score)
+
+    counters['fetches'] = fetches
+    counters['papers'] = len(papers)
+    for name, value in counters.items():
+        instrumentation.count(f"citations.{name}", value)
+
+    adjacency = cache.edges_among(papers)
+    return list(papers.values()), {f"s2:{citing}": [f"s2:{cited}" for cited in targets]
+                                   for citing, targets in adjacency.items()}, counters
+
+
+def pagerank(
+    adjacency: Dict[str, List[str]],
+    nodes: Optional[Iterable[str]] = None,
+    damping: float = 0.85,
+    iterations: int = 100,
+    tolerance: float = 1e-9
+) -> Dict[str, float]:
+    """
+    PageRank over a local citation graph (rank flows from citing to cited papers)
+
+    Args:
+        adjacency: citing id -> cited ids
+        nodes: All graph nodes (default: nodes appearing in adjacency)
+        damping: Probability of following a citation
+        iterations: Maximum power iterations
+        tolerance: Stop when the L1 change falls below this
+
+    Returns:
+        Dictionary node -> rank (ranks sum to 1)
+    """
+    nodes = list(dict.fromkeys(nodes if nodes is not None else
+                               [n for source, targets in adjacency.items() for n in (source, *targets)]))
+    if not nodes:
+        return {}
+    index = {node: i for i, node in enumerate(nodes)}
+    out_links = [[index[t] for t in adjacency.get(node, []) if t in index] for node in nodes]
+
+    n = len(nodes)
+    rank = [1.0 / n] * n
+    for _ in range(iterations):
+        dangling = sum(rank[i] for i, targets in enumerate(out_links) if not targets)
+        base = (1.0 - damping) / n + damping * dangling / n
+        updated = [base] * n
+        for i, targets in enumerate(out_links):
+            if targets:
+                share = damping * rank[i] / len(targets)
+                for j in targets:
+                    updated[j] += share
+        change = sum(abs(a - b) for a, b in zip(updated, rank))
+        rank = updated
+        if change < tolerance:
+            break
+
+    return dict(zip(nodes, rank))
+
+
+def write_adjacency(adjacency: Dict[str, List[str]], output_file: Path, nodes: Optional[Iterable[str]] = None,
+                    ranks: Optional[Dict[str, float]] = None):
+    """
+    Write a compact adjacency file
+
+    Nodes are listed once; each node's cited papers are stored as indices
+    into the node list. Use a .json.zst or .json.gz path to compress.
+
+    Args:
+        adjacency: citing id -> cited ids
+        output_file: Target path
+        nodes: Node order (default: sorted adjacency nodes)
+        ranks: Optional per-node scores stored alongside (e.g. PageRank)
+    """
+    nodes = list(nodes) if nodes is not None else sorted(
+        {n for source, targets in adjacency.items() for n in (source, *targets)})
+    index = {node: i for i, node in enumerate(nodes)}
+    graph = {
+        'created': datetime.now().isoformat(),
+        'direction': 'citing -> cited',
+        'nodes': nodes,
+        'edges': sum(len(targets) for targets in adjacency.values()),
+        'adjacency': [[index[t] for t in adjacency.get(node, []) if t in index] for node in nodes]
+    }
+    if ranks is not None:
+        graph['pagerank'] = [round(ranks.get(node, 0.0), 8) for node in nodes]
+    save_catalog(graph, output_file, compact=True)
+
+
+def load_adjacency(adjacency_file: Path) -> Dict[str, List[str]]:
+    """Read a file written by write_adjacency back into citing id -> cited ids"""
+    graph = load_catalog(adjacency_file)
+    if graph is None:
+        return {}
+    nodes = graph['nodes']
+    return {nodes[i]: [nodes[j] for j in targets] for i, targets in enumerate(graph['adjacency']) if targets}
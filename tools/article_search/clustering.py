@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+Automatic subtopic clustering
+Mini-batch k-means over paper embeddings, clusters labeled by their top terms
+"""
+
+import json
+import math
+import re
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from . import instrumentation
+from .catalog_builder import build_catalog, carry_over_metadata, load_catalog
+from .vector_index import HashingSVDEmbedder, paper_text, tokenize
+
+DEFAULT_SUBTOPIC_MODEL = Path("papers/subtopic_model")
+
+LABEL_SAMPLE = 20000  # Papers whose terms are counted for cluster labels
+LABEL_TERMS = 8  # Top terms kept per cluster
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("Subtopic clustering requires 'numpy'. Install it using: pip install numpy")
+
+
+def _normalize(vectors: 'np.ndarray') -> 'np.ndarray':
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def _kmeans_plus_plus(vectors: 'np.ndarray', k: int, rng) -> 'np.ndarray':
+    """k-means++ seeding (cosine distance on normalized vectors)"""
+    centers = [vectors[rng.integers(len(vectors))]]
+    distances = 1 - vectors @ centers[0]
+    for _ in range(1, k):
+        weights = np.maximum(distances, 0) ** 2
+        total = weights.sum()
+        index = rng.choice(len(vectors), p=weights / total) if total > 0 else rng.integers(len(vectors))
+        centers.append(vectors[index])
+        distances = np.minimum(distances, 1 - vectors @ vectors[index])
+    return np.array(centers, dtype=np.float32)
+
+
+def minibatch_kmeans(vectors: 'np.ndarray', k: int, batch_size: int = 1024, epochs: float = 3.0,
+                     tol: float = 1e-4, seed: int = 0) -> Tuple['np.ndarray', 'np.ndarray']:
+    """
+    Spherical mini-batch k-means (Sculley, 2010)
+
+    Each step assigns one random batch to its nearest centroids and moves
+    every centroid toward its batch members with a per-centroid learning rate
+    1/count, so the cost is linear in the number of vectors.
+
+    Args:
+        vectors: L2-normalized (n x dim) vectors
+        k: Number of clusters
+        batch_size: Vectors per step
+        epochs: Passes over the data at most (early stop when centroids settle)
+        tol: Stop when the largest centroid shift of a step is below this
+        seed: Random seed
+
+    Returns:
+        (centroids (k x dim), counts (k,)) where counts are the vectors seen per centroid
+    """
+    _require_numpy()
+    rng = np.random.default_rng(seed)
+    k = min(k, len(vectors))
+    sample = vectors[rng.choice(len(vectors), min(len(vectors), max(10000, 20 * k)), replace=False)]
+    centroids = _kmeans_plus_plus(sample, k, rng)
+    counts = np.zeros(k, dtype=np.float64)
+
+    steps = max(20, math.ceil(epochs * len(vectors) / batch_size))
+    settled = 0
+    for step in range(steps):
+        batch = vectors[rng.integers(len(vectors), size=min(batch_size, len(vectors)))]
+        nearest = np.argmax(batch @ centroids.T, axis=1)
+        previous = centroids.copy()
+        for c in np.unique(nearest):
+            members = batch[nearest == c]
+            counts[c] += len(members)
+            rate = len(members) / counts[c]
+            centroids[c] = (1 - rate) * centroids[c] + rate * members.mean(axis=0)
+        centroids = _normalize(centroids).astype(np.float32)
+
+        shift = float(np.max(np.sum((centroids - previous) ** 2, axis=1)))
+        settled = settled + 1 if shift < tol else 0
+        if settled >= 10:
+            break
+    instrumentation.count('clusters.kmeans_steps', step + 1)
+    return centroids, counts
+
+
+def _label_clusters(texts: Sequence[str], assignments: 'np.ndarray', k: int) -> List[List[str]]:
+    """
+    Top terms per cluster: frequent in the cluster and rarer elsewhere
+
+    Terms are scored by p(term | cluster) * log(p(term | cluster) / p(term)),
+    and terms overlapping a better-ranked term (e.g. a bigram's words) are skipped.
+    """
+    overall = Counter()
+    per_cluster = [Counter() for _ in range(k)]
+    sizes = np.bincount(assignments, minlength=k)
+    for text, cluster in zip(texts, assignments):
+        terms = set(tokenize(text))
+        overall.update(terms)
+        per_cluster[cluster].update(terms)
+
+    labels = []
+    for c in range(k):
+        scored = []
+        for term, df in per_cluster[c].items():
+            if df < 2:
+                continue
+            p_cluster = df / sizes[c]
+            scored.append((p_cluster * math.log(p_cluster / (overall[term] / len(texts))), term))
+        scored.sort(reverse=True)
+
+        terms, words = [], set()
+        for _, term in scored:
+            if words & set(term.split()):
+                continue
+            terms.append(term)
+            words.update(term.split())
+            if len(terms) == LABEL_TERMS:
+                break
+        labels.append(terms)
+    return labels
+
+
+def _slug(terms: List[str]) -> str:
+    """Subtopic label from top terms (e.g. "radio_occultation")"""
+    if not terms:
+        return "cluster"
+    words = terms[0].split()
+    if len(words) == 1 and len(terms) > 1:
+        words += terms[1].split()
+    return re.sub(r'[^a-z0-9]+', '_', ' '.join(words[:3])).strip('_') or "cluster"
+
+
+class SubtopicModel:
+    """
+    Fitted clusters that assign subtopics to papers
+
+    The model directory holds the embedding (svd.npz), the centroids and
+    per-centroid counts (clusters.npz), and labels and terms (clusters.json).
+    New papers are assigned to the nearest centroid; with update=True the
+    centroids keep moving with the same mini-batch learning rate, so the
+    model follows the corpus without reclustering. Labels stay fixed until
+    the model is refitted.
+    """
+
+    def __init__(self, embedder: HashingSVDEmbedder, centroids: 'np.ndarray', counts: 'np.ndarray',
+                 terms: List[List[str]], meta: Optional[Dict] = None):
+        _require_numpy()
+        self.embedder = embedder
+        self.centroids = centroids
+        self.counts = counts
+        self.terms = terms
+        self.labels = self._unique_labels(terms)
+        self.meta = meta or {}
+
+    @staticmethod
+    def _unique_labels(terms: List[List[str]]) -> List[str]:
+        """Cluster labels; a label already taken is extended by the cluster's next terms"""
+        labels = []
+        for cluster_terms in terms:
+            label = _slug(cluster_terms)
+            for term in cluster_terms[2:]:
+                if label not in labels:
+                    break
+                label = f"{label}_{_slug([term])}"
+            suffix = 2
+            while label in labels:
+                label = f"{_slug(cluster_terms)}_{suffix}"
+                suffix += 1
+            labels.append(label)
+        return labels
+
+    @property
+    def k(self) -> int:
+        return len(self.centroids)
+
+    @classmethod
+    def fit(cls, papers: Sequence[Dict], k: int = 12, dim: int = 128, batch_size: int = 1024,
+            epochs: float = 3.0, fit_sample: int = 10000, seed: int = 0,
+            embedder: Optional[HashingSVDEmbedder] = None, assign: bool = False) -> 'SubtopicModel':
+        """
+        Cluster papers into k subtopics
+
+        Args:
+            papers: Papers to cluster (title and abstract are used)
+            k: Number of clusters
+            dim: Embedding dimensions (when no embedder is given)
+            batch_size: Mini-batch size
+            epochs: Maximum passes over the papers
+            fit_sample: Papers used to fit the embedding (evenly spaced sample)
+            seed: Random seed
+            embedder: Reuse a fitted embedding (e.g. VectorIndex.embedder)
+            assign: Also set each paper's 'subtopic' to its cluster label
+
+        Returns:
+            Fitted model
+
+        Raises:
+            ValueError: If papers is empty
+        """
+        _require_numpy()
+        if not papers:
+            raise ValueError("No papers to cluster")
+        texts = [paper_text(p) for p in papers]
+        if embedder is None:
+            step = max(1, math.ceil(len(texts) / fit_sample))
+            embedder = HashingSVDEmbedder.fit(texts[::step], dim=dim, seed=seed)
+
+        with instrumentation.span('clusters.embed'):
+            vectors = embedder.transform(texts)
+        with instrumentation.span('clusters.fit'):
+            centroids, _ = minibatch_kmeans(vectors, k, batch_size=batch_size, epochs=epochs, seed=seed)
+
+            # One full assignment pass; centroids become their members' mean
+            assignments = _nearest(vectors, centroids)
+            counts = np.bincount(assignments, minlength=len(centroids)).astype(np.float64)
+            keep = counts > 0
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, vectors)
+            centroids, counts = _normalize(sums[keep]).astype(np.float32), counts[keep]
+            assignments = _nearest(vectors, centroids)
+
+        with instrumentation.span('clusters.label'):
+            step = max(1, math.ceil(len(texts) / LABEL_SAMPLE))
+            terms = _label_clusters(texts[::step], assignments[::step], len(centroids))
+
+        model = cls(embedder, centroids, counts, terms, {
+            'created': datetime.now().isoformat(),
+            'fitted_papers': len(papers)
+        })
+        if assign:
+            for paper, c in zip(papers, assignments):
+                paper['subtopic'] = model.labels[c]
+        return model
+
+    def assign(self, papers: Sequence[Dict], update: bool = True) -> List[str]:
+        """
+        Set each paper's 'subtopic' to its nearest cluster label
+
+        Args:
+            papers: Papers to assign (modified in place)
+            update: Move the centroids toward the new papers (mini-batch step)
+
+        Returns:
+            Assigned labels, in paper order
+        """
+        if not papers:
+            return []
+        with instrumentation.span('clusters.assign'):
+            vectors = self.embedder.transform([paper_text(p) for p in papers])
+            assignments = _nearest(vectors, self.centroids)
+
+            if update:
+                for c in np.unique(assignments):
+                    members = vectors[assignments == c]
+                    self.counts[c] += len(members)
+                    rate = len(members) / self.counts[c]
+                    self.centroids[c] = (1 - rate) * self.centroids[c] + rate * members.mean(axis=0)
+                self.centroids = _normalize(self.centroids).astype(np.float32)
+
+        labels = [self.labels[c] for c in assignments]
+        for paper, label in zip(papers, labels):
+            paper['subtopic'] = label
+        instrumentation.count('clusters.assigned', len(papers))
+        return labels
+
+    def cluster_terms(self) -> Dict[str, List[str]]:
+        """Top terms by cluster label"""
+        return dict(zip(self.labels, self.terms))
+
+    def save(self, model_dir: Path):
+        """Write the model to model_dir"""
+        model_dir = Path(model_dir)
+        model_dir.mkdir(parents=True, exist_ok=True)
+        self.embedder.save(model_dir)
+        np.savez(model_dir / "clusters.npz", centroids=self.centroids, counts=self.counts)
+        with open(model_dir / "clusters.json", 'w', encoding='utf-8') as f:
+            json.dump(dict(self.meta, k=self.k, labels=self.labels, terms=self.terms), f, indent=2,
+                      ensure_ascii=False)
+
+    @classmethod
+    def load(cls, model_dir: Path) -> 'SubtopicModel':
+        """Read a model written by save"""
+        _require_numpy()
+        model_dir = Path(model_dir)
+        if not (model_dir / "clusters.json").exists():
+            raise FileNotFoundError(f"No subtopic model found: {model_dir}")
+        with open(model_dir / "clusters.json", 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        data = np.load(model_dir / "clusters.npz")
+        terms = meta.pop('terms')
+        for key in ('k', 'labels'):
+            meta.pop(key, None)
+        return cls(HashingSVDEmbedder.load(model_dir, meta), data['centroids'], data['counts'], terms, meta)
+
+
+def _nearest(vectors: 'np.ndarray', centroids: 'np.ndarray', block: int = 65536) -> 'np.ndarray':
+    """Index of the most similar centroid per vector"""
+    return np.concatenate([
+        np.argmax(vectors[start:start + block] @ centroids.T, axis=1)
+        for start in range(0, len(vectors), block)
+    ]) if len(vectors) else np.zeros(0, dtype=np.int64)
+
+
+def assign_subtopics(papers: List[Dict], model_dir: Path, k: int = 12, refit: bool = False,
+                     update: bool = True) -> Optional[SubtopicModel]:
+    """
+    Assign subtopics with the model in model_dir, fitting it first if missing
+
+    Without papers nothing is fitted or saved; an existing model is returned unchanged.
+
+    Args:
+        papers: Papers to label (modified in place)
+        model_dir: Model directory
+        k: Clusters when a model is fitted
+        refit: Recluster even if a model exists
+        update: Move existing centroids toward the papers
+
+    Returns:
+        The (saved) model, or None if there are no papers and no saved model
+    """
+    model_dir = Path(model_dir)
+    exists = (model_dir / "clusters.json").exists()
+    if not papers:
+        return SubtopicModel.load(model_dir) if exists else None
+    if refit or not exists:
+        model = SubtopicModel.fit(papers, k=k, assign=True)
+    else:
+        model = SubtopicModel.load(model_dir)
+        model.assign(papers, update=update)
+    model.save(model_dir)
+    return model
+
+
+def cluster_catalog(catalog_file: Path, model_dir: Path = DEFAULT_SUBTOPIC_MODEL, output_file: Optional[Path] = None,
+                    k: int = 12, refit: bool = False, update: bool = True, compact: bool = False) -> Dict:
+    """
+    Replace the subtopics of a saved catalog with cluster labels
+
+    Args:
+        catalog_file: Catalog to relabel
+        model_dir: Subtopic model directory (fitted on this catalog if missing)
+        output_file: Where to write the catalog (default: overwrite catalog_file)
+        k: Clusters when a model is fitted
+        refit: Recluster even if a model exists
+        update: Move existing centroids toward the catalog's papers
+        compact: Write compact JSON
+
+    Returns:
+        Rebuilt catalog (subtopic_counts recomputed, 'subtopic_terms' in the metadata
+        unless the catalog is empty and no model exists)
+    """
+    catalog = load_catalog(catalog_file)
+    if catalog is None:
+        raise FileNotFoundError(f"Cannot load catalog: {catalog_file}")
+
+    papers = catalog.get('papers', [])
+    model = assign_subtopics(papers, model_dir, k=k, refit=refit, update=update)
+
+    previous = catalog.get('search_metadata', {})
+    metadata = carry_over_metadata(previous)
+    if model is not None:
+        metadata['subtopic_model'] = str(model_dir)
+        metadata['subtopic_terms'] = model.cluster_terms()
+
+    return build_catalog(
+        papers,
+        query=previous.get('query', ''),
+        output_file=output_file or catalog_file,
+        metadata=metadata,
+        compact=compact
+    )
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Relevance-prioritized PDF download scheduler
+Downloads the most relevant PDFs first within byte and wall-clock budgets, deferring the rest
+"""
+
+import json
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from . import instrumentation
+from .pdf_downloader import (
+    FETCH_DEADLINE,
+    FETCH_OK,
+    FETCH_TOO_LARGE,
+    fetch_pdf,
+    pdf_filename,
+    probe_pdf_size
+)
+
+DEFERRED_FILE = "deferred.json"
+
+# Reasons a download is deferred to a later run
+DEFER_BYTES = 'bytes'  # Doesn't fit the remaining byte budget
+DEFER_TIME = 'time'  # Wouldn't finish before the deadline
+DEFER_LARGE = 'large'  # Large file below the priority score
+
+
+def load_deferred(deferred_file: Path) -> List[Dict]:
+    """Deferred entries of an earlier run ({'paper', 'size', 'reason', 'deferred_at'})"""
+    try:
+        with open(deferred_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return []
+
+
+def _write_deferred(deferred_file: Path, entries: List[Dict]):
+    if not entries:
+        deferred_file.unlink(missing_ok=True)
+        return
+    tmp_file = deferred_file.with_name(deferred_file.name + '.tmp')
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(entries, f, indent=2, ensure_ascii=False)
+    tmp_file.replace(deferred_file)
+
+
+def schedule_downloads(
+    papers: List[Dict],
+    download_dir: Path,
+    max_bytes: Optional[int] = None,
+    max_seconds: Optional[float] = None,
+    max_downloads: Optional[int] = None,
+    large_file_bytes: Optional[int] = None,
+    priority_score: float = 8.0,
+    skip_ids: Optional[set] = None,
+    on_result: Optional[Callable[[Dict, bool], None]] = None,
+    deferred_file: Optional[Path] = None
+) -> Dict:
+    """
+    Download PDFs in order of relevance within byte and time budgets
+
+    Papers deferred by an earlier run (deferred_file) that are among papers
+    rejoin the queue as those paper records, keeping the known size.
+    Deferrals of other papers stay in deferred_file untouched. When a budget or the large-file rule is set, sizes come from HEAD
+    Content-Length (or the deferred entry). A file that doesn't fit is
+    deferred, and the scheduler moves on to smaller, less relevant files.
+    Files of unknown size are capped at the remaining byte budget and at
+    the deadline while streaming. Deferred papers are written to
+    deferred_file for the next run and are not reported to on_result, so
+    they are not recorded as failures.
+
+    Args:
+        papers: Paper dictionaries with 'pdf_url' and 'relevance_score'
+        download_dir: Directory to save PDFs
+        max_bytes: Total bytes to download in this run
+        max_seconds: Wall-clock budget in seconds
+        max_downloads: Maximum number of PDFs (the rest are skipped, not deferred)
+        large_file_bytes: Files larger than this are deferred unless relevance_score >= priority_score
+        priority_score: Relevance at which large files are still downloaded
+        skip_ids: Paper ids not to attempt (e.g. failed in an earlier run)
+        on_result: Called with (paper, success) after each download attempt
+        deferred_file: Deferred-download list (default: <download_dir>/deferred.json)
+
+    Returns:
+        Dictionary with download statistics (deferred counts by reason in 'deferred_reasons')
+    """
+    download_dir.mkdir(parents=True, exist_ok=True)
+    deferred_file = deferred_file or download_dir / DEFERRED_FILE
+    started = time.monotonic()
+    deadline = started + max_seconds if max_seconds else None
+    probe = bool(max_bytes or max_seconds or large_file_bytes)
+
+    # Queue: this run's papers by decreasing relevance. Earlier deferrals
+    # resolve to these records, so local_path lands in the caller's papers
+    carried = {}
+    kept = []
+    queue = list(papers)
+    ids = {paper.get('id') for paper in papers}
+    for entry in load_deferred(deferred_file):
+        paper_id = entry.get('paper', {}).get('id')
+        if paper_id in ids:
+            carried[paper_id] = entry
+        else:
+            kept.append(entry)
+    order = sorted(range(len(queue)), key=lambda i: -(queue[i].get('relevance_score') or 0))
+
+    stats = Counter()
+    reasons = Counter()
+    deferred = []
+    bytes_used = 0
+    download_seconds = 0.0
+
+    def defer(paper: Dict, size: Optional[int], reason: str):
+        deferred.append({'paper': paper, 'size': size, 'reason': reason,
+                         'deferred_at': datetime.now().isoformat()})
+        reasons[reason] += 1
+        instrumentation.count(f'schedule.deferred_{reason}')
+
+    for position, i in enumerate(order):
+        paper = queue[i]
+        if max_downloads and stats['downloaded'] >= max_downloads:
+            # Earlier deferrals stay queued for the next run
+            rest = [queue[j] for j in order[position:]]
+            for entry in (carried[p.get('id')] for p in rest if p.get('id') in carried):
+                deferred.append(entry)
+                reasons[entry.get('reason')] += 1
+            stats['skipped'] += len(rest)
+            break
+
+        if not paper.get('pdf_url') or (skip_ids and paper.get('id') in skip_ids):
+            stats['skipped'] += 1
+            continue
+
+        filename = pdf_filename(paper, download_dir, i)
+        if filename.exists():
+            paper['local_path'] = str(filename)
+            stats['downloaded'] += 1
+            continue
+
+        size = carried.get(paper.get('id'), {}).get('size')
+        remaining = max_bytes - bytes_used if max_bytes else None
+        if deadline and time.monotonic() >= deadline:
+            defer(paper, size, DEFER_TIME)
+            continue
+        if remaining is not None and remaining <= 0:
+            defer(paper, size, DEFER_BYTES)
+            continue
+        if size is None and probe:
+            size = probe_pdf_size(paper['pdf_url'])
+
+        score = paper.get('relevance_score') or 0
+        if size is not None:
+            if large_file_bytes and size > large_file_bytes and score < priority_score:
+                defer(paper, size, DEFER_LARGE)
+                continue
+            if remaining is not None and size > remaining:
+                defer(paper, size, DEFER_BYTES)
+                continue
+            # Observed throughput predicts whether the file finishes in time
+            if deadline and bytes_used and time.monotonic() + size * download_seconds / bytes_used > deadline:
+                defer(paper, size, DEFER_TIME)
+                continue
+
+        size_note = f" ({size / 1e6:.1f} MB)" if size else ""
+        print(f"[{position + 1}/{len(order)}] Downloading{size_note}: {paper['title'][:60]}...")
+
+        t = time.monotonic()
+        outcome = fetch_pdf(paper['pdf_url'], filename, max_bytes=remaining, deadline=deadline)
+        download_seconds += time.monotonic() - t
+
+        if outcome == FETCH_OK:
+            paper['local_path'] = str(filename)
+            paper['pdf_bytes'] = filename.stat().st_size
+            bytes_used += paper['pdf_bytes']
+            stats['downloaded'] += 1
+        elif outcome == FETCH_TOO_LARGE:
+            bytes_used = max_bytes  # The remaining budget went into the partial body
+            defer(paper, size, DEFER_BYTES)
+            continue
+        elif outcome == FETCH_DEADLINE:
+            defer(paper, size, DEFER_TIME)
+            continue
+        else:
+            stats['failed'] += 1
+
+        if on_result:
+            on_result(paper, outcome == FETCH_OK)
+
+    _write_deferred(deferred_file, kept + deferred)
+    instrumentation.count('schedule.bytes', bytes_used)
+
+    return {
+        'downloaded': stats['downloaded'],
+        'failed': stats['failed'],
+        'skipped': stats['skipped'],
+        'deferred': len(deferred),
+        'deferred_reasons': dict(reasons),
+        'bytes': bytes_used,
+        'seconds': round(time.monotonic() - started, 1),
+        'total': len(queue)
+    }
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP session
+One pooled requests.Session so repeated API calls reuse connections
+"""
+
+import threading
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    import requests
+
+CONTACT_EMAIL = "contact@research.edu"  # Sent to APIs with "polite" request pools
+USER_AGENT = f"Scientific-Research-Bot/1.0 (academic-research; mailto:{CONTACT_EMAIL})"
+POOL_SIZE = 16  # Connections kept per host
+
+_session: Optional['requests.Session'] = None
+_lock = threading.Lock()
+
+
+def get_session() -> 'requests.Session':
+    """
+    Process-wide session with keep-alive connection pools and our User-Agent
+
+    requests is imported on first use, so commands that never touch the
+    network (--help, report-only runs) don't pay for loading it.
+    """
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                session.headers['User-Agent'] = USER_AGENT
+                _session = session
+    return _session
+
+
+def close_session():
+    """Close pooled connections (a new session is created on next use)"""
+    global _session
+    with _lock:
+        if _session is not None:
+            _session.close()
+            _session = None
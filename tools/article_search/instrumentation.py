@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Lightweight run instrumentation
+Named timing spans and counters with JSON, Prometheus textfile and table output
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator
+
+PROMETHEUS_PREFIX = "article_search"
+
+_METRIC_LABEL = re.compile(r'[\\"\n]')
+
+
+class Profiler:
+    """
+    Thread-safe aggregate of spans and counters
+
+    A span name accumulates calls, total, min and max seconds; nested spans
+    are aggregated independently (a stage span includes its API spans).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started = time.time()
+            self.spans: Dict[str, Dict[str, float]] = {}
+            self.counters: Dict[str, float] = {}
+
+    def add_time(self, name: str, seconds: float, calls: int = 1):
+        """Record seconds spent in a span (calls may batch several occurrences)"""
+        with self._lock:
+            span = self.spans.get(name)
+            if span is None:
+                self.spans[name] = {'calls': calls, 'total': seconds, 'min': seconds, 'max': seconds}
+            else:
+                span['calls'] += calls
+                span['total'] += seconds
+                span['min'] = min(span['min'], seconds)
+                span['max'] = max(span['max'], seconds)
+
+    def count(self, name: str, value: float = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - started)
+
+    def sleep(self, seconds: float, source: str):
+        """time.sleep recorded as span 'sleep.<source>'"""
+        if seconds > 0:
+            with self.span(f"sleep.{source}"):
+                time.sleep(seconds)
+
+    def to_dict(self) -> Dict:
+        with self._lock:
+            return {
+                'started': datetime.fromtimestamp(self.started).isoformat(),
+                'wall_seconds': round(time.time() - self.started, 3),
+                'spans': {
+                    name: {
+                        'calls': span['calls'],
+                        'total_s': round(span['total'], 6),
+                        'mean_ms': round(span['total'] / span['calls'] * 1000, 3) if span['calls'] else 0,
+                        'min_ms': round(span['min'] * 1000, 3),
+                        'max_ms': round(span['max'] * 1000, 3)
+                    }
+                    for name, span in sorted(self.spans.items())
+                },
+                'counters': dict(sorted(self.counters.items()))
+            }
+
+    def write_json(self, output_file: Path):
+        output_file = Path(output_file)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def write_prometheus(self, output_file: Path, prefix: str = PROMETHEUS_PREFIX):
+        """
+        Write metrics in Prometheus text format for node_exporter's textfile collector
+
+        The file is replaced atomically so the collector never reads a partial write.
+        """
+        profile = self.to_dict()
+
+        def label(value: str) -> str:
+            return _METRIC_LABEL.sub(lambda m: '\\' + ('n' if m.group() == '\n' else m.group()), value)
+
+        lines = [
+            f"# HELP {prefix}_span_seconds_total Time spent in each span.",
+            f"# TYPE {prefix}_span_seconds_total counter",
+        ]
+        lines += [f'{prefix}_span_seconds_total{{span="{label(name)}"}} {span["total_s"]}'
+                  for name, span in profile['spans'].items()]
+        lines += [
+            f"# HELP {prefix}_span_calls_total Number of times each span ran.",
+            f"# TYPE {prefix}_span_calls_total counter",
+        ]
+        lines += [f'{prefix}_span_calls_total{{span="{label(name)}"}} {span["calls"]}'
+                  for name, span in profile['spans'].items()]
+        lines += [
+            f"# HELP {prefix}_events_total Pipeline counters.",
+            f"# TYPE {prefix}_events_total counter",
+        ]
+        lines += [f'{prefix}_events_total{{name="{label(name)}"}} {value}'
+                  for name, value in profile['counters'].items()]
+        lines += [
+            f"# HELP {prefix}_run_wall_seconds Wall time of the last run.",
+            f"# TYPE {prefix}_run_wall_seconds gauge",
+            f"{prefix}_run_wall_seconds {profile['wall_seconds']}",
+        ]
+
+        output_file = Path(output_file)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = output_file.with_name(output_file.name + '.tmp')
+        tmp_file.write_text("\n".join(lines) + "\n", encoding='utf-8')
+        os.replace(tmp_file, output_file)
+
+    def format_table(self) -> str:
+        """Summary table of spans (by total time) and counters"""
+        profile = self.to_dict()
+        wall = profile['wall_seconds'] or 1
+
+        lines = [f"{'Span':<36} {'Calls':>7} {'Total s':>9} {'Mean ms':>9} {'Max ms':>9} {'% run':>6}"]
+        lines.append("-" * 81)
+        for name, span in sorted(profile['spans'].items(), key=lambda item: -item[1]['total_s']):
+            lines.append(f"{name:<36} {span['calls']:>7} {span['total_s']:>9.3f} {span['mean_ms']:>9.1f} "
+                         f"{span['max_ms']:>9.1f} {span['total_s'] / wall * 100:>5.1f}%")
+        if profile['counters']:
+            lines.append("")
+            lines.append(f"{'Counter':<36} {'Value':>12}")
+            lines.append("-" * 49)
+            for name, value in profile['counters'].items():
+                lines.append(f"{name:<36} {value:>12,}")
+        lines.append(f"\nWall time: {profile['wall_seconds']:.2f}s")
+        return "\n".join(lines)
+
+
+# Process-wide profiler used by the article_search modules
+PROFILER = Profiler()
+
+
+def span(name: str):
+    """Time a block as span name on the shared profiler"""
+    return PROFILER.span(name)
+
+
+def count(name: str, value: float = 1):
+    """Increment a counter on the shared profiler"""
+    PROFILER.count(name, value)
+
+
+def sleep(seconds: float, source: str):
+    """Rate-limit sleep recorded on the shared profiler"""
+    PROFILER.sleep(seconds, source)
+
+
+def get_profiler(reset: bool = False) -> Profiler:
+    """Shared profiler (optionally cleared first)"""
+    if reset:
+        PROFILER.reset()
+    return PROFILER
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Registry of known papers shared across search runs
+Matches results by catalog id or by title fingerprint across sources
+"""
+
+import hashlib
+import re
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+DEFAULT_REGISTRY = Path("papers/paper_registry.sqlite")
+
+_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+
+
+def title_fingerprint(title: Optional[str]) -> Optional[str]:
+    """
+    Source-independent title fingerprint
+
+    Case, punctuation and whitespace are ignored, so the arXiv and
+    Semantic Scholar records of one paper share a fingerprint.
+
+    Returns:
+        16-character hex digest, or None for an empty title
+    """
+    normalized = ' '.join(_NON_ALNUM.split((title or '').lower())).strip()
+    if not normalized:
+        return None
+    return hashlib.sha1(normalized.encode('utf-8')).hexdigest()[:16]
+
+
+class PaperRegistry:
+    """
+    SQLite set of catalogued paper ids and title fingerprints
+
+    Papers are registered once they reach a catalog; later runs can then
+    skip them before scoring (see --new-only).
+    """
+
+    def __init__(self, registry_file: Path = DEFAULT_REGISTRY):
+        self.registry_file = Path(registry_file)
+        self.registry_file.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.registry_file))
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS papers (
+                id TEXT PRIMARY KEY, fingerprint TEXT, title TEXT,
+                first_seen TEXT NOT NULL, last_seen TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS papers_fingerprint ON papers (fingerprint);
+        """)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM papers").fetchone()[0]
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+    def is_known(self, paper_id: str, title: Optional[str] = None) -> bool:
+        """True if the id, or a paper with the same title fingerprint, is registered"""
+        if self.conn.execute("SELECT 1 FROM papers WHERE id = ?", (paper_id,)).fetchone():
+            return True
+        fingerprint = title_fingerprint(title)
+        if fingerprint is None:
+            return False
+        return self.conn.execute(
+            "SELECT 1 FROM papers WHERE fingerprint = ? LIMIT 1", (fingerprint,)
+        ).fetchone() is not None
+
+    def add_papers(self, papers: Iterable[Dict]) -> int:
+        """
+        Register normalized papers (updates last_seen of known ones)
+
+        Returns:
+            Number of papers that were not registered before
+        """
+        now = datetime.now().isoformat()
+        before = len(self)
+        self.conn.executemany(
+            """
+            INSERT INTO papers (id, fingerprint, title, first_seen, last_seen) VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (id) DO UPDATE SET last_seen = excluded.last_seen
+            """,
+            ((p['id'], title_fingerprint(p.get('title')), p.get('title'), now, now) for p in papers)
+        )
+        self.conn.commit()
+        return len(self) - before
+
+
+class KnownPaperSet:
+    """
+    In-memory counterpart of PaperRegistry for one catalog
+
+    Same is_known / add_papers interface, so search_papers can skip the
+    papers of a catalog kept in memory (e.g. by the watch daemon) without
+    a database lookup per result.
+    """
+
+    def __init__(self, papers: Iterable[Dict] = ()):
+        self.ids = set()
+        self.fingerprints = set()
+        self.add_papers(papers)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def is_known(self, paper_id: str, title: Optional[str] = None) -> bool:
+        """True if the id, or a paper with the same title fingerprint, was added"""
+        return paper_id in self.ids or title_fingerprint(title) in self.fingerprints
+
+    def add_papers(self, papers: Iterable[Dict]) -> int:
+        """Add papers; returns the number of new ids"""
+        before = len(self.ids)
+        for paper in papers:
+            self.ids.add(paper['id'])
+            fingerprint = title_fingerprint(paper.get('title'))
+            if fingerprint:
+                self.fingerprints.add(fingerprint)
+        return len(self.ids) - before
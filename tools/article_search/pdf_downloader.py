@@ -3,61 +3,136 @@
 PDF download utilities with validation
 """
 
-import requests
 import time
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Dict, Optional
+
+from . import instrumentation
+from .http_session import get_session
 
 DOWNLOAD_DELAY = 2.0  # Delay between downloads
+HEAD_DELAY = 0.5  # Delay between HEAD size probes
+ARXIV_PDF_URL = "https://arxiv.org/pdf"
 USER_AGENT = "Scientific-Research-Bot/1.0 (academic-research; contact@research.edu)"
 
 
-def download_pdf(url: str, filename: Path, verify_pdf: bool = True) -> bool:
+# fetch_pdf outcomes
+FETCH_OK = 'ok'
+FETCH_INVALID = 'invalid'  # Body is not a PDF
+FETCH_HTTP_ERROR = 'http_error'
+FETCH_ERROR = 'error'  # Connection / timeout / IO error
+FETCH_TOO_LARGE = 'too_large'  # Body exceeded max_bytes
+FETCH_DEADLINE = 'deadline'  # Body still streaming at the deadline
+
+
+def fetch_pdf(url: str, filename: Path, verify_pdf: bool = True, max_bytes: Optional[int] = None,
+              deadline: Optional[float] = None) -> str:
     """
-    Download PDF file with validation
+    Download PDF file with validation and optional size / time caps
 
     Args:
         url: PDF URL to download
         filename: Target filename (Path object)
         verify_pdf: Verify PDF header after download
+        max_bytes: Abort once the body exceeds this many bytes
+        deadline: Abort if still downloading at this time.monotonic() value
 
     Returns:
-        True if download successful, False otherwise
+        One of the FETCH_* outcomes; partial files are removed unless FETCH_OK
     """
     try:
         headers = {"User-Agent": USER_AGENT}
-        response = requests.get(url, headers=headers, stream=True, timeout=90)
-        time.sleep(DOWNLOAD_DELAY)
+        with instrumentation.span('download.request'):
+            response = get_session().get(url, headers=headers, stream=True, timeout=90)
+        instrumentation.sleep(DOWNLOAD_DELAY, 'download')
 
         if response.status_code == 200:
             # Write file
-            with open(filename, 'wb') as f:
+            size = 0
+            outcome = FETCH_OK
+            with instrumentation.span('download.body'), open(filename, 'wb') as f:
                 for chunk in response.iter_content(chunk_size=8192):
                     if chunk:
                         f.write(chunk)
+                        size += len(chunk)
+                        if max_bytes is not None and size > max_bytes:
+                            outcome = FETCH_TOO_LARGE
+                            break
+                        if deadline is not None and time.monotonic() > deadline:
+                            outcome = FETCH_DEADLINE
+                            break
+            instrumentation.count('download.bytes', size)
+
+            if outcome != FETCH_OK:
+                response.close()
+                filename.unlink()
+                instrumentation.count(f'download.{outcome}')
+                return outcome
 
             # Verify it's a valid PDF
             if verify_pdf:
                 with open(filename, 'rb') as f:
                     header = f.read(4)
                     if header == b'%PDF':
-                        return True
+                        instrumentation.count('download.files')
+                        return FETCH_OK
                     else:
                         # Not a valid PDF, remove file
                         filename.unlink()
+                        instrumentation.count('download.invalid')
                         print(f"Invalid PDF: {filename.name}")
-                        return False
-            return True
+                        return FETCH_INVALID
+            instrumentation.count('download.files')
+            return FETCH_OK
         else:
+            response.close()
+            instrumentation.count('download.http_errors')
             print(f"HTTP {response.status_code}: {url}")
-            return False
+            return FETCH_HTTP_ERROR
 
     except Exception as e:
+        instrumentation.count('download.errors')
         print(f"Download error ({filename.name}): {e}")
         # Clean up partial file
         if filename.exists():
             filename.unlink()
-        return False
+        return FETCH_ERROR
+
+
+def download_pdf(url: str, filename: Path, verify_pdf: bool = True) -> bool:
+    """
+    Download PDF file with validation
+
+    Args:
+        url: PDF URL to download
+        filename: Target filename (Path object)
+        verify_pdf: Verify PDF header after download
+
+    Returns:
+        True if download successful, False otherwise
+    """
+    return fetch_pdf(url, filename, verify_pdf) == FETCH_OK
+
+
+def probe_pdf_size(url: str) -> Optional[int]:
+    """
+    Size of a PDF from a HEAD request (redirects followed)
+
+    Returns:
+        Content-Length in bytes, or None if the server doesn't report it
+    """
+    try:
+        with instrumentation.span('download.head'):
+            response = get_session().head(url, headers={"User-Agent": USER_AGENT}, allow_redirects=True, timeout=30)
+        instrumentation.sleep(HEAD_DELAY, 'head')
+        instrumentation.count('download.head_requests')
+        length = response.headers.get('Content-Length')
+        if response.status_code == 200 and length and length.isdigit():
+            return int(length)
+    except Exception as e:
+        instrumentation.count('download.head_errors')
+        print(f"HEAD error ({url}): {e}")
+    return None
 
 
 def download_arxiv_pdf(arxiv_id: str, download_dir: Path) -> Optional[Path]:
@@ -71,7 +146,7 @@ def download_arxiv_pdf(arxiv_id: str, download_dir: Path) -> Optional[Path]:
     Returns:
         Path to downloaded file or None if failed
     """
-    url = f"https://arxiv.org/pdf/{arxiv_id}.pdf"
+    url = f"{ARXIV_PDF_URL}/{arxiv_id}.pdf"
     safe_id = arxiv_id.replace('/', '_').replace(':', '_')
     filename = download_dir / f"arxiv_{safe_id}.pdf"
 
@@ -83,7 +158,19 @@ def download_arxiv_pdf(arxiv_id: str, download_dir: Path) -> Optional[Path]:
     return None
 
 
-def batch_download_pdfs(papers: list, download_dir: Path, max_downloads: Optional[int] = None) -> dict:
+def pdf_filename(paper: Dict, download_dir: Path, index: int = 0) -> Path:
+    """Local PDF path of a paper (from its id, else its list position)"""
+    paper_id = paper.get('id', f'paper_{index}').replace(':', '_').replace('/', '_')
+    return download_dir / f"{paper_id}.pdf"
+
+
+def batch_download_pdfs(
+    papers: list,
+    download_dir: Path,
+    max_downloads: Optional[int] = None,
+    skip_ids: Optional[set] = None,
+    on_result: Optional[Callable[[Dict, bool], None]] = None
+) -> dict:
     """
     Download multiple PDFs from paper list
 
@@ -91,6 +178,8 @@ def batch_download_pdfs(papers: list, download_dir: Path, max_downloads: Optiona
         papers: List of paper dictionaries with 'pdf_url' field
         download_dir: Directory to save PDFs
         max_downloads: Maximum number of PDFs to download (None = all)
+        skip_ids: Paper ids not to attempt (e.g. failed in an earlier run)
+        on_result: Called with (paper, success) after each download attempt
 
     Returns:
         Dictionary with download statistics and updated paper list
@@ -106,13 +195,12 @@ def batch_download_pdfs(papers: list, download_dir: Path, max_downloads: Optiona
             skipped += len(papers) - i
             break
 
-        if not paper.get('pdf_url'):
+        if not paper.get('pdf_url') or (skip_ids and paper.get('id') in skip_ids):
             skipped += 1
             continue
 
         # Generate safe filename
-        paper_id = paper.get('id', f'paper_{i}').replace(':', '_').replace('/', '_')
-        filename = download_dir / f"{paper_id}.pdf"
+        filename = pdf_filename(paper, download_dir, i)
 
         if filename.exists():
             paper['local_path'] = str(filename)
@@ -121,12 +209,16 @@ def batch_download_pdfs(papers: list, download_dir: Path, max_downloads: Optiona
 
         print(f"[{i+1}/{len(papers)}] Downloading: {paper['title'][:60]}...")
 
-        if download_pdf(paper['pdf_url'], filename):
+        success = download_pdf(paper['pdf_url'], filename)
+        if success:
             paper['local_path'] = str(filename)
             downloaded += 1
         else:
             failed += 1
 
+        if on_result:
+            on_result(paper, success)
+
     return {
         'downloaded': downloaded,
         'failed': failed,
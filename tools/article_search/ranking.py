@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Relevance ranking helpers
+Heap-based partial selection so only the needed top papers get ordered
+"""
+
+import heapq
+from typing import Callable, Dict, Iterable, List, Optional
+
+
+def relevance_key(paper: Dict) -> float:
+    """Sort key: relevance score"""
+    return paper.get('relevance_score', 0)
+
+
+def catalog_key(paper: Dict) -> tuple:
+    """Sort key used for catalogs: relevance score, then newer year"""
+    return (paper.get('relevance_score', 0), paper.get('year') or 0)
+
+
+def top_k_by_relevance(
+    papers: Iterable[Dict],
+    k: Optional[int] = None,
+    key: Callable[[Dict], object] = relevance_key
+) -> List[Dict]:
+    """
+    Best k papers, best first
+
+    Uses a bounded heap (O(n log k)); the full list is only sorted when
+    k is None. Ties keep input order, matching a stable descending sort.
+
+    Args:
+        papers: Papers to rank
+        k: Number of papers to return (None = all)
+        key: Ranking key (higher is better)
+
+    Returns:
+        List of at most k papers
+    """
+    if k is None:
+        return sorted(papers, key=key, reverse=True)
+    return heapq.nlargest(k, papers, key=key)
+
+
+def top_k_per_group(
+    papers: Iterable[Dict],
+    k: Optional[int] = None,
+    group_by: str = 'subtopic',
+    default: str = 'other',
+    key: Callable[[Dict], object] = relevance_key
+) -> Dict[str, List[Dict]]:
+    """
+    Best k papers of each group in one pass
+
+    Args:
+        papers: Papers to rank
+        k: Papers per group (None = all, fully sorted)
+        group_by: Paper field to group by
+        default: Group for papers without the field
+        key: Ranking key (higher is better)
+
+    Returns:
+        Dictionary mapping group value to its best papers, best first
+    """
+    groups = {}
+    for paper in papers:
+        group = paper.get(group_by, default)
+        if group not in groups:
+            groups[group] = TopK(k, key)
+        groups[group].push(paper)
+    return {group: top.items() for group, top in groups.items()}
+
+
+class TopK:
+    """
+    Bounded min-heap keeping the k best items pushed so far
+
+    Earlier items win ties. With k=None every item is kept.
+    """
+
+    def __init__(self, k: Optional[int] = None, key: Callable[[Dict], object] = relevance_key):
+        self.k = k
+        self.key = key
+        self._heap = []
+        self._seq = 0
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, item: Dict):
+        entry = (self.key(item), -self._seq, item)
+        self._seq += 1
+        if self.k is None or len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif self.k > 0 and entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+
+    def items(self) -> List[Dict]:
+        """Kept items, best first"""
+        return [item for _, _, item in sorted(self._heap, key=lambda e: e[:2], reverse=True)]
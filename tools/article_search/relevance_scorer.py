@@ -4,7 +4,55 @@
 Calculates relevance score based on keywords, citations, and context
 """
 
-from typing import Dict, List, Optional
+import re
+import time
+from collections import Counter
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from . import instrumentation
+from .paper_registry import title_fingerprint
+from .text_extractor import TextCache, update_text_cache
+
+# Pre-configured keyword sets (keyword arguments of calculate_relevance)
+ATMOSPHERIC_PROFILE_KEYWORDS = {
+    'core_keywords': [
+        'radiosonde', 'stratosphere', 'stratospheric',
+        'vertical profile', 'atmospheric profile',
+        'upper atmosphere', 'sounding', '0.1 hpa'
+    ],
+    'high_priority_keywords': [
+        'profile reconstruction', 'profile retrieval', 'extrapolation',
+        'gps-ro', 'gps radio occultation', 'temperature profile',
+        'humidity profile', 'reanalysis', 'era5', 'merra'
+    ],
+    'medium_priority_keywords': [
+        'interpolation', 'data assimilation', 'satellite',
+        'upper air', 'meteorological', 'atmospheric model'
+    ],
+    'context_keywords': [
+        'machine learning', 'neural network', 'deep learning',
+        'weather forecasting', 'climate model', 'numerical prediction'
+    ]
+}
+
+ML_WEATHER_KEYWORDS = {
+    'core_keywords': [
+        'weather forecasting', 'weather prediction',
+        'transformer weather', 'neural network weather'
+    ],
+    'high_priority_keywords': [
+        'machine learning', 'deep learning', 'neural network',
+        'transformer', 'attention mechanism', 'graphcast', 'pangu'
+    ],
+    'medium_priority_keywords': [
+        'meteorological', 'atmospheric', 'climate model',
+        'numerical weather prediction', 'data-driven'
+    ],
+    'context_keywords': [
+        'vertical profile', 'temperature', 'precipitation',
+        'reanalysis', 'era5', 'benchmark'
+    ]
+}
 
 
 def calculate_relevance(
@@ -29,8 +77,8 @@ def calculate_relevance(
     Returns:
         Relevance score from 1.0 to 10.0
     """
-    title = paper.get('title', '').lower()
-    abstract = paper.get('abstract', '').lower()
+    title = (paper.get('title') or '').lower()
+    abstract = (paper.get('abstract') or '').lower()
 
     score = 5.0  # Base score
 
@@ -83,36 +131,7 @@ def score_atmospheric_profile_paper(paper: Dict) -> float:
 
     Pre-configured keyword sets for atmospheric profiling research
     """
-    core_keywords = [
-        'radiosonde', 'stratosphere', 'stratospheric',
-        'vertical profile', 'atmospheric profile',
-        'upper atmosphere', 'sounding', '0.1 hpa'
-    ]
-
-    high_priority_keywords = [
-        'profile reconstruction', 'profile retrieval', 'extrapolation',
-        'gps-ro', 'gps radio occultation', 'temperature profile',
-        'humidity profile', 'reanalysis', 'era5', 'merra'
-    ]
-
-    medium_priority_keywords = [
-        'interpolation', 'data assimilation', 'satellite',
-        'upper air', 'meteorological', 'atmospheric model'
-    ]
-
-    context_keywords = [
-        'machine learning', 'neural network', 'deep learning',
-        'weather forecasting', 'climate model', 'numerical prediction'
-    ]
-
-    return calculate_relevance(
-        paper,
-        core_keywords=core_keywords,
-        high_priority_keywords=high_priority_keywords,
-        medium_priority_keywords=medium_priority_keywords,
-        context_keywords=context_keywords,
-        boost_citations=True
-    )
+    return calculate_relevance(paper, boost_citations=True, **ATMOSPHERIC_PROFILE_KEYWORDS)
 
 
 def score_ml_weather_paper(paper: Dict) -> float:
@@ -121,34 +140,7 @@ def score_ml_weather_paper(paper: Dict) -> float:
 
     Pre-configured for ML/DL weather prediction research
     """
-    core_keywords = [
-        'weather forecasting', 'weather prediction',
-        'transformer weather', 'neural network weather'
-    ]
-
-    high_priority_keywords = [
-        'machine learning', 'deep learning', 'neural network',
-        'transformer', 'attention mechanism', 'graphcast', 'pangu'
-    ]
-
-    medium_priority_keywords = [
-        'meteorological', 'atmospheric', 'climate model',
-        'numerical weather prediction', 'data-driven'
-    ]
-
-    context_keywords = [
-        'vertical profile', 'temperature', 'precipitation',
-        'reanalysis', 'era5', 'benchmark'
-    ]
-
-    return calculate_relevance(
-        paper,
-        core_keywords=core_keywords,
-        high_priority_keywords=high_priority_keywords,
-        medium_priority_keywords=medium_priority_keywords,
-        context_keywords=context_keywords,
-        boost_citations=True
-    )
+    return calculate_relevance(paper, boost_citations=True, **ML_WEATHER_KEYWORDS)
 
 
 def filter_by_relevance(papers: List[Dict], min_score: float = 5.0, scorer_func=None) -> List[Dict]:
@@ -167,12 +159,280 @@ def filter_by_relevance(papers: List[Dict], min_score: float = 5.0, scorer_func=
         scorer_func = score_atmospheric_profile_paper
 
     scored_papers = []
-    for paper in papers:
-        score = scorer_func(paper)
-        if score >= min_score:
+    with instrumentation.span('scoring.filter'):
+        for paper in papers:
+            score = scorer_func(paper)
+            if score >= min_score:
+                paper['relevance_score'] = round(score, 1)
+                scored_papers.append(paper)
+
+        # Sort by relevance
+        scored_papers.sort(key=lambda x: x['relevance_score'], reverse=True)
+    instrumentation.count('scoring.papers', len(papers))
+    return scored_papers
+
+
+def prefilter_by_relevance(
+    raw_papers: Iterable[Dict],
+    paper_id: Callable[[Dict], str],
+    normalize: Optional[Callable[[Dict], Dict]] = None,
+    min_score: float = 5.0,
+    scorer_func=None,
+    score_view: Optional[Callable[[Dict], Dict]] = None,
+    seen_ids: Optional[set] = None,
+    counters: Optional[Counter] = None,
+    is_known: Optional[Callable[[str, Dict], bool]] = None,
+    seen_titles: Optional[set] = None
+) -> Iterator[Dict]:
+    """
+    Deduplicate and score raw search results before normalizing them
+
+    Duplicates are dropped by id (and by title with seen_titles), then each
+    result is scored on the few fields the scorer reads; only results
+    reaching min_score are normalized. Unlike filter_by_relevance the output
+    keeps input order (not sorted).
+
+    Args:
+        raw_papers: Raw API results
+        paper_id: Returns the catalog id of a raw result
+        normalize: Converts a raw result to the standard format (None = as is)
+        min_score: Minimum relevance score threshold
+        scorer_func: Scoring function (uses atmospheric_profile by default)
+        score_view: Extracts the scored fields of a raw result (None = raw result)
+        seen_ids: Ids already seen; updated in place, including dropped results
+        counters: Counter updated with 'fetched', 'duplicate', 'known', 'below_threshold', 'kept'
+        is_known: Called with (id, scored fields); True drops the result unscored
+        seen_titles: Title fingerprints already seen; when given, a result whose
+            title matches one is a duplicate (merges records of one paper across sources)
+
+    Yields:
+        Normalized papers with 'relevance_score' set
+    """
+    if scorer_func is None:
+        scorer_func = score_atmospheric_profile_paper
+    if seen_ids is None:
+        seen_ids = set()
+    if counters is None:
+        counters = Counter()
+
+    # Scoring time is accumulated locally and recorded once per pass
+    scored = 0
+    scoring_time = 0.0
+    try:
+        for raw in raw_papers:
+            counters['fetched'] += 1
+
+            pid = paper_id(raw)
+            if pid in seen_ids:
+                counters['duplicate'] += 1
+                continue
+            seen_ids.add(pid)
+
+            view = score_view(raw) if score_view else raw
+            if seen_titles is not None:
+                fingerprint = title_fingerprint(view.get('title'))
+                if fingerprint is not None:
+                    if fingerprint in seen_titles:
+                        counters['duplicate'] += 1
+                        continue
+                    seen_titles.add(fingerprint)
+
+            if is_known and is_known(pid, view):
+                counters['known'] += 1
+                continue
+
+            started = time.perf_counter()
+            score = scorer_func(view)
+            scoring_time += time.perf_counter() - started
+            scored += 1
+            if score < min_score:
+                counters['below_threshold'] += 1
+                continue
+
+            paper = normalize(raw) if normalize else raw
             paper['relevance_score'] = round(score, 1)
-            scored_papers.append(paper)
+            counters['kept'] += 1
+            yield paper
+    finally:
+        if scored:
+            instrumentation.PROFILER.add_time('scoring.prefilter', scoring_time, calls=scored)
+            instrumentation.count('scoring.papers', scored)
+
+
+# Full-text scoring: section weights (None = stop, rest of the paper is references)
+SECTION_WEIGHTS = {
+    'abstract': 0.5,
+    'introduction': 0.5,
+    'background': 0.5,
+    'related work': 0.3,
+    'data': 0.8,
+    'methods': 1.0,
+    'experiments': 1.0,
+    'results': 1.0,
+    'discussion': 0.7,
+    'conclusion': 0.6,
+    'appendix': 0.4,
+    'acknowledgements': 0.0,
+    'references': None
+}
+DEFAULT_SECTION_WEIGHT = 0.5  # Text before the first recognized heading
+
+# Full-text keyword weights per tier (matches abstract weights of calculate_relevance)
+FULLTEXT_TIER_WEIGHTS = {
+    'core_keywords': 1.0,
+    'high_priority_keywords': 0.5,
+    'medium_priority_keywords': 0.3
+}
+
+_SECTION_HEADINGS = [
+    (re.compile(r'abstract|summary'), 'abstract'),
+    (re.compile(r'introduction'), 'introduction'),
+    (re.compile(r'background|motivation'), 'background'),
+    (re.compile(r'related work|previous work|literature review'), 'related work'),
+    (re.compile(r'data(sets?)?\b|observations|study area'), 'data'),
+    (re.compile(r'methods?\b|methodology|approach|model description|materials and methods'), 'methods'),
+    (re.compile(r'experiments?|experimental setup|evaluation'), 'experiments'),
+    (re.compile(r'results'), 'results'),
+    (re.compile(r'discussion'), 'discussion'),
+    (re.compile(r'conclusions?|summary and conclusions?'), 'conclusion'),
+    (re.compile(r'appendix|supplementary'), 'appendix'),
+    (re.compile(r'acknowledge?ments?|funding'), 'acknowledgements'),
+    (re.compile(r'references|bibliography|literature cited'), 'references')
+]
+_HEADING_NUMBER = re.compile(r'^(?:\d+(?:\.\d+)*\.?|[IVX]+\.)\s*')
+
+
+def detect_section(line: str) -> Optional[str]:
+    """Return canonical section name if line looks like a section heading"""
+    heading = _HEADING_NUMBER.sub('', line.strip())
+    # Headings are short and capitalized; wrapped paragraph tails usually are not
+    if not heading or len(heading) > 60 or not heading[0].isupper():
+        return None
+    text = heading.lower().rstrip(':. ')
+    for pattern, section in _SECTION_HEADINGS:
+        if pattern.fullmatch(text) or (pattern.match(text) and len(text.split()) <= 4):
+            return section
+    return None
+
+
+def calculate_fulltext_relevance(
+    paper: Dict,
+    pages: Iterable[str],
+    keyword_sets: Dict[str, List[str]],
+    base_score: Optional[float] = None,
+    max_boost: float = 3.0
+) -> float:
+    """
+    Second-stage relevance score from a paper's full text
 
-    # Sort by relevance
-    scored_papers.sort(key=lambda x: x['relevance_score'], reverse=True)
-    return scored_papers
+    Pages are consumed one at a time, so memory stays flat regardless of
+    paper length. Keywords not already credited from title/abstract add a
+    bonus weighted by the best section they appear in (methods/results count
+    most, references are ignored).
+
+    Args:
+        paper: Paper dictionary with 'title', 'abstract', 'citations' fields
+        pages: Iterable of page texts (e.g. TextCache.iter_pages)
+        keyword_sets: Keyword arguments for calculate_relevance
+        base_score: Abstract-level score (computed if not given)
+        max_boost: Maximum full-text bonus added to the base score
+
+    Returns:
+        Relevance score from 1.0 to 10.0
+    """
+    if base_score is None:
+        base_score = calculate_relevance(paper, **keyword_sets)
+
+    credited = f"{paper.get('title') or ''} {paper.get('abstract') or ''}".lower()
+    remaining = {}
+    for tier, weight in FULLTEXT_TIER_WEIGHTS.items():
+        for keyword in keyword_sets.get(tier) or []:
+            keyword = keyword.lower()
+            if keyword not in credited:
+                remaining[keyword] = max(weight, remaining.get(keyword, 0.0))
+
+    best_section_weight = {}
+
+    def scan(lines, section_weight):
+        if not lines or not section_weight:
+            return
+        text = ' '.join(' '.join(lines).lower().split())
+        for keyword in remaining:
+            if best_section_weight.get(keyword, 0.0) < section_weight and keyword in text:
+                best_section_weight[keyword] = section_weight
+
+    section_weight = DEFAULT_SECTION_WEIGHT
+    for page in pages:
+        buffer = []
+        for line in page.splitlines():
+            section = detect_section(line)
+            if section is None:
+                buffer.append(line)
+                continue
+            scan(buffer, section_weight)
+            buffer = []
+            section_weight = SECTION_WEIGHTS[section]
+            if section_weight is None:
+                break
+        scan(buffer, section_weight)
+        if section_weight is None:
+            break  # Rest of the paper is references
+
+    boost = sum(remaining[kw] * w for kw, w in best_section_weight.items())
+    return min(10.0, max(1.0, base_score + min(max_boost, boost)))
+
+
+def rescore_with_fulltext(
+    papers: List[Dict],
+    keyword_sets: Dict[str, List[str]],
+    text_cache: TextCache,
+    min_score: float = 5.0,
+    margin: float = 1.5,
+    max_boost: float = 3.0,
+    retry_failed: bool = False
+) -> List[Dict]:
+    """
+    Rescore papers just below the threshold using their downloaded full text
+
+    Only papers with a local PDF and 'relevance_score' in
+    [min_score - margin, min_score) are examined, so the expensive pass stays
+    bounded. Their text is read from the shared extraction cache.
+
+    Args:
+        papers: Scored paper dictionaries
+        keyword_sets: Keyword arguments for calculate_relevance
+        text_cache: Extracted text cache
+        min_score: Relevance threshold
+        margin: Score distance below threshold eligible for rescoring
+        max_boost: Maximum full-text bonus
+        retry_failed: Extract PDFs whose extraction failed in an earlier run again
+
+    Returns:
+        Papers promoted to at least min_score (scores updated in place)
+    """
+    borderline = [
+        p for p in papers
+        if p.get('local_path') and min_score - margin <= p.get('relevance_score', 0) < min_score
+    ]
+    if not borderline:
+        return []
+
+    hashes = update_text_cache(
+        [p['local_path'] for p in borderline], text_cache, retry_failed=retry_failed
+    )
+
+    promoted = []
+    for paper in borderline:
+        sha256 = hashes.get(str(paper['local_path']))
+        if sha256 is None:
+            continue
+        score = calculate_fulltext_relevance(
+            paper, text_cache.iter_pages(sha256), keyword_sets, max_boost=max_boost
+        )
+        paper['abstract_score'] = paper['relevance_score']
+        paper['relevance_score'] = round(score, 1)
+        if paper['relevance_score'] >= min_score:
+            promoted.append(paper)
+
+    promoted.sort(key=lambda x: x['relevance_score'], reverse=True)
+    return promoted
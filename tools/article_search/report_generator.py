@@ -6,45 +6,36 @@
 
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Dict, Iterator, List, Optional
 
+from . import instrumentation
+from .catalog_stats import CatalogStats
 
-def generate_search_report(
+
+def iter_search_report(
     papers: List[Dict],
     query: str,
-    output_file: Path,
     top_n: int = 20,
-    include_abstracts: bool = True
-) -> str:
+    include_abstracts: bool = True,
+    stats: Optional[CatalogStats] = None
+) -> Iterator[str]:
     """
-    Generate comprehensive markdown report
+    Render the markdown search report as a stream of text chunks
 
     Args:
         papers: List of paper dictionaries (should be pre-sorted by relevance)
         query: Search query description
-        output_file: Path to save markdown report
         top_n: Number of top papers to highlight
         include_abstracts: Include paper abstracts in report
+        stats: Precomputed statistics of papers (computed in one pass if None)
 
-    Returns:
-        Report markdown string
+    Yields:
+        Consecutive pieces of the report markdown
     """
-    # Statistics
-    total_papers = len(papers)
-    downloaded = sum(1 for p in papers if p.get('local_path'))
-    avg_relevance = sum(p.get('relevance_score', 0) for p in papers) / total_papers if total_papers > 0 else 0
-    year_range = f"{min(p['year'] for p in papers if p.get('year'))}-{max(p['year'] for p in papers if p.get('year'))}" if papers else "N/A"
-
-    # Count by subtopic
-    subtopics = {}
-    for paper in papers:
-        subtopic = paper.get('subtopic', 'general')
-        if subtopic not in subtopics:
-            subtopics[subtopic] = []
-        subtopics[subtopic].append(paper)
-
-    # Build report
-    report = f"""# Literature Search Report
+    if stats is None:
+        stats = CatalogStats.from_papers(papers)
+
+    yield f"""# Literature Search Report
 
 **Query**: {query}
 
@@ -54,11 +45,11 @@ def generate_search_report(
 
 ## Executive Summary
 
-- **Total Papers Found**: {total_papers}
-- **PDFs Downloaded**: {downloaded}
-- **Links Only**: {total_papers - downloaded}
-- **Year Range**: {year_range}
-- **Average Relevance**: {avg_relevance:.1f}/10
+- **Total Papers Found**: {stats.total}
+- **PDFs Downloaded**: {stats.downloaded}
+- **Links Only**: {stats.total - stats.downloaded}
+- **Year Range**: {stats.year_range}
+- **Average Relevance**: {stats.avg_relevance:.1f}/10
 
 ---
 
@@ -67,71 +58,81 @@ def generate_search_report(
 """
 
     # Subtopic summaries
-    for subtopic, subtopic_papers in sorted(subtopics.items()):
-        report += f"### {subtopic.replace('_', ' ').title()}\n\n"
-        report += f"**Count**: {len(subtopic_papers)} papers\n"
-        report += f"**Avg Relevance**: {sum(p.get('relevance_score', 0) for p in subtopic_papers) / len(subtopic_papers):.1f}/10\n\n"
+    for subtopic in sorted(stats.subtopic_counts):
+        yield f"### {subtopic.replace('_', ' ').title()}\n\n"
+        yield f"**Count**: {stats.subtopic_counts[subtopic]} papers\n"
+        yield f"**Avg Relevance**: {stats.subtopic_avg_relevance(subtopic):.1f}/10\n\n"
 
         # Top 3 in subtopic
-        top_in_subtopic = sorted(subtopic_papers, key=lambda x: -x.get('relevance_score', 0))[:3]
-        for paper in top_in_subtopic:
+        for paper in stats.top_in_subtopic(subtopic)[:3]:
             status = "📄 PDF" if paper.get('local_path') else "🔗 Link"
-            report += f"- **[{status}]** {paper['title']} ({paper.get('year', 'N/A')}) - Relevance: {paper.get('relevance_score', 0)}/10\n"
-        report += "\n"
+            yield f"- **[{status}]** {paper['title']} ({paper.get('year', 'N/A')}) - Relevance: {paper.get('relevance_score', 0)}/10\n"
+        yield "\n"
 
     # Top papers section
-    report += f"\n---\n\n## Top {top_n} Papers by Relevance\n\n"
+    yield f"\n---\n\n## Top {top_n} Papers by Relevance\n\n"
 
     for i, paper in enumerate(papers[:top_n], 1):
-        # Status indicators
-        pdf_status = "📄 PDF Downloaded" if paper.get('local_path') else "🔗 Link Only"
-
-        if paper.get('source') == 'arxiv':
-            source_badge = "🟢 arXiv (Open Access)"
-        elif paper.get('pdf_available'):
-            source_badge = "🟡 Open Access"
-        else:
-            source_badge = "🔴 Restricted Access"
-
-        report += f"### {i}. [{source_badge}] {paper['title']}\n\n"
-        report += f"**Status**: {pdf_status}\n\n"
-
-        # Authors
-        authors = paper.get('authors', [])
-        if len(authors) <= 3:
-            report += f"**Authors**: {', '.join(authors)}\n\n"
-        else:
-            report += f"**Authors**: {', '.join(authors[:3])} *et al.*\n\n"
-
-        # Metadata
-        report += f"**Year**: {paper.get('year', 'N/A')} | "
-        report += f"**Venue**: {paper.get('venue', 'N/A')} | "
-        report += f"**Relevance**: {paper.get('relevance_score', 0)}/10\n\n"
+        yield _render_top_paper(i, paper, include_abstracts)
 
-        if paper.get('citations'):
-            report += f"**Citations**: {paper['citations']}\n\n"
+    # Access guidance
+    yield _REPORT_FOOTER
 
-        # Abstract
-        if include_abstracts and paper.get('abstract'):
-            abstract = paper['abstract'][:300]
-            if len(paper['abstract']) > 300:
-                abstract += "..."
-            report += f"**Abstract**: {abstract}\n\n"
 
-        # Links
-        if paper.get('local_path'):
-            report += f"**Local PDF**: `{paper['local_path']}`\n\n"
+def _render_top_paper(i: int, paper: Dict, include_abstracts: bool) -> str:
+    """Render one entry of the top papers section"""
+    parts = []
 
-        if paper.get('url'):
-            report += f"**URL**: {paper['url']}\n\n"
+    # Status indicators
+    pdf_status = "📄 PDF Downloaded" if paper.get('local_path') else "🔗 Link Only"
 
-        if paper.get('pdf_url') and not paper.get('local_path'):
-            report += f"**PDF URL**: {paper['pdf_url']}\n\n"
+    if paper.get('source') == 'arxiv':
+        source_badge = "🟢 arXiv (Open Access)"
+    elif paper.get('pdf_available'):
+        source_badge = "🟡 Open Access"
+    else:
+        source_badge = "🔴 Restricted Access"
 
-        report += "---\n\n"
+    parts.append(f"### {i}. [{source_badge}] {paper['title']}\n\n")
+    parts.append(f"**Status**: {pdf_status}\n\n")
 
-    # Access guidance
-    report += """
+    # Authors
+    authors = paper.get('authors', [])
+    if len(authors) <= 3:
+        parts.append(f"**Authors**: {', '.join(authors)}\n\n")
+    else:
+        parts.append(f"**Authors**: {', '.join(authors[:3])} *et al.*\n\n")
+
+    # Metadata
+    parts.append(f"**Year**: {paper.get('year', 'N/A')} | ")
+    parts.append(f"**Venue**: {paper.get('venue', 'N/A')} | ")
+    parts.append(f"**Relevance**: {paper.get('relevance_score', 0)}/10\n\n")
+
+    if paper.get('citations'):
+        parts.append(f"**Citations**: {paper['citations']}\n\n")
+
+    # Abstract
+    if include_abstracts and paper.get('abstract'):
+        abstract = paper['abstract'][:300]
+        if len(paper['abstract']) > 300:
+            abstract += "..."
+        parts.append(f"**Abstract**: {abstract}\n\n")
+
+    # Links
+    if paper.get('local_path'):
+        parts.append(f"**Local PDF**: `{paper['local_path']}`\n\n")
+
+    if paper.get('url'):
+        parts.append(f"**URL**: {paper['url']}\n\n")
+
+    if paper.get('pdf_url') and not paper.get('local_path'):
+        parts.append(f"**PDF URL**: {paper['pdf_url']}\n\n")
+
+    parts.append("---\n\n")
+    return ''.join(parts)
+
+
+_REPORT_FOOTER = """
 ## How to Access Papers
 
 ### Open Access Papers (arXiv, Open Access Journals)
@@ -164,11 +165,43 @@ def generate_search_report(
 *Report generated by article-searcher agent*
 """
 
-    # Save report
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(report)
 
-    return report
+def generate_search_report(
+    papers: List[Dict],
+    query: str,
+    output_file: Path,
+    top_n: int = 20,
+    include_abstracts: bool = True,
+    return_report: bool = True,
+    stats: Optional[CatalogStats] = None
+) -> Optional[str]:
+    """
+    Generate comprehensive markdown report
+
+    Chunks are written straight to the file as they are rendered, so memory
+    stays flat for large paper lists unless the full string is requested.
+
+    Args:
+        papers: List of paper dictionaries (should be pre-sorted by relevance)
+        query: Search query description
+        output_file: Path to save markdown report
+        top_n: Number of top papers to highlight
+        include_abstracts: Include paper abstracts in report
+        return_report: Also collect and return the report string
+        stats: Precomputed statistics of papers (computed in one pass if None)
+
+    Returns:
+        Report markdown string, or None if return_report is False
+    """
+    collected = [] if return_report else None
+
+    with instrumentation.span('report.write'), open(output_file, 'w', encoding='utf-8') as f:
+        for chunk in iter_search_report(papers, query, top_n, include_abstracts, stats):
+            f.write(chunk)
+            if collected is not None:
+                collected.append(chunk)
+
+    return ''.join(collected) if collected is not None else None
 
 
 def generate_summary_report(catalog: Dict, output_file: Path) -> str:
@@ -206,6 +239,14 @@ def generate_summary_report(catalog: Dict, output_file: Path) -> str:
             summary += f"   - Citations: {paper['citations']}\n"
         summary += f"   - {paper.get('url', 'N/A')}\n\n"
 
+    # Clustered subtopics with their top terms
+    subtopic_terms = metadata.get('subtopic_terms')
+    if subtopic_terms:
+        summary += "## Subtopics\n\n"
+        counts = catalog.get('subtopic_counts', {})
+        for label in sorted(subtopic_terms, key=lambda l: -counts.get(l, 0)):
+            summary += f"- **{label}** ({counts.get(label, 0)} papers): {', '.join(subtopic_terms[label][:5])}\n"
+
     summary += """
 ## Status
 
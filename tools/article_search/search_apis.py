@@ -1,27 +1,57 @@
 #!/usr/bin/env python3
 """
 Academic paper search APIs
-Provides unified interface for Semantic Scholar and arXiv
+Provides unified interface for Semantic Scholar, arXiv, OpenAlex and Crossref
 """
 
-import requests
-import time
-import feedparser
+import re
 from urllib.parse import quote_plus
-from typing import List, Dict, Optional
+from typing import TYPE_CHECKING, List, Dict, Optional, Tuple
+
+from . import instrumentation
+from .arxiv_atom import iter_arxiv_entries
+from .http_session import CONTACT_EMAIL, get_session
+
+if TYPE_CHECKING:
+    import requests
 
 # Rate limits
 S2_DELAY = 1.0  # Semantic Scholar: 1 request/sec
 ARXIV_DELAY = 3.0  # arXiv: 3 seconds between requests
+OPENALEX_DELAY = 0.1  # OpenAlex: 10 requests/sec
+CROSSREF_DELAY = 1.0  # Crossref public pool: 1 search request/sec
+
+# Bulk lookup limits
+S2_BATCH_SIZE = 500  # Semantic Scholar /paper/batch accepts up to 500 ids
+ARXIV_BATCH_SIZE = 200  # Ids per arXiv id_list request (keeps the URL short)
+OPENALEX_BATCH_SIZE = 50  # OpenAlex filters accept up to 50 OR-ed values
+CROSSREF_BATCH_SIZE = 20  # DOIs per Crossref filter request
+
+# API endpoints (module-level so tests and benchmarks can point them at a local server)
+S2_API_URL = "https://api.semanticscholar.org/graph/v1"
+ARXIV_API_URL = "http://export.arxiv.org/api/query"
+OPENALEX_API_URL = "https://api.openalex.org"
+CROSSREF_API_URL = "https://api.crossref.org"
 
-USER_AGENT = "Scientific-Research-Bot/1.0 (academic-research; contact@research.edu)"
+OPENALEX_FIELDS = [
+    "id", "doi", "display_name", "publication_year", "authorships", "abstract_inverted_index",
+    "cited_by_count", "primary_location", "best_oa_location"
+]
+CROSSREF_FIELDS = [
+    "DOI", "title", "author", "issued", "abstract", "is-referenced-by-count",
+    "container-title", "link", "URL"
+]
+
+_ARXIV_VERSION = re.compile(r'v\d+$')
+_JATS_TAG = re.compile(r'<[^>]+>')
 
 
 def search_semantic_scholar(
     query: str,
     year_from: int = 2021,
     limit: int = 20,
-    fields: Optional[List[str]] = None
+    fields: Optional[List[str]] = None,
+    offset: int = 0
 ) -> List[Dict]:
     """
     Search Semantic Scholar API
@@ -31,6 +61,7 @@ def search_semantic_scholar(
         year_from: Minimum publication year
         limit: Maximum results (max 100)
         fields: Custom fields to retrieve
+        offset: Index of the first result (for paging)
 
     Returns:
         List of paper dictionaries
@@ -41,26 +72,31 @@ def search_semantic_scholar(
             "citationCount", "publicationVenue", "openAccessPdf", "url"
         ]
 
-    url = "https://api.semanticscholar.org/graph/v1/paper/search"
+    url = f"{S2_API_URL}/paper/search"
     params = {
         "query": query,
         "year": f"{year_from}-",
         "fields": ",".join(fields),
         "limit": min(limit, 100)
     }
-    headers = {"User-Agent": USER_AGENT}
+    if offset:
+        params["offset"] = offset
 
     try:
-        response = requests.get(url, params=params, headers=headers, timeout=30)
-        time.sleep(S2_DELAY)
+        with instrumentation.span('api.semantic_scholar.search'):
+            response = get_session().get(url, params=params, timeout=30)
+        instrumentation.sleep(S2_DELAY, 'semantic_scholar')
 
         if response.status_code == 200:
-            data = response.json()
-            return data.get('data', [])
+            data = response.json().get('data', [])
+            instrumentation.count('api.semantic_scholar.results', len(data))
+            return data
         else:
+            instrumentation.count('api.semantic_scholar.errors')
             print(f"Semantic Scholar API error: HTTP {response.status_code}")
             return []
     except Exception as e:
+        instrumentation.count('api.semantic_scholar.errors')
         print(f"Semantic Scholar search error: {e}")
         return []
 
@@ -69,7 +105,8 @@ def search_arxiv(
     query: str,
     max_results: int = 50,
     sort_by: str = "relevance",
-    year_from: Optional[int] = None
+    year_from: Optional[int] = None,
+    start: int = 0
 ) -> List[Dict]:
     """
     Search arXiv API
@@ -79,44 +116,245 @@ def search_arxiv(
         max_results: Maximum results
         sort_by: Sort order ('relevance', 'lastUpdatedDate', 'submittedDate')
         year_from: Filter papers from this year onwards
+        start: Index of the first result (for paging)
 
     Returns:
         List of paper dictionaries with arXiv metadata
     """
     encoded_query = quote_plus(query)
-    url = f"http://export.arxiv.org/api/query?search_query=all:{encoded_query}&max_results={max_results}&sortBy={sort_by}"
+    url = f"{ARXIV_API_URL}?search_query=all:{encoded_query}&max_results={max_results}&sortBy={sort_by}"
+    if start:
+        url += f"&start={start}"
 
     try:
-        feed = feedparser.parse(url)
-        time.sleep(ARXIV_DELAY)
-
         papers = []
-        for entry in feed.entries:
-            arxiv_id = entry.id.split('/abs/')[-1]
-            year = int(entry.published[:4])
-
-            # Filter by year if specified
-            if year_from and year < year_from:
-                continue
-
-            papers.append({
-                'arxiv_id': arxiv_id,
-                'title': entry.title.replace('\n', ' ').strip(),
-                'authors': [author.name for author in entry.authors],
-                'year': year,
-                'abstract': entry.summary.replace('\n', ' ').strip(),
-                'published': entry.published,
-                'url': entry.link,
-                'pdf_url': entry.link.replace('/abs/', '/pdf/') + '.pdf',
-                'categories': [tag['term'] for tag in entry.tags] if hasattr(entry, 'tags') else []
-            })
+        entries = 0
+        with instrumentation.span('api.arxiv.search'), _open_arxiv(url) as response:
+            if response.status_code == 200:
+                for paper in iter_arxiv_entries(response.raw):
+                    entries += 1
+
+                    # Filter by year if specified
+                    if year_from and paper['year'] < year_from:
+                        continue
+
+                    papers.append(paper)
+            else:
+                instrumentation.count('api.arxiv.errors')
+                print(f"arXiv API error: HTTP {response.status_code}")
+        instrumentation.sleep(ARXIV_DELAY, 'arxiv')
+        instrumentation.count('api.arxiv.results', entries)
 
         return papers
     except Exception as e:
+        instrumentation.count('api.arxiv.errors')
         print(f"arXiv search error: {e}")
         return []
 
 
+def _open_arxiv(url: str, headers: Optional[Dict[str, str]] = None) -> 'requests.Response':
+    """Streamed arXiv API response from the shared session (body decoded on read)"""
+    response = get_session().get(url, headers=headers, stream=True, timeout=60)
+    response.raw.decode_content = True
+    return response
+
+
+def arxiv_base_id(arxiv_id: str) -> str:
+    """arXiv id without version suffix (e.g. "2212.12794v2" -> "2212.12794")"""
+    return _ARXIV_VERSION.sub('', arxiv_id)
+
+
+def fetch_arxiv_batch(
+    arxiv_ids: List[str],
+    etag: Optional[str] = None,
+    modified: Optional[str] = None
+) -> Tuple[Optional[Dict[str, Dict]], Dict[str, Optional[str]]]:
+    """
+    Fetch the latest metadata of several arXiv papers in one request
+
+    Sends If-None-Match / If-Modified-Since when validators from an earlier
+    call are given.
+
+    Args:
+        arxiv_ids: arXiv identifiers (at most ARXIV_BATCH_SIZE; versions are ignored)
+        etag: ETag returned by the previous call for the same ids
+        modified: Last-Modified value returned by the previous call
+
+    Returns:
+        ({base id: paper dictionary} or None if not modified, {'etag', 'modified'} validators)
+    """
+    base_ids = [arxiv_base_id(i) for i in arxiv_ids]
+    url = f"{ARXIV_API_URL}?id_list={','.join(base_ids)}&max_results={len(base_ids)}"
+
+    headers = {}
+    if etag:
+        headers['If-None-Match'] = etag
+    if modified:
+        headers['If-Modified-Since'] = modified
+
+    try:
+        papers = {}
+        with instrumentation.span('api.arxiv.batch'), _open_arxiv(url, headers) as response:
+            validators = {'etag': response.headers.get('ETag'), 'modified': response.headers.get('Last-Modified')}
+            if response.status_code == 304:
+                papers = None
+                validators = {'etag': etag, 'modified': modified}
+            elif response.status_code == 200:
+                for paper in iter_arxiv_entries(response.raw):
+                    papers[arxiv_base_id(paper['arxiv_id'])] = paper
+            else:
+                instrumentation.count('api.arxiv.errors')
+                print(f"arXiv API error: HTTP {response.status_code}")
+        instrumentation.sleep(ARXIV_DELAY, 'arxiv')
+
+        if papers is None:
+            instrumentation.count('api.arxiv.not_modified')
+        return papers, validators
+    except Exception as e:
+        instrumentation.count('api.arxiv.errors')
+        print(f"arXiv batch fetch error: {e}")
+        return {}, {'etag': None, 'modified': None}
+
+
+def fetch_semantic_scholar_batch(
+    paper_ids: List[str],
+    fields: Optional[List[str]] = None
+) -> Dict[str, Dict]:
+    """
+    Fetch Semantic Scholar metadata for many papers with bulk POST requests
+
+    Args:
+        paper_ids: Semantic Scholar paper ids or prefixed ids (e.g. "ARXIV:2212.12794")
+        fields: Custom fields to retrieve
+
+    Returns:
+        Dictionary mapping each requested id to its paper (unknown ids omitted)
+    """
+    if fields is None:
+        fields = [
+            "paperId", "title", "authors", "year", "abstract",
+            "citationCount", "publicationVenue", "openAccessPdf", "url"
+        ]
+
+    url = f"{S2_API_URL}/paper/batch"
+
+    results = {}
+    for start in range(0, len(paper_ids), S2_BATCH_SIZE):
+        chunk = paper_ids[start:start + S2_BATCH_SIZE]
+        try:
+            with instrumentation.span('api.semantic_scholar.batch'):
+                response = get_session().post(
+                    url, params={"fields": ",".join(fields)}, json={"ids": chunk}, timeout=60
+                )
+            instrumentation.sleep(S2_DELAY, 'semantic_scholar')
+
+            if response.status_code == 200:
+                for paper_id, paper in zip(chunk, response.json()):
+                    if paper:
+                        results[paper_id] = paper
+            else:
+                instrumentation.count('api.semantic_scholar.errors')
+                print(f"Semantic Scholar batch API error: HTTP {response.status_code}")
+        except Exception as e:
+            instrumentation.count('api.semantic_scholar.errors')
+            print(f"Semantic Scholar batch error: {e}")
+
+    return results
+
+
+def fetch_semantic_scholar_edges(
+    paper_id: str,
+    direction: str = "references",
+    max_edges: int = 1000
+) -> Optional[List[str]]:
+    """
+    Ids of the papers a paper cites ('references') or is cited by ('citations')
+
+    Pages through the Semantic Scholar edge endpoint, requesting only paper
+    ids (metadata is fetched separately with fetch_semantic_scholar_batch).
+
+    Args:
+        paper_id: Semantic Scholar paper id or prefixed id (e.g. "ARXIV:2212.12794")
+        direction: 'references' or 'citations'
+        max_edges: Stop after this many neighbors (highly cited papers have tens of thousands)
+
+    Returns:
+        Neighbor paper ids (papers without an S2 id are omitted), or None on API errors
+    """
+    key = 'citedPaper' if direction == 'references' else 'citingPaper'
+    url = f"{S2_API_URL}/paper/{paper_id}/{direction}"
+
+    neighbors = []
+    offset = 0
+    try:
+        while offset < max_edges:
+            params = {"fields": "paperId", "offset": offset, "limit": min(1000, max_edges - offset)}
+            with instrumentation.span(f'api.semantic_scholar.{direction}'):
+                response = get_session().get(url, params=params, timeout=60)
+            instrumentation.sleep(S2_DELAY, 'semantic_scholar')
+
+            if response.status_code == 404:
+                break
+            if response.status_code != 200:
+                instrumentation.count('api.semantic_scholar.errors')
+                print(f"Semantic Scholar {direction} API error: HTTP {response.status_code}")
+                return None
+
+            data = response.json()
+            for item in data.get('data') or []:
+                neighbor = (item.get(key) or {}).get('paperId')
+                if neighbor:
+                    neighbors.append(neighbor)
+            if data.get('next') is None:
+                break
+            offset = data['next']
+    except Exception as e:
+        instrumentation.count('api.semantic_scholar.errors')
+        print(f"Semantic Scholar {direction} error: {e}")
+        return None
+
+    instrumentation.count(f'api.semantic_scholar.{direction}', len(neighbors))
+    return neighbors
+
+
+def match_semantic_scholar_title(title: str, fields: Optional[List[str]] = None) -> Optional[Dict]:
+    """
+    Closest Semantic Scholar paper for a title
+
+    Args:
+        title: Paper title
+        fields: Custom fields to retrieve
+
+    Returns:
+        Paper dictionary, or None if nothing matches
+    """
+    if fields is None:
+        fields = [
+            "paperId", "title", "authors", "year", "abstract",
+            "citationCount", "publicationVenue", "openAccessPdf", "url"
+        ]
+
+    try:
+        with instrumentation.span('api.semantic_scholar.match'):
+            response = get_session().get(
+                f"{S2_API_URL}/paper/search/match",
+                params={"query": title, "fields": ",".join(fields)}, timeout=30
+            )
+        instrumentation.sleep(S2_DELAY, 'semantic_scholar')
+
+        if response.status_code == 200:
+            data = response.json().get('data') or []
+            return data[0] if data else None
+        if response.status_code != 404:
+            instrumentation.count('api.semantic_scholar.errors')
+            print(f"Semantic Scholar match API error: HTTP {response.status_code}")
+        return None
+    except Exception as e:
+        instrumentation.count('api.semantic_scholar.errors')
+        print(f"Semantic Scholar match error: {e}")
+        return None
+
+
 def fetch_arxiv_by_id(arxiv_id: str) -> Optional[Dict]:
     """
     Fetch specific arXiv paper by ID
@@ -127,37 +365,223 @@ def fetch_arxiv_by_id(arxiv_id: str) -> Optional[Dict]:
     Returns:
         Paper dictionary or None if not found
     """
-    url = f"http://export.arxiv.org/api/query?id_list={arxiv_id}"
+    url = f"{ARXIV_API_URL}?id_list={arxiv_id}"
 
     try:
-        feed = feedparser.parse(url)
-        time.sleep(ARXIV_DELAY)
-
-        if feed.entries:
-            entry = feed.entries[0]
-            return {
-                'arxiv_id': arxiv_id,
-                'title': entry.title.replace('\n', ' ').strip(),
-                'authors': [author.name for author in entry.authors],
-                'year': int(entry.published[:4]),
-                'abstract': entry.summary.replace('\n', ' ').strip(),
-                'published': entry.published,
-                'url': entry.link,
-                'pdf_url': entry.link.replace('/abs/', '/pdf/') + '.pdf',
-                'categories': [tag['term'] for tag in entry.tags] if hasattr(entry, 'tags') else []
-            }
-        return None
+        paper = None
+        with instrumentation.span('api.arxiv.fetch'), _open_arxiv(url) as response:
+            if response.status_code == 200:
+                paper = next(iter_arxiv_entries(response.raw), None)
+            else:
+                instrumentation.count('api.arxiv.errors')
+                print(f"arXiv API error: HTTP {response.status_code}")
+        instrumentation.sleep(ARXIV_DELAY, 'arxiv')
+
+        if paper is not None:
+            paper['arxiv_id'] = arxiv_id
+        return paper
     except Exception as e:
+        instrumentation.count('api.arxiv.errors')
         print(f"arXiv fetch error: {e}")
         return None
 
 
+def search_openalex(
+    query: str,
+    year_from: int = 2021,
+    limit: int = 20,
+    page: int = 1
+) -> List[Dict]:
+    """
+    Search OpenAlex works
+
+    Args:
+        query: Search query string
+        year_from: Minimum publication year
+        limit: Results per page (max 200)
+        page: 1-based page number
+
+    Returns:
+        List of OpenAlex work dictionaries
+    """
+    params = {
+        "search": query,
+        "filter": f"from_publication_date:{year_from}-01-01",
+        "select": ",".join(OPENALEX_FIELDS),
+        "per-page": min(limit, 200),
+        "page": page,
+        "mailto": CONTACT_EMAIL
+    }
+
+    try:
+        with instrumentation.span('api.openalex.search'):
+            response = get_session().get(f"{OPENALEX_API_URL}/works", params=params, timeout=30)
+        instrumentation.sleep(OPENALEX_DELAY, 'openalex')
+
+        if response.status_code == 200:
+            data = response.json().get('results', [])
+            instrumentation.count('api.openalex.results', len(data))
+            return data
+        else:
+            instrumentation.count('api.openalex.errors')
+            print(f"OpenAlex API error: HTTP {response.status_code}")
+            return []
+    except Exception as e:
+        instrumentation.count('api.openalex.errors')
+        print(f"OpenAlex search error: {e}")
+        return []
+
+
+def fetch_openalex_batch(work_ids: List[str]) -> Dict[str, Dict]:
+    """
+    Fetch OpenAlex works by id, OPENALEX_BATCH_SIZE ids per request
+
+    Args:
+        work_ids: OpenAlex work ids ("W2741809807" or full https://openalex.org/ URLs)
+
+    Returns:
+        Dictionary mapping each requested id to its work (unknown ids omitted)
+    """
+    results = {}
+    for start in range(0, len(work_ids), OPENALEX_BATCH_SIZE):
+        chunk = work_ids[start:start + OPENALEX_BATCH_SIZE]
+        requested = {work_id.rsplit('/', 1)[-1]: work_id for work_id in chunk}
+        params = {
+            "filter": f"openalex:{'|'.join(requested)}",
+            "select": ",".join(OPENALEX_FIELDS),
+            "per-page": len(chunk),
+            "mailto": CONTACT_EMAIL
+        }
+        try:
+            with instrumentation.span('api.openalex.batch'):
+                response = get_session().get(f"{OPENALEX_API_URL}/works", params=params, timeout=60)
+            instrumentation.sleep(OPENALEX_DELAY, 'openalex')
+
+            if response.status_code == 200:
+                for work in response.json().get('results', []):
+                    work_id = requested.get(openalex_work_id(work))
+                    if work_id is not None:
+                        results[work_id] = work
+            else:
+                instrumentation.count('api.openalex.errors')
+                print(f"OpenAlex batch API error: HTTP {response.status_code}")
+        except Exception as e:
+            instrumentation.count('api.openalex.errors')
+            print(f"OpenAlex batch error: {e}")
+
+    return results
+
+
+def search_crossref(
+    query: str,
+    year_from: int = 2021,
+    limit: int = 20,
+    offset: int = 0
+) -> List[Dict]:
+    """
+    Search Crossref works
+
+    Args:
+        query: Search query string
+        year_from: Minimum publication year
+        limit: Maximum results (max 1000)
+        offset: Index of the first result (for paging)
+
+    Returns:
+        List of Crossref work dictionaries
+    """
+    params = {
+        "query": query,
+        "filter": f"from-pub-date:{year_from}",
+        "select": ",".join(CROSSREF_FIELDS),
+        "rows": min(limit, 1000)
+    }
+    if offset:
+        params["offset"] = offset
+
+    try:
+        with instrumentation.span('api.crossref.search'):
+            response = get_session().get(f"{CROSSREF_API_URL}/works", params=params, timeout=30)
+        instrumentation.sleep(CROSSREF_DELAY, 'crossref')
+
+        if response.status_code == 200:
+            data = response.json().get('message', {}).get('items', [])
+            instrumentation.count('api.crossref.results', len(data))
+            return data
+        else:
+            instrumentation.count('api.crossref.errors')
+            print(f"Crossref API error: HTTP {response.status_code}")
+            return []
+    except Exception as e:
+        instrumentation.count('api.crossref.errors')
+        print(f"Crossref search error: {e}")
+        return []
+
+
+def fetch_crossref_batch(dois: List[str]) -> Dict[str, Dict]:
+    """
+    Fetch Crossref works by DOI, CROSSREF_BATCH_SIZE DOIs per request
+
+    Args:
+        dois: DOIs (e.g. "10.1175/JCLI-D-21-0001.1")
+
+    Returns:
+        Dictionary mapping each requested DOI to its work (unknown DOIs omitted)
+    """
+    results = {}
+    for start in range(0, len(dois), CROSSREF_BATCH_SIZE):
+        chunk = dois[start:start + CROSSREF_BATCH_SIZE]
+        requested = {doi.lower(): doi for doi in chunk}
+        params = {
+            "filter": ",".join(f"doi:{doi}" for doi in chunk),
+            "select": ",".join(CROSSREF_FIELDS),
+            "rows": len(chunk)
+        }
+        try:
+            with instrumentation.span('api.crossref.batch'):
+                response = get_session().get(f"{CROSSREF_API_URL}/works", params=params, timeout=60)
+            instrumentation.sleep(CROSSREF_DELAY, 'crossref')
+
+            if response.status_code == 200:
+                for work in response.json().get('message', {}).get('items', []):
+                    doi = requested.get(work.get('DOI', '').lower())
+                    if doi is not None:
+                        results[doi] = work
+            else:
+                instrumentation.count('api.crossref.errors')
+                print(f"Crossref batch API error: HTTP {response.status_code}")
+        except Exception as e:
+            instrumentation.count('api.crossref.errors')
+            print(f"Crossref batch error: {e}")
+
+    return results
+
+
+def paper_id_s2(paper: Dict) -> str:
+    """Catalog id of a raw Semantic Scholar result (same as normalize_paper_s2)"""
+    return f"s2:{paper.get('paperId', 'unknown')}"
+
+
+def paper_id_arxiv(paper: Dict) -> str:
+    """Catalog id of a raw arXiv result (same as normalize_paper_arxiv)"""
+    return f"arxiv:{paper['arxiv_id']}"
+
+
+def relevance_view_s2(paper: Dict) -> Dict:
+    """Fields of a raw Semantic Scholar result needed for relevance scoring"""
+    return {
+        'title': paper.get('title', 'Untitled'),
+        'abstract': paper.get('abstract', ''),
+        'citations': paper.get('citationCount', 0)
+    }
+
+
 def normalize_paper_s2(paper: Dict, subtopic: str = "general") -> Dict:
     """Normalize Semantic Scholar paper to standard format"""
     authors_list = [a.get('name', 'Unknown') for a in paper.get('authors', [])]
 
     return {
-        'id': f"s2:{paper.get('paperId', 'unknown')}",
+        'id': paper_id_s2(paper),
         'source': 'semantic_scholar',
         'title': paper.get('title', 'Untitled'),
         'authors': authors_list,
@@ -175,7 +599,7 @@ def normalize_paper_s2(paper: Dict, subtopic: str = "general") -> Dict:
 def normalize_paper_arxiv(paper: Dict, subtopic: str = "general") -> Dict:
     """Normalize arXiv paper to standard format"""
     return {
-        'id': f"arxiv:{paper['arxiv_id']}",
+        'id': paper_id_arxiv(paper),
         'source': 'arxiv',
         'title': paper['title'],
         'authors': paper['authors'],
@@ -189,3 +613,98 @@ def normalize_paper_arxiv(paper: Dict, subtopic: str = "general") -> Dict:
         'subtopic': subtopic,
         'categories': paper.get('categories', [])
     }
+
+
+def openalex_work_id(work: Dict) -> str:
+    """Short OpenAlex work id (e.g. "W2741809807")"""
+    return (work.get('id') or 'unknown').rsplit('/', 1)[-1]
+
+
+def openalex_abstract(work: Dict) -> str:
+    """Rebuild an OpenAlex abstract from its inverted index"""
+    index = work.get('abstract_inverted_index') or {}
+    positions = [(position, word) for word, places in index.items() for position in places]
+    return ' '.join(word for _, word in sorted(positions))
+
+
+def paper_id_openalex(work: Dict) -> str:
+    """Catalog id of a raw OpenAlex work (same as normalize_paper_openalex)"""
+    return f"openalex:{openalex_work_id(work)}"
+
+
+def relevance_view_openalex(work: Dict) -> Dict:
+    """Fields of a raw OpenAlex work needed for relevance scoring"""
+    return {
+        'title': work.get('display_name') or 'Untitled',
+        'abstract': openalex_abstract(work),
+        'citations': work.get('cited_by_count') or 0
+    }
+
+
+def normalize_paper_openalex(work: Dict, subtopic: str = "general") -> Dict:
+    """Normalize OpenAlex work to standard format"""
+    source = (work.get('primary_location') or {}).get('source') or {}
+    pdf_url = (work.get('best_oa_location') or {}).get('pdf_url')
+    doi = work.get('doi')
+
+    return {
+        'id': paper_id_openalex(work),
+        'source': 'openalex',
+        'title': work.get('display_name') or 'Untitled',
+        'authors': [(a.get('author') or {}).get('display_name') or 'Unknown' for a in work.get('authorships') or []],
+        'year': work.get('publication_year'),
+        'abstract': openalex_abstract(work),
+        'citations': work.get('cited_by_count') or 0,
+        'venue': source.get('display_name'),
+        'url': doi or work.get('id', ''),
+        'pdf_url': pdf_url,
+        'pdf_available': bool(pdf_url),
+        'subtopic': subtopic,
+        'doi': doi.replace('https://doi.org/', '') if doi else None
+    }
+
+
+def crossref_abstract(work: Dict) -> str:
+    """Crossref abstract as plain text (JATS markup removed)"""
+    return ' '.join(_JATS_TAG.sub(' ', work.get('abstract') or '').split())
+
+
+def paper_id_crossref(work: Dict) -> str:
+    """Catalog id of a raw Crossref work (same as normalize_paper_crossref)"""
+    return f"crossref:{work.get('DOI', 'unknown').lower()}"
+
+
+def relevance_view_crossref(work: Dict) -> Dict:
+    """Fields of a raw Crossref work needed for relevance scoring"""
+    return {
+        'title': (work.get('title') or ['Untitled'])[0],
+        'abstract': crossref_abstract(work),
+        'citations': work.get('is-referenced-by-count') or 0
+    }
+
+
+def normalize_paper_crossref(work: Dict, subtopic: str = "general") -> Dict:
+    """Normalize Crossref work to standard format"""
+    authors = [' '.join(filter(None, [a.get('given'), a.get('family')])) or a.get('name', 'Unknown')
+               for a in work.get('author') or []]
+    # 'date-parts' can be missing, [] or [[]] for works without an issue date
+    date_parts = (work.get('issued') or {}).get('date-parts') or [[]]
+    year = date_parts[0][0] if date_parts[0] else None
+    pdf_url = next((link.get('URL') for link in work.get('link') or []
+                    if link.get('content-type') == 'application/pdf'), None)
+
+    return {
+        'id': paper_id_crossref(work),
+        'source': 'crossref',
+        'title': (work.get('title') or ['Untitled'])[0],
+        'authors': authors,
+        'year': year,
+        'abstract': crossref_abstract(work),
+        'citations': work.get('is-referenced-by-count') or 0,
+        'venue': (work.get('container-title') or [None])[0],
+        'url': work.get('URL', ''),
+        'pdf_url': pdf_url,
+        'pdf_available': bool(pdf_url),
+        'subtopic': subtopic,
+        'doi': work.get('DOI')
+    }
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Checkpointed search runs
+Persists per-query results, rate-limit state and download progress so
+interrupted runs can be resumed where they stopped
+"""
+
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from . import instrumentation
+
+
+class SearchRun:
+    """
+    Run directory with checkpoint files
+
+    state.json      - queries, search parameters, completed queries, rate-limit timestamps
+    results.jsonl   - one line per completed query with its normalized papers
+    downloads.jsonl - one line per attempted download
+    """
+
+    def __init__(self, run_dir: Path):
+        self.run_dir = Path(run_dir)
+        self.state_file = self.run_dir / "state.json"
+        self.results_file = self.run_dir / "results.jsonl"
+        self.downloads_file = self.run_dir / "downloads.jsonl"
+
+        self.state: Dict = {}
+        self.results: Dict[str, List[Dict]] = {}
+        self.downloads: Dict[str, Dict] = {}
+        self._lock = threading.Lock()  # Sources record calls from worker threads
+
+    @property
+    def run_id(self) -> str:
+        return self.run_dir.name
+
+    @classmethod
+    def create(cls, runs_dir: Path, queries: List[str], params: Dict) -> 'SearchRun':
+        """Start a new run with a timestamped id"""
+        run_id = datetime.now().strftime('%Y%m%d-%H%M%S')
+        run_dir = Path(runs_dir) / run_id
+        suffix = 1
+        while run_dir.exists():
+            suffix += 1
+            run_dir = Path(runs_dir) / f"{run_id}-{suffix}"
+        run_dir.mkdir(parents=True)
+
+        run = cls(run_dir)
+        run.state = {
+            'run_id': run.run_id,
+            'created': datetime.now().isoformat(),
+            'status': 'running',
+            'queries': queries,
+            'params': params,
+            'completed_queries': [],
+            'rate_limits': {}
+        }
+        run.save_state()
+        return run
+
+    @classmethod
+    def resume(cls, runs_dir: Path, run_id: str) -> 'SearchRun':
+        """Load an existing run from its checkpoint files"""
+        run = cls(Path(runs_dir) / run_id)
+        if not run.state_file.exists():
+            raise FileNotFoundError(f"No search run found: {run.run_dir}")
+
+        with open(run.state_file, 'r', encoding='utf-8') as f:
+            run.state = json.load(f)
+
+        # Only queries recorded in state count as complete; a torn last line is ignored
+        completed = set(run.state.get('completed_queries', []))
+        for record in cls._read_jsonl(run.results_file):
+            if record.get('query') in completed:
+                run.results[record['query']] = record.get('papers', [])
+        for record in cls._read_jsonl(run.downloads_file):
+            run.downloads[record['id']] = record
+
+        run.state['status'] = 'running'
+        run.save_state()
+        return run
+
+    @staticmethod
+    def _read_jsonl(path: Path) -> List[Dict]:
+        records = []
+        if not path.exists():
+            return records
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue  # Partial line from an interrupted write
+        return records
+
+    @staticmethod
+    def _append_jsonl(path: Path, record: Dict):
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def save_state(self):
+        """Write state.json atomically"""
+        tmp_file = self.state_file.with_name(self.state_file.name + '.tmp')
+        with self._lock, open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_file, self.state_file)
+
+    # Queries
+
+    def is_query_done(self, query: str) -> bool:
+        return query in self.results
+
+    def query_results(self, query: str) -> List[Dict]:
+        return self.results.get(query, [])
+
+    def record_query(self, query: str, papers: List[Dict]):
+        """Checkpoint the normalized results of a completed query"""
+        self._append_jsonl(self.results_file, {'query': query, 'papers': papers})
+        self.results[query] = papers
+        self.state['completed_queries'].append(query)
+        self.save_state()
+
+    # Rate limits
+
+    def throttle(self, source: str, min_interval: float):
+        """Wait until min_interval has passed since the last recorded call to source"""
+        last_call = self.state['rate_limits'].get(source)
+        if last_call is not None:
+            remaining = min_interval - (time.time() - last_call)
+            if remaining > 0:
+                instrumentation.sleep(remaining, f"throttle.{source}")
+
+    def record_call(self, source: str):
+        with self._lock:
+            self.state['rate_limits'][source] = time.time()
+
+    # Downloads
+
+    def record_download(self, paper: Dict, success: bool):
+        """Checkpoint one download attempt"""
+        record = {
+            'id': paper.get('id'),
+            'status': 'downloaded' if success else 'failed',
+            'local_path': paper.get('local_path')
+        }
+        self._append_jsonl(self.downloads_file, record)
+        self.downloads[record['id']] = record
+
+    def failed_download_ids(self) -> set:
+        return {paper_id for paper_id, r in self.downloads.items() if r['status'] == 'failed'}
+
+    def mark_complete(self, catalog_file: Optional[Path] = None):
+        self.state['status'] = 'complete'
+        self.state['completed'] = datetime.now().isoformat()
+        if catalog_file:
+            self.state['catalog'] = str(catalog_file)
+        self.save_state()
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Search source plugins
+One SearchSource per API behind a common interface, looked up by name in a registry
+"""
+
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+
+from . import search_apis
+
+
+class SearchSource(ABC):
+    """
+    Search backend interface
+
+    Subclasses must implement fetch_page, lookup, paper_id and normalize;
+    an incomplete plugin cannot be instantiated, so it never gets
+    registered. search pages through fetch_page until the requested number
+    of results, and lookup_key maps a catalogued paper back to its lookup id. The
+    delay property is the minimum interval between two requests; the API
+    functions already sleep it after each call, and checkpointed runs use
+    it to throttle across resumes.
+    """
+
+    name = ''
+    label = ''
+    page_size = 100  # Largest page the API returns
+
+    @property
+    def delay(self) -> float:
+        return 0.0
+
+    @abstractmethod
+    def fetch_page(self, query: str, year_from: int, page: int, per_page: int) -> List[Dict]:
+        """Raw results of one 0-based page of per_page results"""
+        raise NotImplementedError
+
+    def search(self, query: str, year_from: int = 2021, limit: int = 20) -> List[Dict]:
+        """Up to limit raw results, fetched a page at a time"""
+        per_page = min(self.page_size, limit)
+        results = []
+        page = 0
+        while len(results) < limit:
+            batch = self.fetch_page(query, year_from, page, per_page)
+            results.extend(batch)
+            if len(batch) < per_page:
+                break
+            page += 1
+        return results[:limit]
+
+    @abstractmethod
+    def lookup(self, ids: List[str]) -> Dict[str, Dict]:
+        """Raw records for source-specific ids (bulk requests where supported)"""
+        raise NotImplementedError
+
+    def lookup_key(self, paper: Dict) -> Optional[str]:
+        """Id to pass to lookup for a catalogued paper (catalog ids are '<name>:<id>')"""
+        prefix = f"{self.name}:"
+        paper_id = paper.get('id') or ''
+        return paper_id[len(prefix):] if paper_id.startswith(prefix) else None
+
+    @abstractmethod
+    def paper_id(self, raw: Dict) -> str:
+        """Catalog id of a raw result"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def normalize(self, raw: Dict, subtopic: str = "general") -> Dict:
+        """Raw result in the standard paper format"""
+        raise NotImplementedError
+
+    def score_view(self, raw: Dict) -> Dict:
+        """Fields of a raw result read by the relevance scorers"""
+        return raw
+
+
+class SemanticScholarSource(SearchSource):
+    name = 'semantic_scholar'
+    label = 'Semantic Scholar'
+    page_size = 100
+
+    @property
+    def delay(self) -> float:
+        return search_apis.S2_DELAY
+
+    def fetch_page(self, query, year_from, page, per_page):
+        return search_apis.search_semantic_scholar(query, year_from=year_from, limit=per_page,
+                                                   offset=page * per_page)
+
+    def lookup(self, ids):
+        return search_apis.fetch_semantic_scholar_batch(ids)
+
+    def lookup_key(self, paper):
+        paper_id = paper.get('id') or ''
+        return paper_id[len('s2:'):] if paper_id.startswith('s2:') else None
+
+    def paper_id(self, raw):
+        return search_apis.paper_id_s2(raw)
+
+    def normalize(self, raw, subtopic="general"):
+        return search_apis.normalize_paper_s2(raw, subtopic)
+
+    def score_view(self, raw):
+        return search_apis.relevance_view_s2(raw)
+
+
+class ArxivSource(SearchSource):
+    name = 'arxiv'
+    label = 'arXiv'
+    page_size = 2000  # Single request for typical limits (the year filter runs client-side)
+
+    @property
+    def delay(self) -> float:
+        return search_apis.ARXIV_DELAY
+
+    def fetch_page(self, query, year_from, page, per_page):
+        return search_apis.search_arxiv(query, max_results=per_page, year_from=year_from,
+                                        start=page * per_page)
+
+    def lookup(self, ids):
+        results = {}
+        for start in range(0, len(ids), search_apis.ARXIV_BATCH_SIZE):
+            chunk = ids[start:start + search_apis.ARXIV_BATCH_SIZE]
+            papers, _ = search_apis.fetch_arxiv_batch(chunk)
+            for arxiv_id in chunk:
+                paper = (papers or {}).get(search_apis.arxiv_base_id(arxiv_id))
+                if paper is not None:
+                    results[arxiv_id] = paper
+        return results
+
+    def paper_id(self, raw):
+        return search_apis.paper_id_arxiv(raw)
+
+    def normalize(self, raw, subtopic="general"):
+        return search_apis.normalize_paper_arxiv(raw, subtopic)
+
+
+class OpenAlexSource(SearchSource):
+    name = 'openalex'
+    label = 'OpenAlex'
+    page_size = 200
+
+    @property
+    def delay(self) -> float:
+        return search_apis.OPENALEX_DELAY
+
+    def fetch_page(self, query, year_from, page, per_page):
+        return search_apis.search_openalex(query, year_from=year_from, limit=per_page, page=page + 1)
+
+    def lookup(self, ids):
+        return search_apis.fetch_openalex_batch(ids)
+
+    def paper_id(self, raw):
+        return search_apis.paper_id_openalex(raw)
+
+    def normalize(self, raw, subtopic="general"):
+        return search_apis.normalize_paper_openalex(raw, subtopic)
+
+    def score_view(self, raw):
+        return search_apis.relevance_view_openalex(raw)
+
+
+class CrossrefSource(SearchSource):
+    name = 'crossref'
+    label = 'Crossref'
+    page_size = 1000
+
+    @property
+    def delay(self) -> float:
+        return search_apis.CROSSREF_DELAY
+
+    def fetch_page(self, query, year_from, page, per_page):
+        return search_apis.search_crossref(query, year_from=year_from, limit=per_page, offset=page * per_page)
+
+    def lookup(self, ids):
+        return search_apis.fetch_crossref_batch(ids)
+
+    def paper_id(self, raw):
+        return search_apis.paper_id_crossref(raw)
+
+    def normalize(self, raw, subtopic="general"):
+        return search_apis.normalize_paper_crossref(raw, subtopic)
+
+    def score_view(self, raw):
+        return search_apis.relevance_view_crossref(raw)
+
+
+# Registered sources by name, in merge order (earlier sources win title duplicates)
+SOURCES: Dict[str, SearchSource] = {}
+
+
+def register_source(source: SearchSource) -> SearchSource:
+    """Add (or replace) a source in the registry"""
+    if not isinstance(source, SearchSource) or not source.name:
+        raise TypeError(f"Search sources must be named SearchSource instances, got {source!r}")
+    SOURCES[source.name] = source
+    return source
+
+
+def get_source(name: str) -> SearchSource:
+    """Registered source by name (KeyError lists the available names)"""
+    try:
+        return SOURCES[name]
+    except KeyError:
+        raise KeyError(f"Unknown search source '{name}' (available: {', '.join(SOURCES)})") from None
+
+
+def select_sources(names: List[str]) -> List[SearchSource]:
+    """Sources for the given names, in registry order"""
+    for name in names:
+        get_source(name)
+    return [source for name, source in SOURCES.items() if name in names]
+
+
+for _source in (SemanticScholarSource(), ArxivSource(), OpenAlexSource(), CrossrefSource()):
+    register_source(_source)
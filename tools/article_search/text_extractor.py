@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+PDF text extraction utilities
+Turns downloaded PDFs into plain text and token-bounded chunks,
+with a page-level SQLite cache keyed by PDF content hash
+"""
+
+import hashlib
+import os
+import sqlite3
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from . import instrumentation
+
+CHARS_PER_TOKEN = 4  # Rough average for English scientific text
+DEFAULT_TEXT_CACHE = Path("papers/text_cache.sqlite")
+
+
+def extract_pdf_pages(pdf_path: Path) -> List[str]:
+    """
+    Extract text from every page of a PDF
+
+    Args:
+        pdf_path: Path to PDF file
+
+    Returns:
+        List of page texts (empty string for pages without text)
+    """
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        raise ImportError("PDF text extraction requires 'pypdf'. Install it using: pip install pypdf") from None
+
+    reader = PdfReader(str(pdf_path))
+    pages = []
+    for page in reader.pages:
+        try:
+            pages.append(page.extract_text() or '')
+        except Exception as e:
+            print(f"Page extraction error ({Path(pdf_path).name}): {e}")
+            pages.append('')
+
+    return pages
+
+
+def extract_pdf_text(pdf_path: Path) -> str:
+    """Extract full text of a PDF, pages separated by blank lines"""
+    return "\n\n".join(extract_pdf_pages(pdf_path))
+
+
+def file_sha256(path: Path) -> str:
+    """Compute SHA-256 of a file's content"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class TextCache:
+    """
+    Page-level cache of extracted PDF text
+
+    Page texts are stored zlib-compressed per content hash, so renamed or
+    re-downloaded copies of the same PDF share one entry. A path table
+    remembers size and mtime to skip re-hashing unchanged files. Failed
+    extractions are recorded per content hash too, so a broken PDF is not
+    re-extracted on every run (a new download has a new hash and is tried).
+    """
+
+    def __init__(self, cache_file: Path = DEFAULT_TEXT_CACHE):
+        self.cache_file = Path(cache_file)
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.cache_file))
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY, sha256 TEXT NOT NULL,
+                size INTEGER NOT NULL, mtime REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS documents (
+                sha256 TEXT PRIMARY KEY, page_count INTEGER NOT NULL,
+                extracted_at TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS pages (
+                sha256 TEXT NOT NULL, page INTEGER NOT NULL, text BLOB NOT NULL,
+                PRIMARY KEY (sha256, page)
+            );
+            CREATE TABLE IF NOT EXISTS failures (
+                sha256 TEXT PRIMARY KEY, error TEXT NOT NULL,
+                failed_at TEXT NOT NULL
+            );
+        """)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def lookup_hash(self, pdf_path: Path) -> Optional[str]:
+        """Return cached hash if the file is unchanged since it was last seen"""
+        stat = os.stat(pdf_path)
+        row = self.conn.execute(
+            "SELECT sha256 FROM files WHERE path = ? AND size = ? AND mtime = ?",
+            (str(pdf_path), stat.st_size, stat.st_mtime)
+        ).fetchone()
+        return row[0] if row else None
+
+    def has_document(self, sha256: str) -> bool:
+        return self.conn.execute(
+            "SELECT 1 FROM documents WHERE sha256 = ?", (sha256,)
+        ).fetchone() is not None
+
+    def has_failure(self, sha256: str) -> bool:
+        return self.conn.execute(
+            "SELECT 1 FROM failures WHERE sha256 = ?", (sha256,)
+        ).fetchone() is not None
+
+    def store_failure(self, sha256: str, error: str):
+        """Mark a document hash whose extraction failed"""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO failures (sha256, error, failed_at) VALUES (?, ?, ?)",
+            (sha256, error, datetime.now().isoformat())
+        )
+
+    def remember_file(self, pdf_path: Path, sha256: str):
+        """Record path -> hash mapping with current size and mtime"""
+        stat = os.stat(pdf_path)
+        self.conn.execute(
+            "INSERT OR REPLACE INTO files (path, sha256, size, mtime) VALUES (?, ?, ?, ?)",
+            (str(pdf_path), sha256, stat.st_size, stat.st_mtime)
+        )
+
+    def store_pages(self, sha256: str, pages: List[str]):
+        """Store extracted page texts for a document hash"""
+        self.conn.execute("DELETE FROM pages WHERE sha256 = ?", (sha256,))
+        self.conn.executemany(
+            "INSERT INTO pages (sha256, page, text) VALUES (?, ?, ?)",
+            ((sha256, i, zlib.compress(text.encode('utf-8'))) for i, text in enumerate(pages))
+        )
+        self.conn.execute(
+            "INSERT OR REPLACE INTO documents (sha256, page_count, extracted_at) VALUES (?, ?, ?)",
+            (sha256, len(pages), datetime.now().isoformat())
+        )
+        self.conn.execute("DELETE FROM failures WHERE sha256 = ?", (sha256,))
+
+    def commit(self):
+        self.conn.commit()
+
+    def iter_pages(self, sha256: str) -> Iterator[str]:
+        """Yield page texts of a document one at a time"""
+        cursor = self.conn.execute(
+            "SELECT text FROM pages WHERE sha256 = ? ORDER BY page", (sha256,)
+        )
+        for (blob,) in cursor:
+            yield zlib.decompress(blob).decode('utf-8')
+
+    def get_text(self, sha256: str) -> str:
+        """Full document text, pages separated by blank lines"""
+        return "\n\n".join(self.iter_pages(sha256))
+
+
+def _extract_job(job: Tuple[str, str]) -> Tuple[str, str, Optional[List[str]], Optional[str]]:
+    """
+    Process pool worker: extract pages of one PDF
+
+    Errors of the document itself are returned, to be cached as a failure.
+    A broken installation (missing pypdf, pypdf's DependencyError for
+    encrypted files) propagates instead of being recorded against every PDF.
+    """
+    path, sha256 = job
+    try:
+        return path, sha256, extract_pdf_pages(Path(path)), None
+    except (ImportError, MemoryError):
+        raise
+    except Exception as e:
+        # Malformed PDFs raise a wide range of errors from inside pypdf
+        from pypdf.errors import DependencyError
+        if isinstance(e, DependencyError):
+            raise
+        return path, sha256, None, str(e)
+
+
+def update_text_cache(
+    pdf_paths: Iterable[Path],
+    cache: TextCache,
+    workers: Optional[int] = None,
+    retry_failed: bool = False
+) -> Dict[str, str]:
+    """
+    Ensure extracted text for all PDFs is cached
+
+    Unchanged files (same size and mtime) are not re-hashed, and only
+    content hashes missing from the cache are extracted, across a process pool.
+    Hashes whose extraction failed before are skipped unless retry_failed.
+
+    Args:
+        pdf_paths: PDF files to extract
+        cache: Text cache to read from and update
+        workers: Number of extraction processes (None = CPU count)
+        retry_failed: Extract documents marked as failed again
+
+    Returns:
+        Dictionary mapping PDF path string to content hash (failed and missing files omitted)
+    """
+    file_hashes = {}
+    pending = {}
+    failed = set()
+
+    for pdf_path in pdf_paths:
+        try:
+            sha256 = cache.lookup_hash(pdf_path)
+            if sha256 is None:
+                sha256 = file_sha256(pdf_path)
+                cache.remember_file(pdf_path, sha256)
+        except FileNotFoundError:
+            # Removed since it was listed
+            print(f"Missing PDF (skipped): {pdf_path}")
+            instrumentation.count('text.missing_pdfs')
+            continue
+        file_hashes[str(pdf_path)] = sha256
+        if sha256 in pending or cache.has_document(sha256):
+            continue
+        if not retry_failed and cache.has_failure(sha256):
+            failed.add(sha256)
+            continue
+        pending[sha256] = str(pdf_path)
+    cache.commit()
+
+    if pending:
+        instrumentation.count('text.extracted_pdfs', len(pending))
+        print(f"Extracting text from {len(pending)} new or changed PDFs...")
+        jobs = [(path, sha256) for sha256, path in pending.items()]
+        executor = None
+        if len(jobs) == 1 or workers == 1:
+            results = map(_extract_job, jobs)
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+            executor = ProcessPoolExecutor(max_workers=workers)
+            results = executor.map(_extract_job, jobs)
+
+        try:
+            with instrumentation.span('text.extract'):
+                for path, sha256, pages, error in results:
+                    if error is not None:
+                        print(f"Extraction error ({Path(path).name}): {error}")
+                        cache.store_failure(sha256, error)
+                        cache.commit()
+                        failed.add(sha256)
+                        continue
+                    cache.store_pages(sha256, pages)
+                    cache.commit()
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+    return {path: sha256 for path, sha256 in file_hashes.items() if sha256 not in failed}
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate token count of text using a character heuristic"""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def chunk_text(text: str, max_tokens: int = 6000, overlap_tokens: int = 200) -> List[str]:
+    """
+    Split text into token-bounded chunks
+
+    Chunks break on paragraph boundaries where possible, and consecutive
+    chunks share a small overlap so statements spanning a boundary survive.
+
+    Args:
+        text: Text to split
+        max_tokens: Maximum estimated tokens per chunk
+        overlap_tokens: Estimated tokens repeated at the start of the next chunk
+
+    Returns:
+        List of text chunks
+    """
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    overlap_chars = min(overlap_tokens * CHARS_PER_TOKEN, max_chars // 2)
+
+    text = text.strip()
+    if len(text) <= max_chars:
+        return [text] if text else []
+
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = min(start + max_chars, len(text))
+
+        # Prefer paragraph, then line, then word boundary in the second half of the window
+        if end < len(text):
+            for separator in ("\n\n", "\n", " "):
+                cut = text.rfind(separator, start + max_chars // 2, end)
+                if cut != -1:
+                    end = cut + len(separator)
+                    break
+
+        chunks.append(text[start:end].strip())
+
+        if end >= len(text):
+            break
+        start = max(end - overlap_chars, start + 1)
+
+    return [c for c in chunks if c]
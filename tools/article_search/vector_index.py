@@ -0,0 +1,441 @@
+#!/usr/bin/env python3
+"""
+Local vector similarity index over catalog abstracts
+CPU-only embeddings in a memory-mapped float32 matrix with batched cosine top-k queries
+"""
+
+import json
+import math
+import re
+import zlib
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from . import instrumentation
+
+DEFAULT_VECTOR_INDEX = Path("papers/vector_index")
+DEFAULT_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+HASH_FEATURES = 2 ** 15  # Hashed unigram + bigram buckets
+CHUNK_NNZ = 1 << 18  # Sparse entries multiplied at a time
+QUERY_BLOCK = 65536  # Index rows scored at a time
+
+_TOKEN = re.compile(r'[a-z0-9]+(?:-[a-z0-9]+)*')
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to was were we with "
+    "which these those our their can using based via into than also".split()
+)
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("The vector index requires 'numpy'. Install it using: pip install numpy")
+
+
+def paper_text(paper: Dict) -> str:
+    """Text embedded for a paper (title and abstract)"""
+    return f"{paper.get('title') or ''}. {paper.get('abstract') or ''}"
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase unigrams and bigrams of a text (stopwords and 1-character tokens dropped)"""
+    tokens = [t for t in _TOKEN.findall(text.lower()) if len(t) > 1 and t not in _STOPWORDS]
+    return tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+
+def hashed_features(text: str, n_features: int = HASH_FEATURES) -> Dict[int, float]:
+    """
+    Signed hashed unigram and bigram counts of a text
+
+    Returns:
+        Dictionary bucket -> signed count (sign from the hash, so collisions tend to cancel)
+    """
+    features = Counter()
+    for term, count in Counter(tokenize(text)).items():
+        h = zlib.crc32(term.encode('utf-8'))
+        features[h % n_features] += count if h & 0x80000000 else -count
+    return {bucket: value for bucket, value in features.items() if value}
+
+
+class HashingSVDEmbedder:
+    """
+    Hashing vectorizer + truncated SVD (latent semantic analysis)
+
+    Documents are hashed into n_features signed buckets with sublinear term
+    frequency and IDF weights, then projected onto the top singular vectors
+    found by randomized SVD on the fitting corpus.
+    """
+
+    method = 'svd'
+
+    def __init__(self, components: 'np.ndarray', idf: 'np.ndarray'):
+        self.components = components  # n_features x dim
+        self.idf = idf
+
+    @property
+    def dim(self) -> int:
+        return self.components.shape[1]
+
+    @classmethod
+    def fit(cls, texts: Sequence[str], dim: int = 128, n_features: int = HASH_FEATURES,
+            oversample: int = 10, power_iterations: int = 2, seed: int = 0) -> 'HashingSVDEmbedder':
+        """
+        Fit on a corpus (dim is capped by the number of documents)
+
+        Args:
+            texts: Fitting documents (e.g. a sample of ~10k abstracts)
+            dim: Embedding dimensions
+            n_features: Hash buckets
+            oversample: Extra random directions for the randomized SVD
+            power_iterations: Subspace iterations (improve accuracy on slowly decaying spectra)
+            seed: Random seed
+
+        Returns:
+            Fitted embedder
+        """
+        _require_numpy()
+        rows = [hashed_features(text, n_features) for text in texts]
+
+        doc_freq = np.zeros(n_features, dtype=np.float32)
+        for row in rows:
+            doc_freq[list(row)] += 1
+        idf = np.log((1 + len(rows)) / (1 + doc_freq)).astype(np.float32) + 1
+
+        embedder = cls(np.zeros((n_features, 0), dtype=np.float32), idf)
+        dim = max(1, min(dim, len(rows) - 1))
+        k = min(dim + oversample, len(rows))
+
+        docs, features, weights = embedder._weighted(rows)
+        by_feature = np.argsort(features, kind='stable')
+        t_features, t_docs, t_weights = features[by_feature], docs[by_feature], weights[by_feature]
+
+        def times(matrix):  # X @ matrix
+            return _segment_sum(docs, features, weights, matrix, len(rows))
+
+        def transposed_times(matrix):  # X.T @ matrix
+            return _segment_sum(t_features, t_docs, t_weights, matrix, n_features)
+
+        with instrumentation.span('vectors.fit'):
+            rng = np.random.default_rng(seed)
+            q, _ = np.linalg.qr(times(rng.standard_normal((n_features, k), dtype=np.float32)))
+            for _ in range(power_iterations):
+                q, _ = np.linalg.qr(times(transposed_times(q)))
+            b = transposed_times(q).T  # k x n_features
+            _, _, vt = np.linalg.svd(b, full_matrices=False)
+
+        embedder.components = np.ascontiguousarray(vt[:dim].T, dtype=np.float32)
+        return embedder
+
+    def _weighted(self, rows: List[Dict[int, float]]) -> Tuple['np.ndarray', 'np.ndarray', 'np.ndarray']:
+        """
+        Sparse rows with sublinear tf x idf weights, L2-normalized per row
+
+        Returns:
+            (row, feature, weight) arrays of the non-zero entries, ordered by row
+        """
+        sizes = [len(row) for row in rows]
+        nnz = sum(sizes)
+        docs = np.repeat(np.arange(len(rows), dtype=np.int64), sizes)
+        features = np.fromiter((f for row in rows for f in row), dtype=np.int64, count=nnz)
+        counts = np.fromiter((c for row in rows for c in row.values()), dtype=np.float32, count=nnz)
+
+        weights = np.sign(counts) * (1 + np.log(np.abs(counts))) * self.idf[features]
+        norms = np.sqrt(np.bincount(docs, weights=weights ** 2, minlength=len(rows)))
+        weights /= np.maximum(norms[docs], 1e-12).astype(np.float32)
+        return docs, features, weights
+
+    def transform(self, texts: Sequence[str]) -> 'np.ndarray':
+        """L2-normalized float32 embeddings (len(texts) x dim)"""
+        n_features = self.components.shape[0]
+        rows = [hashed_features(text, n_features) for text in texts]
+        docs, features, weights = self._weighted(rows)
+        return _normalize(_segment_sum(docs, features, weights, self.components, len(rows)))
+
+    def save(self, index_dir: Path):
+        np.savez(Path(index_dir) / "svd.npz", components=self.components, idf=self.idf)
+
+    @classmethod
+    def load(cls, index_dir: Path, meta: Dict) -> 'HashingSVDEmbedder':
+        data = np.load(Path(index_dir) / "svd.npz")
+        return cls(data['components'], data['idf'])
+
+
+class SentenceEmbedder:
+    """Small local sentence-transformers model (used when installed and requested)"""
+
+    method = 'model'
+
+    def __init__(self, model_name: str = DEFAULT_MODEL):
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError:
+            raise ImportError(
+                "Model embeddings require 'sentence-transformers'. "
+                "Install it using: pip install sentence-transformers"
+            ) from None
+        self.model_name = model_name
+        self.model = SentenceTransformer(model_name, device='cpu')
+
+    @property
+    def dim(self) -> int:
+        return self.model.get_sentence_embedding_dimension()
+
+    def transform(self, texts: Sequence[str]) -> 'np.ndarray':
+        vectors = self.model.encode(list(texts), batch_size=64, convert_to_numpy=True, show_progress_bar=False)
+        return _normalize(vectors.astype(np.float32))
+
+    def save(self, index_dir: Path):
+        pass  # The model is loaded by name
+
+    @classmethod
+    def load(cls, index_dir: Path, meta: Dict) -> 'SentenceEmbedder':
+        return cls(meta['model'])
+
+
+def _segment_sum(keys: 'np.ndarray', columns: 'np.ndarray', weights: 'np.ndarray',
+                 matrix: 'np.ndarray', n_out: int) -> 'np.ndarray':
+    """
+    Sparse-dense product: out[keys[i]] += weights[i] * matrix[columns[i]]
+
+    keys must be sorted. Entries are processed in chunks so the gathered
+    rows stay within a bounded amount of memory.
+    """
+    out = np.zeros((n_out, matrix.shape[1]), dtype=np.float32)
+    for start in range(0, len(keys), CHUNK_NNZ):
+        chunk_keys = keys[start:start + CHUNK_NNZ]
+        contrib = matrix[columns[start:start + CHUNK_NNZ]] * weights[start:start + CHUNK_NNZ, None]
+        starts = np.flatnonzero(np.r_[True, chunk_keys[1:] != chunk_keys[:-1]])
+        out[chunk_keys[starts]] += np.add.reduceat(contrib, starts, axis=0)
+    return out
+
+
+def _normalize(vectors: 'np.ndarray') -> 'np.ndarray':
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+class VectorIndex:
+    """
+    Append-only embedding index stored in a directory
+
+    index.json    - embedder settings and the committed row count
+    vectors.f32   - row-major float32 matrix (count x dim), memory-mapped for queries
+    papers.jsonl  - id, title and year of each row
+    svd.npz       - hashing + SVD model (svd method)
+
+    Rows are appended to the data files before the count in index.json is
+    updated, so an interrupted append is ignored on the next open.
+    """
+
+    def __init__(self, index_dir: Path, embedder, meta: Dict):
+        _require_numpy()
+        self.index_dir = Path(index_dir)
+        self.vectors_file = self.index_dir / "vectors.f32"
+        self.papers_file = self.index_dir / "papers.jsonl"
+        self.meta_file = self.index_dir / "index.json"
+        self.embedder = embedder
+        self.meta = meta
+        self.papers: List[Dict] = []
+        self.rows: Dict[str, int] = {}
+        self._matrix = None
+
+    @property
+    def dim(self) -> int:
+        return self.meta['dim']
+
+    def __len__(self) -> int:
+        return self.meta['count']
+
+    @classmethod
+    def create(cls, index_dir: Path, papers: Sequence[Dict], method: str = 'svd', dim: int = 128,
+               model_name: str = DEFAULT_MODEL, fit_sample: int = 10000) -> 'VectorIndex':
+        """
+        Fit an embedder and index papers (replaces an existing index in index_dir)
+
+        Args:
+            index_dir: Index directory
+            papers: Papers to index; the SVD is fitted on up to fit_sample of them
+            method: 'svd' (hashing + SVD) or 'model' (sentence-transformers)
+            dim: Embedding dimensions for 'svd'
+            model_name: sentence-transformers model for 'model'
+            fit_sample: Papers used to fit the SVD (evenly spaced sample)
+
+        Returns:
+            The new index
+        """
+        _require_numpy()
+        index_dir = Path(index_dir)
+        index_dir.mkdir(parents=True, exist_ok=True)
+
+        if method == 'model':
+            embedder = SentenceEmbedder(model_name)
+        elif method == 'svd':
+            step = max(1, math.ceil(len(papers) / fit_sample))
+            embedder = HashingSVDEmbedder.fit([paper_text(p) for p in papers[::step]], dim=dim)
+        else:
+            raise ValueError(f"Unknown embedding method: {method}")
+        embedder.save(index_dir)
+
+        meta = {
+            'method': method,
+            'dim': embedder.dim,
+            'model': model_name if method == 'model' else None,
+            'created': datetime.now().isoformat(),
+            'count': 0
+        }
+        index = cls(index_dir, embedder, meta)
+        for path in (index.vectors_file, index.papers_file):
+            path.write_bytes(b"")
+        index._save_meta()
+        index.add_papers(papers)
+        return index
+
+    @classmethod
+    def open(cls, index_dir: Path) -> 'VectorIndex':
+        """Open an existing index"""
+        _require_numpy()
+        index_dir = Path(index_dir)
+        meta_file = index_dir / "index.json"
+        if not meta_file.exists():
+            raise FileNotFoundError(f"No vector index found: {index_dir}")
+        with open(meta_file, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+
+        embedder_class = SentenceEmbedder if meta['method'] == 'model' else HashingSVDEmbedder
+        index = cls(index_dir, embedder_class.load(index_dir, meta), meta)
+
+        with open(index.papers_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                if len(index.papers) >= meta['count']:
+                    break  # Uncommitted rows of an interrupted append
+                index.papers.append(json.loads(line))
+        index.rows = {paper['id']: row for row, paper in enumerate(index.papers)}
+        return index
+
+    @classmethod
+    def open_or_create(cls, index_dir: Path, papers: Sequence[Dict], **create_args) -> 'VectorIndex':
+        """Open index_dir and append papers, or create it from papers"""
+        if (Path(index_dir) / "index.json").exists():
+            index = cls.open(index_dir)
+            index.add_papers(papers)
+            return index
+        return cls.create(index_dir, papers, **create_args)
+
+    def _save_meta(self):
+        tmp_file = self.meta_file.with_name(self.meta_file.name + '.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.meta, f, indent=2)
+        tmp_file.replace(self.meta_file)
+
+    def _truncate_uncommitted(self):
+        """Drop rows written after the last committed count"""
+        size = len(self) * self.dim * 4
+        if self.vectors_file.stat().st_size > size:
+            with open(self.vectors_file, 'r+b') as f:
+                f.truncate(size)
+        with open(self.papers_file, 'w', encoding='utf-8') as f:
+            f.writelines(json.dumps(paper, ensure_ascii=False) + "\n" for paper in self.papers)
+
+    def add_papers(self, papers: Iterable[Dict]) -> int:
+        """
+        Embed and append papers that are not indexed yet
+
+        Returns:
+            Number of papers added
+        """
+        new = []
+        seen = set(self.rows)
+        for paper in papers:
+            if paper.get('id') and paper['id'] not in seen:
+                seen.add(paper['id'])
+                new.append(paper)
+        if not new:
+            return 0
+
+        if self.vectors_file.stat().st_size != len(self) * self.dim * 4:
+            self._truncate_uncommitted()
+
+        with instrumentation.span('vectors.embed'):
+            vectors = self.embedder.transform([paper_text(p) for p in new])
+
+        records = [{'id': p['id'], 'title': p.get('title'), 'year': p.get('year')} for p in new]
+        with open(self.vectors_file, 'ab') as f:
+            f.write(vectors.astype('<f4', copy=False).tobytes())
+        with open(self.papers_file, 'a', encoding='utf-8') as f:
+            f.writelines(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+
+        for record in records:
+            self.rows[record['id']] = len(self.papers)
+            self.papers.append(record)
+        self.meta['count'] = len(self.papers)
+        self._save_meta()
+        self._matrix = None
+        instrumentation.count('vectors.added', len(new))
+        return len(new)
+
+    @property
+    def matrix(self) -> 'np.ndarray':
+        """Memory-mapped (count x dim) float32 matrix"""
+        if self._matrix is None:
+            if not len(self):
+                return np.zeros((0, self.dim), dtype=np.float32)
+            self._matrix = np.memmap(self.vectors_file, dtype='<f4', mode='r', shape=(len(self), self.dim))
+        return self._matrix
+
+    def vectors_for(self, paper_ids: Sequence[str]) -> 'np.ndarray':
+        """Stored embeddings of indexed papers (KeyError for unknown ids)"""
+        return np.asarray(self.matrix[[self.rows[paper_id] for paper_id in paper_ids]])
+
+    def query(self, vectors: 'np.ndarray', k: int = 10,
+              exclude: Optional[Sequence[Optional[str]]] = None) -> List[List[Tuple[Dict, float]]]:
+        """
+        Cosine top-k for a batch of query vectors
+
+        Args:
+            vectors: (m x dim) query embeddings (normalized here)
+            k: Neighbors per query
+            exclude: Optional paper id per query to leave out (e.g. the query paper itself)
+
+        Returns:
+            Per query, a list of (paper record, similarity) by decreasing similarity
+        """
+        vectors = _normalize(np.atleast_2d(np.asarray(vectors, dtype=np.float32)))
+        m = len(vectors)
+        k_search = k + (1 if exclude else 0)
+        best_scores = np.full((m, 0), -np.inf, dtype=np.float32)
+        best_rows = np.zeros((m, 0), dtype=np.int64)
+
+        with instrumentation.span('vectors.query'):
+            matrix = self.matrix
+            for start in range(0, len(matrix), QUERY_BLOCK):
+                scores = vectors @ matrix[start:start + QUERY_BLOCK].T  # m x block
+                if scores.shape[1] > k_search:
+                    top = np.argpartition(-scores, k_search - 1, axis=1)[:, :k_search]
+                else:
+                    top = np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+                best_scores = np.hstack([best_scores, np.take_along_axis(scores, top, axis=1)])
+                best_rows = np.hstack([best_rows, top + start])
+
+            order = np.argsort(-best_scores, axis=1)
+            results = []
+            for i in range(m):
+                skip = self.rows.get(exclude[i]) if exclude else None
+                hits = [(self.papers[best_rows[i, j]], float(best_scores[i, j]))
+                        for j in order[i] if best_rows[i, j] != skip]
+                results.append(hits[:k])
+        return results
+
+    def similar_to(self, paper_ids: Sequence[str], k: int = 10) -> List[List[Tuple[Dict, float]]]:
+        """"More like this" for indexed papers (each paper itself is excluded)"""
+        return self.query(self.vectors_for(paper_ids), k=k, exclude=paper_ids)
+
+    def search_text(self, texts: Sequence[str], k: int = 10) -> List[List[Tuple[Dict, float]]]:
+        """Nearest papers for free-text queries"""
+        return self.query(self.embedder.transform(list(texts)), k=k)
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Offline behaviour check of the OpenAlex and Crossref sources
+Searches, pages and looks up against the mock server and compares the normalized papers with the records served
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+# Add tools directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from article_search import get_source
+from mock_server import MockServer
+from run_benchmarks import pointed_at
+
+CHECKED_SOURCES = ['openalex', 'crossref']
+
+# Fields the normalized paper must carry over unchanged from the served record
+ROUND_TRIP_FIELDS = ['title', 'authors', 'year', 'abstract', 'citations', 'venue', 'pdf_url']
+
+# Sparse records as the live APIs return them for incomplete works
+EDGE_CASES = {
+    'openalex': [
+        {'id': 'https://openalex.org/W1'},
+        {'id': 'https://openalex.org/W2', 'display_name': None, 'publication_year': None, 'doi': None,
+         'authorships': [{'author': None}], 'abstract_inverted_index': None, 'cited_by_count': None,
+         'primary_location': None, 'best_oa_location': None},
+        {'id': 'https://openalex.org/W3', 'primary_location': {'source': None},
+         'best_oa_location': {'pdf_url': None}},
+    ],
+    'crossref': [
+        {'DOI': '10.5555/empty-date', 'issued': {'date-parts': [[]]}},
+        {'DOI': '10.5555/no-date-parts', 'issued': {'date-parts': []}},
+        {'DOI': '10.5555/null-year', 'issued': {'date-parts': [[None]]}},
+        {'DOI': '10.5555/no-issued', 'title': [], 'author': [{'name': 'Consortium'}], 'container-title': [],
+         'link': [{'URL': 'https://example.org/a.html', 'content-type': 'text/html'}]},
+    ],
+}
+
+
+def compare(name: str, normalized: List[Dict], expected: List[Dict]) -> List[str]:
+    """Differences between normalized papers and the records they were served from"""
+    problems = []
+    if len(normalized) != len(expected):
+        problems.append(f"{len(normalized)} papers instead of {len(expected)}")
+    for i, (paper, record) in enumerate(zip(normalized, expected)):
+        for field in ROUND_TRIP_FIELDS:
+            if paper.get(field) != record[field]:
+                problems.append(f"paper {i} {field}: {paper.get(field)!r} != {record[field]!r}")
+        if paper['source'] != name or paper['pdf_available'] != bool(record['pdf_url']):
+            problems.append(f"paper {i}: source {paper['source']!r}, pdf_available {paper['pdf_available']!r}")
+    return problems
+
+
+def check_search(server: MockServer, name: str, query: str, limit: int) -> List[str]:
+    """Paged search: order, count and normalized fields"""
+    source = get_source(name)
+    raw = source.search(query, year_from=2015, limit=limit)
+    normalized = [source.normalize(work) for work in raw]
+    problems = compare(name, normalized, server.synthetic_papers(query, limit))
+    problems += [f"paper {i}: id {paper['id']!r} != paper_id {source.paper_id(work)!r}"
+                 for i, (paper, work) in enumerate(zip(normalized, raw)) if paper['id'] != source.paper_id(work)]
+    return problems
+
+
+def check_lookup(server: MockServer, name: str, query: str) -> List[str]:
+    """Bulk lookup by the ids of catalogued papers"""
+    source = get_source(name)
+    papers = [source.normalize(work) for work in source.search(query, year_from=2015, limit=5)]
+    keys = [source.lookup_key(paper) for paper in papers]
+    if None in keys:
+        return [f"no lookup key for {papers[keys.index(None)]['id']}"]
+    found = source.lookup(keys)
+    problems = [f"lookup missed {key}" for key in keys if key not in found]
+    problems += [f"lookup of {key} returned {source.paper_id(found[key])}"
+                 for key, paper in zip(keys, papers) if key in found and source.paper_id(found[key]) != paper['id']]
+    return problems
+
+
+def check_edge_cases(name: str) -> List[str]:
+    """Sparse records normalize without errors and with neutral defaults"""
+    source = get_source(name)
+    problems = []
+    for work in EDGE_CASES[name]:
+        try:
+            paper = source.normalize(work)
+        except Exception as e:
+            problems.append(f"{source.paper_id(work)}: {type(e).__name__}: {e}")
+            continue
+        if paper['year'] is not None or paper['pdf_available'] or paper['citations'] != 0 or not paper['title']:
+            problems.append(f"{paper['id']}: unexpected {paper}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check source normalization against the mock server')
+    parser.add_argument('--sources', nargs='+', default=CHECKED_SOURCES, choices=CHECKED_SOURCES)
+    parser.add_argument('--query', type=str, default='radiosonde temperature profile')
+    parser.add_argument('--limit', type=int, default=450, help='Results per search (more than two pages of OpenAlex)')
+    args = parser.parse_args()
+
+    failed = 0
+    with MockServer() as server, pointed_at(server):
+        for name in args.sources:
+            checks = {
+                'search': lambda: check_search(server, name, args.query, args.limit),
+                'lookup': lambda: check_lookup(server, name, args.query),
+                'edge cases': lambda: check_edge_cases(name),
+            }
+            for check, run in checks.items():
+                with contextlib.redirect_stdout(io.StringIO()):
+                    problems = run()
+                if problems:
+                    failed += 1
+                    print(f"❌ {name} {check}: {len(problems)} problems")
+                    for problem in problems[:10]:
+                        print(f"   {problem}")
+                else:
+                    print(f"✓ {name} {check}")
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
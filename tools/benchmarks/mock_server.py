@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Semantic Scholar, arXiv, OpenAlex, Crossref and PDF endpoints
+Replays recorded fixtures (or synthetic payloads) with configurable latency and rate limits
+"""
+
+import hashlib
+import json
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+# Add tools directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from synthetic import arxiv_atom_feed, crossref_raw, iter_papers, make_pdf, openalex_raw, s2_raw
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+# Fixture files written by record_fixtures.py
+S2_SEARCH_FIXTURE = "s2_search.json"
+ARXIV_SEARCH_FIXTURE = "arxiv_search.xml"
+PDF_FIXTURE = "sample.pdf"
+
+
+class RateLimiter:
+    """Token bucket per endpoint; rejected requests get HTTP 429"""
+
+    def __init__(self, rate: Optional[float], burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = {}
+        self._updated = {}
+        self._lock = threading.Lock()
+
+    def allow(self, endpoint: str) -> bool:
+        if not self.rate:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            tokens = self._tokens.get(endpoint, self.burst)
+            tokens = min(self.burst, tokens + (now - self._updated.get(endpoint, now)) * self.rate)
+            self._updated[endpoint] = now
+            if tokens < 1:
+                self._tokens[endpoint] = tokens
+                return False
+            self._tokens[endpoint] = tokens - 1
+            return True
+
+
+class MockServer:
+    """
+    Threaded HTTP server emulating the external APIs
+
+    Routes:
+        GET  /graph/v1/paper/search   Semantic Scholar search
+        GET  /graph/v1/paper/search/match  Semantic Scholar title match
+        GET  /graph/v1/paper/<id>/references|citations  Citation edges (paged)
+        POST /graph/v1/paper/batch    Semantic Scholar bulk lookup
+        GET  /api/query               arXiv search / id_list (ETag + 304 supported)
+        GET  /openalex/works          OpenAlex search / openalex: id filter
+        GET  /crossref/works          Crossref search / doi: filter
+        GET  /pdf/<id>.pdf            PDF payloads (?bytes=N for a PDF of N bytes; HEAD reports the size)
+
+    Recorded fixtures in fixtures_dir are replayed when present; otherwise
+    deterministic synthetic payloads are generated per query.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        rate_limit: Optional[float] = None,
+        pdf_size: int = 200_000,
+        fixtures_dir: Optional[Path] = FIXTURES_DIR,
+        seed: int = 0
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.limiter = RateLimiter(rate_limit)
+        self.fixtures_dir = Path(fixtures_dir) if fixtures_dir else None
+        self.seed = seed
+        self.requests = Counter()
+        self.rejected = Counter()
+        self._httpd = None
+        self._thread = None
+        self._pdf = self._fixture(PDF_FIXTURE) or make_pdf(pdf_size, seed)
+        self._sized_pdfs = {}
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def start(self) -> 'MockServer':
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', 0), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def _fixture(self, name: str) -> Optional[bytes]:
+        if self.fixtures_dir and (self.fixtures_dir / name).exists():
+            return (self.fixtures_dir / name).read_bytes()
+        return None
+
+    def pdf(self, size: int) -> bytes:
+        """Synthetic PDF of the given size (cached)"""
+        if size not in self._sized_pdfs:
+            self._sized_pdfs[size] = make_pdf(size, self.seed)
+        return self._sized_pdfs[size]
+
+    def synthetic_papers(self, key: str, limit: int, arxiv: bool = False) -> List[Dict]:
+        """Deterministic synthetic papers behind the response for a query or id"""
+        seed = int(hashlib.sha1(f"{self.seed}:{key}".encode('utf-8')).hexdigest()[:8], 16)
+        papers = iter_papers(limit * 2, seed=seed, base_url=self.url)
+        return [p for p in papers if (p['source'] == 'arxiv') == arxiv][:limit]
+
+    # Payloads
+
+    def s2_search(self, query: str, limit: int, offset: int = 0) -> bytes:
+        recorded = self._fixture(S2_SEARCH_FIXTURE)
+        if recorded is not None:
+            data = json.loads(recorded)
+            data['data'] = data.get('data', [])[offset:offset + limit]
+            return json.dumps(data).encode('utf-8')
+        papers = self.synthetic_papers(query, offset + limit, arxiv=False)[offset:]
+        return json.dumps({'total': len(papers), 'offset': offset, 'data': [s2_raw(p) for p in papers]}).encode('utf-8')
+
+    def s2_batch(self, ids) -> bytes:
+        results = []
+        for paper_id in ids:
+            paper = self.synthetic_papers(paper_id, 1, arxiv=False)[0]
+            raw = s2_raw(paper)
+            raw['paperId'] = paper_id
+            results.append(raw)
+        return json.dumps(results).encode('utf-8')
+
+    def s2_match(self, title: str) -> bytes:
+        raw = s2_raw(self.synthetic_papers(title, 1, arxiv=False)[0])
+        raw['title'] = title
+        raw['paperId'] = hashlib.sha1(title.encode('utf-8')).hexdigest()
+        return json.dumps({'data': [dict(raw, matchScore=100.0)]}).encode('utf-8')
+
+    def s2_edges(self, paper_id: str, direction: str, offset: int, limit: int) -> bytes:
+        """Deterministic neighbor ids (5-40 per paper and direction)"""
+        digest = hashlib.sha1(f"{self.seed}:{paper_id}:{direction}".encode('utf-8')).hexdigest()
+        total = 5 + int(digest[:4], 16) % 36
+        key = 'citedPaper' if direction == 'references' else 'citingPaper'
+        data = [
+            {key: {'paperId': hashlib.sha1(f"{digest}:{i}".encode('utf-8')).hexdigest()}}
+            for i in range(offset, min(total, offset + limit))
+        ]
+        body = {'offset': offset, 'data': data}
+        if offset + limit < total:
+            body['next'] = offset + limit
+        return json.dumps(body).encode('utf-8')
+
+    def arxiv_query(self, params: Dict) -> bytes:
+        if 'id_list' in params:
+            papers = []
+            for arxiv_id in params['id_list'][0].split(','):
+                paper = self.synthetic_papers(arxiv_id, 1, arxiv=True)[0]
+                paper['id'] = f"arxiv:{arxiv_id}v1"
+                papers.append(paper)
+            return arxiv_atom_feed(papers, self.url).encode('utf-8')
+
+        recorded = self._fixture(ARXIV_SEARCH_FIXTURE)
+        if recorded is not None:
+            return recorded
+        limit = int(params.get('max_results', ['50'])[0])
+        papers = self.synthetic_papers(params.get('search_query', [''])[0], limit, arxiv=True)
+        return arxiv_atom_feed(papers, self.url).encode('utf-8')
+
+    def openalex_works(self, params: Dict) -> bytes:
+        filters = params.get('filter', [''])[0]
+        if filters.startswith('openalex:'):
+            results = []
+            for work_id in filters[len('openalex:'):].split('|'):
+                work = openalex_raw(self.synthetic_papers(work_id, 1, arxiv=False)[0])
+                work['id'] = f"https://openalex.org/{work_id}"
+                results.append(work)
+        else:
+            per_page = int(params.get('per-page', ['25'])[0])
+            offset = (int(params.get('page', ['1'])[0]) - 1) * per_page
+            papers = self.synthetic_papers(params.get('search', [''])[0], offset + per_page, arxiv=False)[offset:]
+            results = [openalex_raw(p) for p in papers]
+        return json.dumps({'meta': {'count': len(results)}, 'results': results}).encode('utf-8')
+
+    def crossref_works(self, params: Dict) -> bytes:
+        filters = params.get('filter', [''])[0]
+        if filters.startswith('doi:'):
+            items = []
+            for doi in (f[len('doi:'):] for f in filters.split(',')):
+                work = crossref_raw(self.synthetic_papers(doi, 1, arxiv=False)[0])
+                work['DOI'] = doi
+                items.append(work)
+        else:
+            rows = int(params.get('rows', ['20'])[0])
+            offset = int(params.get('offset', ['0'])[0])
+            papers = self.synthetic_papers(params.get('query', [''])[0], offset + rows, arxiv=False)[offset:]
+            items = [crossref_raw(p) for p in papers]
+        return json.dumps({'status': 'ok', 'message': {'items': items}}).encode('utf-8')
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send_headers(self, status: int, length: int, content_type: str = "application/json", headers=None):
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(length))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+
+            def _send(self, status: int, body: bytes = b"", content_type: str = "application/json", headers=None):
+                self._send_headers(status, len(body), content_type, headers)
+                if self.command != 'HEAD':
+                    self.wfile.write(body)
+
+            def _pdf(self, params: Dict) -> bytes:
+                size = params.get('bytes', [None])[0]
+                return server.pdf(int(size)) if size else server._pdf
+
+            def _admit(self, endpoint: str) -> bool:
+                server.requests[endpoint] += 1
+                delay = server.latency + (random.uniform(0, server.jitter) if server.jitter else 0)
+                if delay:
+                    time.sleep(delay)
+                if not server.limiter.allow(endpoint):
+                    server.rejected[endpoint] += 1
+                    self._send(429, b'{"message": "Too Many Requests"}', headers={'Retry-After': '1'})
+                    return False
+                return True
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                params = parse_qs(url.query)
+
+                if url.path == '/graph/v1/paper/search':
+                    if self._admit('s2'):
+                        limit = int(params.get('limit', ['20'])[0])
+                        offset = int(params.get('offset', ['0'])[0])
+                        self._send(200, server.s2_search(params.get('query', [''])[0], limit, offset))
+                elif url.path == '/graph/v1/paper/search/match':
+                    if self._admit('s2'):
+                        self._send(200, server.s2_match(params.get('query', [''])[0]))
+                elif url.path.startswith('/graph/v1/paper/') and url.path.rsplit('/', 1)[-1] in ('references', 'citations'):
+                    if self._admit('s2'):
+                        paper_id, direction = url.path[len('/graph/v1/paper/'):].rsplit('/', 1)
+                        self._send(200, server.s2_edges(paper_id, direction, int(params.get('offset', ['0'])[0]),
+                                                        int(params.get('limit', ['100'])[0])))
+                elif url.path == '/api/query':
+                    if self._admit('arxiv'):
+                        body = server.arxiv_query(params)
+                        etag = '"%s"' % hashlib.sha1(body).hexdigest()
+                        if self.headers.get('If-None-Match') == etag:
+                            self._send(304, headers={'ETag': etag})
+                        else:
+                            self._send(200, body, 'application/atom+xml', headers={'ETag': etag})
+                elif url.path == '/openalex/works':
+                    if self._admit('openalex'):
+                        self._send(200, server.openalex_works(params))
+                elif url.path == '/crossref/works':
+                    if self._admit('crossref'):
+                        self._send(200, server.crossref_works(params))
+                elif url.path.startswith('/pdf/'):
+                    if self._admit('pdf'):
+                        self._send(200, self._pdf(params), 'application/pdf')
+                else:
+                    self._send(404, b'{"error": "not found"}')
+
+            def do_HEAD(self):
+                # Status line and headers only: PDF size probes before downloading
+                url = urlparse(self.path)
+                if url.path.startswith('/pdf/'):
+                    if self._admit('pdf'):
+                        self._send_headers(200, len(self._pdf(parse_qs(url.query))), 'application/pdf')
+                else:
+                    self._send_headers(405, 0, headers={'Allow': 'GET'})
+
+            def do_POST(self):
+                url = urlparse(self.path)
+                length = int(self.headers.get('Content-Length', 0))
+                payload = json.loads(self.rfile.read(length) or b'{}')
+
+                if url.path == '/graph/v1/paper/batch':
+                    if self._admit('s2'):
+                        self._send(200, server.s2_batch(payload.get('ids', [])))
+                else:
+                    self._send(404, b'{"error": "not found"}')
+
+        return Handler
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Run the mock API server until interrupted')
+    parser.add_argument('--latency', type=float, default=0.05, help='Response latency in seconds')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Additional random latency in seconds')
+    parser.add_argument('--rate-limit', type=float, help='Requests per second per endpoint (429 above)')
+    args = parser.parse_args()
+
+    with MockServer(latency=args.latency, jitter=args.jitter, rate_limit=args.rate_limit) as mock:
+        print(f"Mock server listening on {mock.url}")
+        print(f"  S2_API_URL    = {mock.url}/graph/v1")
+        print(f"  ARXIV_API_URL = {mock.url}/api/query")
+        print(f"  OPENALEX_API_URL = {mock.url}/openalex")
+        print(f"  CROSSREF_API_URL = {mock.url}/crossref")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Record live API responses as benchmark fixtures
+Saves one Semantic Scholar search, one arXiv feed and one PDF for the mock server to replay
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from urllib.parse import quote_plus
+
+import requests
+
+# Add tools directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from article_search.http_session import USER_AGENT
+from article_search.search_apis import S2_API_URL, ARXIV_API_URL
+from mock_server import FIXTURES_DIR, S2_SEARCH_FIXTURE, ARXIV_SEARCH_FIXTURE, PDF_FIXTURE
+
+
+def record(url: str, target: Path, params=None):
+    response = requests.get(url, params=params, headers={"User-Agent": USER_AGENT}, timeout=90)
+    response.raise_for_status()
+    target.write_bytes(response.content)
+    print(f"✓ {target.name}: {len(response.content):,} bytes")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Record API fixtures for the benchmark mock server')
+    parser.add_argument('--query', type=str, default='atmospheric temperature profile machine learning')
+    parser.add_argument('--limit', type=int, default=100, help='Results per recorded search')
+    parser.add_argument('--pdf-url', type=str, default='https://arxiv.org/pdf/2212.12794.pdf')
+    parser.add_argument('--output-dir', type=Path, default=FIXTURES_DIR)
+    args = parser.parse_args()
+
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+
+    record(f"{S2_API_URL}/paper/search", args.output_dir / S2_SEARCH_FIXTURE, params={
+        "query": args.query,
+        "fields": "paperId,title,authors,year,abstract,citationCount,publicationVenue,openAccessPdf,url",
+        "limit": min(args.limit, 100)
+    })
+    record(f"{ARXIV_API_URL}?search_query=all:{quote_plus(args.query)}&max_results={args.limit}",
+           args.output_dir / ARXIV_SEARCH_FIXTURE)
+    record(args.pdf_url, args.output_dir / PDF_FIXTURE)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
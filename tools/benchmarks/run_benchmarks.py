@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark suite
+Measures search, download, scoring, catalog, report and similarity stages against the local mock server
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+# Add tools directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from article_search import (
+    search_apis,
+    pdf_downloader,
+    SOURCES,
+    select_sources,
+    batch_download_pdfs,
+    filter_by_relevance,
+    score_atmospheric_profile_paper,
+    build_catalog,
+    generate_search_report,
+    VectorIndex
+)
+from mock_server import MockServer
+from synthetic import make_papers, TOPIC_PHRASES
+from search_papers import search_papers
+
+STAGES = ['search', 'pipeline', 'download', 'scoring', 'catalog', 'report', 'similarity']
+DEFAULT_STAGES = STAGES[:-1]  # Building an embedding index takes minutes at 100k papers
+
+
+# Module attributes redirected to the mock server: (module, attribute, path or None for delays)
+_MOCKED = [
+    (search_apis, 'S2_API_URL', '/graph/v1'),
+    (search_apis, 'ARXIV_API_URL', '/api/query'),
+    (search_apis, 'OPENALEX_API_URL', '/openalex'),
+    (search_apis, 'CROSSREF_API_URL', '/crossref'),
+    (pdf_downloader, 'ARXIV_PDF_URL', '/pdf'),
+    (search_apis, 'S2_DELAY', None),
+    (search_apis, 'ARXIV_DELAY', None),
+    (search_apis, 'OPENALEX_DELAY', None),
+    (search_apis, 'CROSSREF_DELAY', None),
+    (pdf_downloader, 'DOWNLOAD_DELAY', None),
+    (pdf_downloader, 'HEAD_DELAY', None),
+]
+
+
+@contextlib.contextmanager
+def pointed_at(server: MockServer, keep_delays: bool = False):
+    """Point the API modules at the mock server (and drop client-side delays)"""
+    saved = [getattr(module, name) for module, name, _ in _MOCKED]
+    for module, name, path in _MOCKED:
+        if path is not None:
+            setattr(module, name, f"{server.url}{path}")
+        elif not keep_delays:
+            setattr(module, name, 0.0)
+    try:
+        yield
+    finally:
+        for (module, name, _), value in zip(_MOCKED, saved):
+            setattr(module, name, value)
+
+
+def timed(fn: Callable, repeat: int = 1) -> float:
+    """Best wall time of repeat runs (stdout of the measured code is discarded)"""
+    best = None
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            started = time.perf_counter()
+            fn()
+            elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def result(stage: str, size: int, seconds: float, unit: str, latencies: Optional[List[float]] = None, **extra) -> Dict:
+    row = {
+        'stage': stage,
+        'size': size,
+        'seconds': round(seconds, 4),
+        'throughput': round(size / seconds, 1) if seconds else None,
+        'unit': unit
+    }
+    if latencies:
+        ordered = sorted(latencies)
+        row['p50_ms'] = round(statistics.median(ordered) * 1000, 2)
+        row['p95_ms'] = round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 2)
+    row.update(extra)
+    return row
+
+
+def bench_search(server: MockServer, sources: List[str], queries: int, max_results: int) -> Dict:
+    """Search each source in turn for synthetic queries and normalize the results"""
+    latencies = []
+    papers = 0
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i in range(queries):
+            query = f"{TOPIC_PHRASES[i % len(TOPIC_PHRASES)]} {i}"
+            for source in select_sources(sources):
+                t = time.perf_counter()
+                results = [source.normalize(p) for p in source.search(query, limit=max_results)]
+                latencies.append(time.perf_counter() - t)
+                papers += len(results)
+    elapsed = time.perf_counter() - started
+    return result('search', papers, elapsed, 'papers/s', latencies,
+                  requests=dict(server.requests), rejected=dict(server.rejected))
+
+
+def bench_pipeline(sources: List[str], queries: int, max_results: int) -> Dict:
+    """search_papers with all sources queried concurrently, deduplicated and scored"""
+    query_list = [f"{TOPIC_PHRASES[i % len(TOPIC_PHRASES)]} {i}" for i in range(queries)]
+    kept = []
+    seconds = timed(lambda: kept.append(len(search_papers(
+        query_list, year_from=2015, max_per_query=max_results, sources=sources, min_score=0.0
+    ))))
+    return result('pipeline', kept[-1], seconds, 'papers/s', sources=len(sources))
+
+
+def bench_download(server: MockServer, downloads: int) -> Dict:
+    """Download PDFs served by the mock server"""
+    papers = make_papers(downloads * 3, base_url=server.url)
+    papers = [p for p in papers if p['pdf_url']][:downloads]
+    with tempfile.TemporaryDirectory() as tmp:
+        seconds = timed(lambda: batch_download_pdfs(papers, Path(tmp)))
+        total_bytes = sum(f.stat().st_size for f in Path(tmp).glob('*.pdf'))
+    return result('download', len(papers), seconds, 'files/s',
+                  mb_per_s=round(total_bytes / seconds / 1e6, 1) if seconds else None)
+
+
+def bench_scoring(papers: List[Dict], repeat: int) -> Dict:
+    seconds = timed(lambda: filter_by_relevance(papers, min_score=5.0, scorer_func=score_atmospheric_profile_paper),
+                    repeat)
+    return result('scoring', len(papers), seconds, 'papers/s')
+
+
+def bench_catalog(papers: List[Dict], repeat: int) -> Dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        output = Path(tmp) / "catalog.json"
+        seconds = timed(lambda: build_catalog(papers, 'benchmark', output), repeat)
+        size = output.stat().st_size
+    return result('catalog', len(papers), seconds, 'papers/s', file_mb=round(size / 1e6, 1))
+
+
+def bench_report(papers: List[Dict], repeat: int) -> Dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        output = Path(tmp) / "report.md"
+        seconds = timed(lambda: generate_search_report(papers, 'benchmark', output, return_report=False), repeat)
+    return result('report', len(papers), seconds, 'papers/s')
+
+
+def bench_similarity(papers: List[Dict], queries: int) -> Dict:
+    """Build a vector index, then time single-paper "more like this" queries"""
+    with tempfile.TemporaryDirectory() as tmp:
+        started = time.perf_counter()
+        index = VectorIndex.create(Path(tmp) / "vectors", papers)
+        build_seconds = time.perf_counter() - started
+
+        ids = [p['id'] for p in papers[::max(1, len(papers) // queries)][:queries]]
+        latencies = []
+        for paper_id in ids:
+            t = time.perf_counter()
+            index.similar_to([paper_id], k=10)
+            latencies.append(time.perf_counter() - t)
+
+        t = time.perf_counter()
+        index.similar_to(ids, k=10)
+        batch_ms = (time.perf_counter() - t) * 1000
+    return result('similarity', len(papers), build_seconds, 'papers/s', latencies,
+                  dim=index.dim, batch_queries=len(ids), batch_ms=round(batch_ms, 1))
+
+
+def print_results(results: List[Dict]):
+    print(f"\n{'Stage':<10} {'Size':>9} {'Seconds':>9} {'Throughput':>18} {'p50 ms':>8} {'p95 ms':>8}")
+    print("-" * 66)
+    for row in results:
+        throughput = f"{row['throughput']:,.1f} {row['unit']}" if row['throughput'] else "-"
+        print(f"{row['stage']:<10} {row['size']:>9,} {row['seconds']:>9.3f} {throughput:>18} "
+              f"{row.get('p50_ms', '-'):>8} {row.get('p95_ms', '-'):>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run offline performance benchmarks')
+
+    parser.add_argument('--stages', nargs='+', default=DEFAULT_STAGES, choices=STAGES,
+                        help='Stages to run (similarity only when listed)')
+    parser.add_argument('--sizes', nargs='+', type=int, default=[10_000, 100_000],
+                        help='Synthetic catalog sizes for scoring/catalog/report/similarity (up to 1000000)')
+    parser.add_argument('--sources', nargs='+', default=list(SOURCES), choices=list(SOURCES),
+                        help='Sources for the search and pipeline stages')
+    parser.add_argument('--queries', type=int, default=20, help='Queries for the search and pipeline stages')
+    parser.add_argument('--max-results', type=int, default=100, help='Results per query and source')
+    parser.add_argument('--similarity-queries', type=int, default=200, help='Queries for the similarity stage')
+    parser.add_argument('--downloads', type=int, default=50, help='PDFs for the download stage')
+    parser.add_argument('--pdf-size', type=int, default=200_000, help='Synthetic PDF size in bytes')
+    parser.add_argument('--latency', type=float, default=0.05, help='Mock server latency in seconds')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Additional random latency in seconds')
+    parser.add_argument('--rate-limit', type=float, help='Mock server requests/second per endpoint (429 above)')
+    parser.add_argument('--keep-delays', action='store_true', help='Keep the client-side rate-limit sleeps')
+    parser.add_argument('--repeat', type=int, default=3, help='Repetitions of in-memory stages (best is reported)')
+    parser.add_argument('--json', type=Path, help='Write results as JSON')
+
+    args = parser.parse_args()
+
+    results = []
+    print("=" * 66)
+    print("BENCHMARKS")
+    print("=" * 66)
+
+    if set(args.stages) & {'search', 'pipeline', 'download'}:
+        with MockServer(latency=args.latency, jitter=args.jitter, rate_limit=args.rate_limit,
+                        pdf_size=args.pdf_size) as server, pointed_at(server, args.keep_delays):
+            print(f"Mock server: {server.url} (latency {args.latency}s, rate limit {args.rate_limit or 'none'})")
+            if 'search' in args.stages:
+                results.append(bench_search(server, args.sources, args.queries, args.max_results))
+            if 'pipeline' in args.stages:
+                results.append(bench_pipeline(args.sources, args.queries, args.max_results))
+            if 'download' in args.stages:
+                results.append(bench_download(server, args.downloads))
+
+    for size in args.sizes:
+        if not set(args.stages) & {'scoring', 'catalog', 'report', 'similarity'}:
+            break
+        print(f"Generating {size:,} synthetic papers...")
+        papers = make_papers(size)
+        if 'scoring' in args.stages:
+            results.append(bench_scoring(papers, args.repeat))
+        if 'catalog' in args.stages:
+            results.append(bench_catalog(papers, args.repeat))
+        if 'report' in args.stages:
+            results.append(bench_report(papers, args.repeat))
+        if 'similarity' in args.stages:
+            results.append(bench_similarity(papers, args.similarity_queries))
+        del papers
+
+    print_results(results)
+
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'args': {k: str(v) if isinstance(v, Path) else v for k, v in vars(args).items()},
+                'results': results
+            }, f, indent=2)
+        print(f"\n✓ Results: {args.json}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
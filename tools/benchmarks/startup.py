@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Startup-time benchmark
+Times cold interpreter launches of the CLIs and the article_search package import
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+TOOLS_DIR = Path(__file__).resolve().parent.parent
+REPO_DIR = TOOLS_DIR.parent
+
+COMMANDS = {
+    'import': ['-c', 'import article_search'],
+    'import-all': ['-c', 'from article_search import *'],
+    'search_papers': [str(TOOLS_DIR / 'search_papers.py'), '--help'],
+    'refresh_catalog': [str(TOOLS_DIR / 'refresh_catalog.py'), '--help'],
+    'orchestrator': [str(REPO_DIR / 'gems' / 'orchestrator_gemini.py'), '--help'],
+}
+
+
+def run_once(args: List[str]) -> float:
+    """Wall time of one fresh interpreter running args"""
+    started = time.perf_counter()
+    subprocess.run([sys.executable, *args], cwd=TOOLS_DIR, stdout=subprocess.DEVNULL,
+                   stderr=subprocess.DEVNULL, check=False)
+    return time.perf_counter() - started
+
+
+def bench_command(name: str, repeat: int) -> Dict:
+    run_once(COMMANDS[name])  # Warm the OS file cache and .pyc files
+    times = sorted(run_once(COMMANDS[name]) for _ in range(repeat))
+    return {
+        'command': name,
+        'runs': repeat,
+        'median_ms': round(statistics.median(times) * 1000, 1),
+        'min_ms': round(times[0] * 1000, 1),
+        'max_ms': round(times[-1] * 1000, 1)
+    }
+
+
+def import_offenders(name: str, top: int = 15) -> List[Dict]:
+    """
+    Slowest top-level imports of one command according to python -X importtime
+
+    Interpreter startup ('site' and what it pulls in) is left out since
+    the tools can't influence it.
+
+    Returns:
+        List of {'module', 'self_ms', 'cumulative_ms'} sorted by cumulative time
+    """
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE='1')
+    completed = subprocess.run([sys.executable, '-X', 'importtime', *COMMANDS[name]], cwd=TOOLS_DIR,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, env=env, check=False)
+    rows = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, module = line[len('import time:'):].split('|')
+        module = module[1:].rstrip()
+        if module.startswith(' ') or module == 'site':
+            continue
+        rows.append({
+            'module': module,
+            'self_ms': round(int(self_us) / 1000, 1),
+            'cumulative_ms': round(int(cumulative_us) / 1000, 1)
+        })
+    rows.sort(key=lambda row: -row['cumulative_ms'])
+    return rows[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure CLI and package startup time')
+    parser.add_argument('--commands', nargs='+', default=list(COMMANDS), choices=list(COMMANDS),
+                        help='Commands to time')
+    parser.add_argument('--repeat', type=int, default=10, help='Launches per command (median is reported)')
+    parser.add_argument('--importtime', action='store_true', help='Also list the slowest imports per command')
+    parser.add_argument('--top', type=int, default=15, help='Imports listed with --importtime')
+    parser.add_argument('--json', type=Path, help='Write results as JSON')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("STARTUP TIME")
+    print("=" * 60)
+    print(f"\n{'Command':<18} {'Median ms':>10} {'Min ms':>9} {'Max ms':>9}")
+    print("-" * 49)
+
+    results = []
+    for name in args.commands:
+        row = bench_command(name, args.repeat)
+        results.append(row)
+        print(f"{name:<18} {row['median_ms']:>10.1f} {row['min_ms']:>9.1f} {row['max_ms']:>9.1f}")
+
+    if args.importtime:
+        for row in results:
+            row['imports'] = import_offenders(row['command'], args.top)
+            print(f"\n{row['command']}: slowest imports (cumulative ms)")
+            for entry in row['imports']:
+                print(f"  {entry['cumulative_ms']:>8.1f}  {entry['module']}")
+
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'results': results
+            }, f, indent=2)
+        print(f"\n✓ Results: {args.json}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Synthetic papers and API payloads for benchmarks
+Deterministic for a given seed, sized from a few papers to millions
+"""
+
+import hashlib
+import random
+import zlib
+from typing import Dict, Iterator, List
+from xml.sax.saxutils import escape
+
+from article_search import ATMOSPHERIC_PROFILE_KEYWORDS, ML_WEATHER_KEYWORDS
+
+# Topic phrases drawn from the scorers, so score distributions look realistic
+TOPIC_PHRASES = sorted({
+    keyword
+    for keyword_sets in (ATMOSPHERIC_PROFILE_KEYWORDS, ML_WEATHER_KEYWORDS)
+    for keywords in keyword_sets.values()
+    for keyword in keywords
+})
+
+FILLER_WORDS = [
+    'analysis', 'approach', 'based', 'case', 'data', 'evaluation', 'framework',
+    'improved', 'method', 'model', 'novel', 'observations', 'regional', 'results',
+    'study', 'system', 'using', 'validation', 'global', 'high-resolution'
+]
+
+SUBTOPICS = ['profiles', 'ml_methods', 'reanalysis', 'satellite', 'general']
+VENUES = ['Journal of Climate', 'Monthly Weather Review', 'GMD', 'QJRMS', 'arXiv preprint']
+SURNAMES = ['Smith', 'Ivanov', 'Wang', 'Garcia', 'Müller', 'Kim', 'Rossi', 'Dubois', 'Sato', 'Novak']
+
+
+def _text(rng: random.Random, n_words: int, topic_ratio: float) -> str:
+    words = []
+    while len(words) < n_words:
+        if rng.random() < topic_ratio:
+            words.extend(rng.choice(TOPIC_PHRASES).split())
+        else:
+            words.append(rng.choice(FILLER_WORDS))
+    return ' '.join(words[:n_words])
+
+
+def iter_papers(n: int, seed: int = 0, base_url: str = "https://example.org") -> Iterator[Dict]:
+    """
+    Yield n normalized papers (as produced by normalize_paper_s2/arxiv)
+
+    Relevance scores are pre-filled so catalog and report stages can run
+    without a scoring pass.
+    """
+    rng = random.Random(seed)
+    for i in range(n):
+        arxiv = i % 2 == 1
+        year = rng.randint(2015, 2025)
+        paper_id = f"arxiv:{year % 100:02d}{rng.randint(1, 12):02d}.{i:05d}v1" if arxiv else f"s2:{i:040x}"
+        pdf_url = f"{base_url}/pdf/{paper_id.split(':', 1)[1]}.pdf" if arxiv or rng.random() < 0.4 else None
+        yield {
+            'id': paper_id,
+            'source': 'arxiv' if arxiv else 'semantic_scholar',
+            'title': _text(rng, rng.randint(6, 14), 0.3).capitalize(),
+            'authors': [f"{rng.choice('ABCDEFGHJKLMNPRST')}. {rng.choice(SURNAMES)}"
+                        for _ in range(rng.randint(1, 6))],
+            'year': year,
+            'abstract': _text(rng, rng.randint(60, 160), 0.15),
+            'citations': 0 if arxiv else int(rng.paretovariate(1.2)) - 1,
+            'venue': 'arXiv preprint' if arxiv else rng.choice(VENUES),
+            'url': f"{base_url}/abs/{paper_id.split(':', 1)[1]}",
+            'pdf_url': pdf_url,
+            'pdf_available': pdf_url is not None,
+            'subtopic': rng.choice(SUBTOPICS),
+            'relevance_score': round(rng.uniform(5.0, 10.0), 1)
+        }
+
+
+def make_papers(n: int, seed: int = 0, base_url: str = "https://example.org") -> List[Dict]:
+    """List form of iter_papers"""
+    return list(iter_papers(n, seed, base_url))
+
+
+def s2_raw(paper: Dict) -> Dict:
+    """Semantic Scholar API representation of a normalized paper"""
+    return {
+        'paperId': paper['id'].split(':', 1)[1],
+        'title': paper['title'],
+        'authors': [{'name': name} for name in paper['authors']],
+        'year': paper['year'],
+        'abstract': paper['abstract'],
+        'citationCount': paper['citations'],
+        'publicationVenue': {'name': paper['venue']},
+        'openAccessPdf': {'url': paper['pdf_url']} if paper['pdf_url'] else None,
+        'url': paper['url']
+    }
+
+
+def _work_key(paper: Dict) -> str:
+    return hashlib.sha1(paper['id'].encode('utf-8')).hexdigest()[:10]
+
+
+def openalex_raw(paper: Dict) -> Dict:
+    """OpenAlex work representation of a normalized paper"""
+    key = _work_key(paper)
+    inverted = {}
+    for position, word in enumerate(paper['abstract'].split()):
+        inverted.setdefault(word, []).append(position)
+    return {
+        'id': f"https://openalex.org/W{int(key, 16)}",
+        'doi': f"https://doi.org/10.5555/{key}",
+        'display_name': paper['title'],
+        'publication_year': paper['year'],
+        'authorships': [{'author': {'display_name': name}} for name in paper['authors']],
+        'abstract_inverted_index': inverted,
+        'cited_by_count': paper['citations'],
+        'primary_location': {'source': {'display_name': paper['venue']}},
+        'best_oa_location': {'pdf_url': paper['pdf_url']} if paper['pdf_url'] else None
+    }
+
+
+def crossref_raw(paper: Dict) -> Dict:
+    """Crossref work representation of a normalized paper"""
+    doi = f"10.5555/{_work_key(paper)}"
+    return {
+        'DOI': doi,
+        'title': [paper['title']],
+        'author': [{'given': name.split(' ', 1)[0], 'family': name.split(' ', 1)[-1]} for name in paper['authors']],
+        'issued': {'date-parts': [[paper['year'], 1, 15]]},
+        'abstract': f"<jats:p>{escape(paper['abstract'])}</jats:p>",
+        'is-referenced-by-count': paper['citations'],
+        'container-title': [paper['venue']],
+        'link': [{'URL': paper['pdf_url'], 'content-type': 'application/pdf'}] if paper['pdf_url'] else [],
+        'URL': f"https://doi.org/{doi}"
+    }
+
+
+def arxiv_atom_feed(papers: List[Dict], base_url: str) -> str:
+    """arXiv API Atom feed for papers (entry links point at base_url)"""
+    entries = []
+    for paper in papers:
+        arxiv_id = paper['id'].split(':', 1)[1]
+        authors = ''.join(f"<author><name>{escape(name)}</name></author>" for name in paper['authors'])
+        entries.append(
+            f"<entry><id>{base_url}/abs/{arxiv_id}</id>"
+            f"<published>{paper['year']}-01-15T00:00:00Z</published>"
+            f"<updated>{paper['year']}-01-15T00:00:00Z</updated>"
+            f"<title>{escape(paper['title'])}</title>"
+            f"<summary>{escape(paper['abstract'])}</summary>{authors}"
+            f"<link href=\"{base_url}/abs/{arxiv_id}\" rel=\"alternate\" type=\"text/html\"/>"
+            f"<link title=\"pdf\" href=\"{base_url}/pdf/{arxiv_id}\" rel=\"related\" type=\"application/pdf\"/>"
+            f"<category term=\"physics.ao-ph\" scheme=\"http://arxiv.org/schemas/atom\"/></entry>"
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<feed xmlns="http://www.w3.org/2005/Atom">'
+        f"<title>arXiv Query</title><id>{base_url}/api/query</id>"
+        f"{''.join(entries)}</feed>"
+    )
+
+
+def make_pdf(size: int, seed: int = 0) -> bytes:
+    """Valid single-page PDF padded to about size bytes with incompressible data"""
+    rng = random.Random(seed)
+    padding = max(0, size - 600)
+    stream = zlib.compress(b"BT /F1 12 Tf 72 720 Td (Benchmark paper) Tj ET")
+    blob = rng.randbytes(padding)
+
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R >>",
+        b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(stream) + stream + b"\nendstream",
+        b"<< /Length %d >>\nstream\n" % len(blob) + blob + b"\nendstream",
+    ]
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
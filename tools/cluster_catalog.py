@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Subtopic clustering tool
+Replaces catalog subtopics with cluster labels, fitting or reusing a saved model
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add tools directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from article_search import (
+    instrumentation,
+    cluster_catalog
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Assign subtopics to a catalog by clustering its papers')
+
+    parser.add_argument('catalog', type=Path, help='Catalog JSON file to relabel')
+    parser.add_argument('--output', type=Path, help='Write the relabeled catalog here (default: overwrite)')
+    parser.add_argument('--model', type=Path, default=Path('papers/subtopic_model'),
+                        help='Subtopic model directory (fitted on this catalog if missing)')
+    parser.add_argument('--clusters', type=int, default=12, help='Number of clusters when fitting')
+    parser.add_argument('--refit', action='store_true', help='Recluster even if the model exists')
+    parser.add_argument('--no-update', action='store_true',
+                        help='Assign with the saved centroids without moving them toward these papers')
+    parser.add_argument('--compact-catalog', action='store_true', help='Write catalog JSON without indentation')
+    parser.add_argument('--profile', action='store_true', help='Print timings and counters at the end')
+
+    args = parser.parse_args()
+    profiler = instrumentation.get_profiler(reset=True)
+
+    print("=" * 80)
+    print("SUBTOPIC CLUSTERING")
+    print("=" * 80)
+
+    try:
+        catalog = cluster_catalog(
+            args.catalog,
+            model_dir=args.model,
+            output_file=args.output,
+            k=args.clusters,
+            refit=args.refit,
+            update=not args.no_update,
+            compact=args.compact_catalog
+        )
+    except FileNotFoundError as e:
+        print(f"❌ {e}")
+        return 1
+
+    if not catalog['papers']:
+        print(f"\n⚠️  No papers to cluster in {args.catalog}")
+        return 0
+
+    terms = catalog['search_metadata'].get('subtopic_terms', {})
+    print(f"\n{'Subtopic':<36} {'Papers':>7}  Top terms")
+    print("-" * 80)
+    for label, count in sorted(catalog['subtopic_counts'].items(), key=lambda item: -item[1]):
+        print(f"{label[:36]:<36} {count:>7}  {', '.join(terms.get(label, [])[:4])}")
+
+    print(f"\n✓ Model: {args.model}")
+    print(f"✓ Catalog: {args.output or args.catalog}")
+
+    if args.profile:
+        print(f"\n{profiler.format_table()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
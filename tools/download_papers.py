@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Budgeted PDF download tool
+Fetches the most relevant PDFs of a catalog within a byte and time window
+"""
+
+import argparse
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add tools directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from article_search import (
+    instrumentation,
+    load_catalog,
+    build_catalog,
+    carry_over_metadata,
+    schedule_downloads
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Download catalog PDFs by relevance within byte and time budgets')
+
+    parser.add_argument('catalog', type=Path, help='Catalog JSON file (local_path is updated in place)')
+    parser.add_argument('--download-dir', type=Path, help='PDF directory (default: <catalog dir>/downloaded)')
+    parser.add_argument('--max-mb', type=float, help='Total download budget (MB)')
+    parser.add_argument('--minutes', type=float, help='Wall-clock budget')
+    parser.add_argument('--max-downloads', type=int, help='Maximum number of PDFs')
+    parser.add_argument('--large-pdf-mb', type=float,
+                        help='Defer PDFs larger than this unless relevance >= --priority-score')
+    parser.add_argument('--priority-score', type=float, default=8.0,
+                        help='Relevance at which large PDFs are still downloaded')
+    parser.add_argument('--min-score', type=float, default=0.0, help='Only papers at or above this relevance')
+    parser.add_argument('--deferred', type=Path, help='Deferred-download list (default: <download-dir>/deferred.json)')
+    parser.add_argument('--compact-catalog', action='store_true', help='Write catalog JSON without indentation')
+    parser.add_argument('--profile', action='store_true', help='Print timings and counters at the end')
+
+    args = parser.parse_args()
+    profiler = instrumentation.get_profiler(reset=True)
+
+    catalog = load_catalog(args.catalog)
+    if catalog is None:
+        print(f"❌ Cannot load catalog: {args.catalog}")
+        return 1
+
+    papers = catalog.get('papers', [])
+    candidates = [p for p in papers if not p.get('local_path') and (p.get('relevance_score') or 0) >= args.min_score]
+    download_dir = args.download_dir or args.catalog.parent / "downloaded"
+
+    print("=" * 80)
+    print("SCHEDULED PDF DOWNLOAD")
+    print("=" * 80)
+    print(f"Catalog: {args.catalog} ({len(candidates)} of {len(papers)} papers without a local PDF)")
+    print(f"Budget: {f'{args.max_mb:g} MB' if args.max_mb else 'unlimited bytes'}, "
+          f"{f'{args.minutes:g} min' if args.minutes else 'no time limit'}\n")
+
+    stats = schedule_downloads(
+        candidates, download_dir,
+        max_bytes=int(args.max_mb * 1e6) if args.max_mb else None,
+        max_seconds=args.minutes * 60 if args.minutes else None,
+        max_downloads=args.max_downloads,
+        large_file_bytes=int(args.large_pdf_mb * 1e6) if args.large_pdf_mb else None,
+        priority_score=args.priority_score,
+        deferred_file=args.deferred
+    )
+
+    # Record local paths and refreshed download counts in the catalog
+    previous = catalog.get('search_metadata', {})
+    metadata = carry_over_metadata(previous)
+    metadata['downloaded'] = datetime.now().isoformat()
+    build_catalog(papers, query=previous.get('query', ''), output_file=args.catalog, metadata=metadata,
+                  compact=args.compact_catalog)
+
+    print(f"\nDownload Statistics:")
+    print(f"  Downloaded: {stats['downloaded']} ({stats['bytes'] / 1e6:.1f} MB in {stats['seconds']}s)")
+    print(f"  Failed: {stats['failed']}")
+    print(f"  Skipped: {stats['skipped']}")
+    for reason, count in stats['deferred_reasons'].items():
+        print(f"  Deferred ({reason}): {count}")
+
+    print(f"\n✓ PDFs: {download_dir}")
+    print(f"✓ Catalog: {args.catalog}")
+
+    if args.profile:
+        print(f"\n{profiler.format_table()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Citation-graph expansion tool
+Grows a catalog from seed papers along Semantic Scholar references and citations
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Add tools directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from article_search import (
+    instrumentation,
+    CitationCache,
+    expand_citations,
+    pagerank,
+    write_adjacency,
+    seed_id,
+    match_semantic_scholar_title,
+    load_catalog,
+    build_catalog,
+    score_atmospheric_profile_paper,
+    score_ml_weather_paper
+)
+
+SCORERS = {
+    'atmospheric': score_atmospheric_profile_paper,
+    'ml_weather': score_ml_weather_paper,
+    'general': score_atmospheric_profile_paper
+}
+
+
+def collect_seeds(args: argparse.Namespace) -> list:
+    """Seed ids from --seeds, --seeds-file, --seed-catalog and --seed-analyses"""
+    seeds = list(args.seeds or [])
+
+    if args.seeds_file:
+        with open(args.seeds_file, 'r') as f:
+            seeds += [line.strip() for line in f if line.strip() and not line.startswith('#')]
+
+    if args.seed_catalog:
+        catalog = load_catalog(args.seed_catalog) or {}
+        papers = sorted(catalog.get('papers', []), key=lambda p: p.get('relevance_score', 0), reverse=True)
+        ids = [seed_id(p) for p in papers]
+        seeds += [i for i in ids if i][:args.seed_top]
+
+    # Analyses (e.g. analysis/papers_analyzed.json) only carry titles
+    if args.seed_analyses:
+        with open(args.seed_analyses, 'r', encoding='utf-8') as f:
+            analyses = json.load(f)
+        entries = analyses.values() if isinstance(analyses, dict) else analyses
+        for entry in entries:
+            if not entry.get('title'):
+                continue
+            match = match_semantic_scholar_title(entry['title'])
+            if match and match.get('paperId'):
+                print(f"  Seed: {entry['title'][:60]} -> {match['paperId']}")
+                seeds.append(match['paperId'])
+            else:
+                print(f"  No Semantic Scholar match: {entry['title'][:60]}")
+
+    return list(dict.fromkeys(seeds))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Expand a paper set along its citation graph')
+
+    parser.add_argument('--seeds', nargs='+', help='Semantic Scholar ids (or ARXIV:<id>, DOI:<doi>)')
+    parser.add_argument('--seeds-file', type=Path, help='File with seed ids (one per line)')
+    parser.add_argument('--seed-catalog', type=Path, help='Use the most relevant papers of a catalog as seeds')
+    parser.add_argument('--seed-top', type=int, default=20, help='Seeds taken from --seed-catalog')
+    parser.add_argument('--seed-analyses', type=Path, help='Analyses JSON whose titles are matched as seeds')
+
+    parser.add_argument('--directions', nargs='+', default=['references', 'citations'],
+                        choices=['references', 'citations'], help='Edges to follow')
+    parser.add_argument('--depth', type=int, default=2, help='Citation hops from the seeds')
+    parser.add_argument('--max-papers', type=int, default=500, help='Maximum papers in the expanded catalog')
+    parser.add_argument('--max-fetches', type=int, default=200,
+                        help='Edge lists fetched from the API (cached ones are free; 0 = cache only)')
+    parser.add_argument('--max-edges', type=int, default=1000, help='Neighbors fetched per paper and direction')
+    parser.add_argument('--max-age-days', type=float, help='Refetch cached edge lists older than this')
+    parser.add_argument('--scorer', type=str, default='atmospheric', choices=list(SCORERS),
+                        help='Relevance scoring type')
+    parser.add_argument('--min-score', type=float, default=5.0, help='Minimum relevance score of discovered papers')
+    parser.add_argument('--subtopic', type=str, default='citation_graph', help='Subtopic category')
+
+    parser.add_argument('--output-dir', type=Path, default=Path('papers'), help='Output directory')
+    parser.add_argument('--cache', type=Path, help='Edge cache (default: <output-dir>/citation_cache.sqlite)')
+    parser.add_argument('--catalog', type=Path, help='Output catalog (default: <output-dir>/citation_catalog.json)')
+    parser.add_argument('--adjacency', type=Path,
+                        help='Output adjacency file (default: <output-dir>/citation_graph.json; .zst/.gz to compress)')
+    parser.add_argument('--compact-catalog', action='store_true', help='Write catalog JSON without indentation')
+    parser.add_argument('--profile', action='store_true', help='Print timings and counters at the end')
+
+    args = parser.parse_args()
+    profiler = instrumentation.get_profiler(reset=True)
+
+    print("=" * 80)
+    print("CITATION GRAPH EXPANSION")
+    print("=" * 80)
+
+    seeds = collect_seeds(args)
+    if not seeds:
+        parser.error("Provide seeds with --seeds, --seeds-file, --seed-catalog or --seed-analyses")
+    print(f"Seeds: {len(seeds)} | depth {args.depth} | directions: {', '.join(args.directions)}")
+
+    with CitationCache(args.cache or args.output_dir / "citation_cache.sqlite") as cache:
+        papers, adjacency, stats = expand_citations(
+            seeds, cache,
+            scorer_func=SCORERS[args.scorer],
+            min_score=args.min_score,
+            max_depth=args.depth,
+            max_papers=args.max_papers,
+            max_fetches=args.max_fetches,
+            directions=args.directions,
+            max_edges=args.max_edges,
+            subtopic=args.subtopic,
+            max_age_days=args.max_age_days
+        )
+
+    if not papers:
+        print("\n❌ No seed papers could be resolved")
+        return 1
+
+    # Rank by position in the local citation graph
+    ranks = pagerank(adjacency, nodes=[p['id'] for p in papers])
+    for paper in papers:
+        paper['pagerank'] = round(ranks[paper['id']], 6)
+
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    catalog_file = args.catalog or args.output_dir / "citation_catalog.json"
+    adjacency_file = args.adjacency or args.output_dir / "citation_graph.json"
+
+    build_catalog(papers, query=f"citation expansion of {len(seeds)} seeds", output_file=catalog_file,
+                  metadata={'scorer': args.scorer, 'seeds': seeds, 'depth': args.depth,
+                            'directions': args.directions, 'crawl_stats': dict(stats)},
+                  compact=args.compact_catalog)
+    write_adjacency(adjacency, adjacency_file, nodes=[p['id'] for p in papers], ranks=ranks)
+
+    print(f"\nCrawl Statistics:")
+    print(f"  Papers: {stats['papers']} ({stats['seeds_missing']} seeds not found)")
+    print(f"  Edge lists: {stats['edges_fetched']} fetched, {stats['edges_cached']} cached, "
+          f"{stats['budget_skipped']} skipped (fetch budget)")
+    print(f"  Metadata lookups: {stats['lookup_fetched']} fetched, {stats['lookup_cached']} cached")
+    print(f"  Below relevance threshold (<{args.min_score}): {stats['below_threshold']}")
+    print(f"  Local graph: {len(papers)} nodes, {sum(len(t) for t in adjacency.values())} edges")
+
+    print(f"\nTop papers by PageRank:")
+    for paper in sorted(papers, key=lambda p: p['pagerank'], reverse=True)[:10]:
+        print(f"  {paper['pagerank']:.4f}  [{paper['year']}] {paper['title'][:70]}")
+
+    print(f"\n✓ Catalog: {catalog_file}")
+    print(f"✓ Adjacency: {adjacency_file}")
+
+    if args.profile:
+        print(f"\n{profiler.format_table()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
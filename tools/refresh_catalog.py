@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Catalog metadata refresh tool
+Updates citation counts, PDF links and abstracts of a saved catalog in bulk
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add tools directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from article_search import (
+    SOURCES,
+    load_catalog,
+    refresh_catalog,
+    score_atmospheric_profile_paper,
+    score_ml_weather_paper
+)
+
+SCORERS = {
+    'atmospheric': score_atmospheric_profile_paper,
+    'ml_weather': score_ml_weather_paper,
+    'general': score_atmospheric_profile_paper
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Refresh metadata of an existing paper catalog')
+
+    parser.add_argument('catalog', type=Path, help='Catalog JSON file to refresh')
+    parser.add_argument('--output', type=Path, help='Write the refreshed catalog here (default: overwrite)')
+    parser.add_argument('--scorer', type=str, choices=list(SCORERS),
+                        help='Relevance scoring type (default: the one recorded in the catalog, else atmospheric)')
+    parser.add_argument('--sources', nargs='+', choices=list(SOURCES),
+                        help='Refresh only papers of these sources (default: all)')
+    parser.add_argument('--no-conditional', action='store_true',
+                        help='Ignore stored ETag / Last-Modified validators and fetch everything')
+    parser.add_argument('--compact-catalog', action='store_true', help='Write catalog JSON without indentation')
+
+    args = parser.parse_args()
+
+    catalog = load_catalog(args.catalog)
+    if catalog is None:
+        print(f"❌ Cannot load catalog: {args.catalog}")
+        return 1
+
+    scorer = args.scorer or catalog.get('search_metadata', {}).get('scorer', 'atmospheric')
+
+    print("=" * 80)
+    print("CATALOG REFRESH")
+    print("=" * 80)
+    print(f"Catalog: {args.catalog} ({len(catalog.get('papers', []))} papers, scorer: {scorer})")
+
+    refreshed = refresh_catalog(
+        args.catalog,
+        output_file=args.output,
+        scorer_func=SCORERS.get(scorer, score_atmospheric_profile_paper),
+        sources=args.sources,
+        conditional=not args.no_conditional,
+        compact=args.compact_catalog,
+        catalog=catalog
+    )
+
+    stats = refreshed['search_metadata']['refresh_stats']
+    print(f"\nRefresh Statistics:")
+    print(f"  Semantic Scholar requests: {stats.get('s2_requests', 0)}")
+    print(f"  arXiv requests: {stats.get('arxiv_requests', 0)} ({stats.get('arxiv_not_modified', 0)} not modified)")
+    for name in SOURCES:
+        if stats.get(f'lookup:{name}'):
+            print(f"  {SOURCES[name].label} lookups: {stats[f'lookup:{name}']} ({stats.get(f'found:{name}', 0)} found)")
+    if stats.get('skipped'):
+        skipped = ', '.join(f"{key[len('skipped:'):]}: {count}" for key, count in sorted(stats.items())
+                            if key.startswith('skipped:'))
+        print(f"  Not refreshed (source not selected or without lookup): {stats['skipped']} ({skipped})")
+    print(f"  Papers updated: {stats.get('updated', 0)}")
+    print(f"  Papers rescored: {stats.get('rescored', 0)}")
+    for key, count in sorted(stats.items()):
+        if key.startswith('field:'):
+            print(f"    {key[len('field:'):]}: {count}")
+
+    print(f"\n✓ Catalog: {args.output or args.catalog}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,24 +6,37 @@
 
 import argparse
 import sys
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 # Add tools directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from article_search import (
-    search_semantic_scholar,
-    search_arxiv,
-    fetch_arxiv_by_id,
-    normalize_paper_s2,
-    normalize_paper_arxiv,
+    instrumentation,
+    SOURCES,
+    SearchSource,
+    select_sources,
     batch_download_pdfs,
-    filter_by_relevance,
+    schedule_downloads,
+    prefilter_by_relevance,
     score_atmospheric_profile_paper,
     score_ml_weather_paper,
+    rescore_with_fulltext,
+    ATMOSPHERIC_PROFILE_KEYWORDS,
+    ML_WEATHER_KEYWORDS,
+    TextCache,
+    CatalogStats,
+    SearchRun,
+    PaperRegistry,
     build_catalog,
+    carry_over_metadata,
+    load_catalog,
     create_links_file,
+    export_to_bibtex,
+    export_to_parquet,
     generate_search_report,
     generate_summary_report
 )
@@ -35,7 +48,10 @@ def search_papers(
     year_from: int = 2021,
     max_per_query: int = 20,
     sources: List[str] = ['arxiv', 'semantic_scholar'],
-    scorer_type: str = "atmospheric"
+    scorer_type: str = "atmospheric",
+    min_score: float = 5.0,
+    run: Optional[SearchRun] = None,
+    registry: Optional[PaperRegistry] = None
 ) -> List[Dict]:
     """
     Search for papers across multiple sources
@@ -45,38 +61,15 @@ def search_papers(
         subtopic: Subtopic category for organization
         year_from: Minimum publication year
         max_per_query: Maximum results per query
-        sources: Which sources to search ('arxiv', 'semantic_scholar')
+        sources: Names of registered sources to search (see article_search.SOURCES)
         scorer_type: Relevance scoring type ('atmospheric', 'ml_weather', 'general')
+        min_score: Minimum relevance score to keep a paper
+        run: Checkpointed run; completed queries are loaded instead of searched
+        registry: Known-paper registry; registered papers are skipped (new-only mode)
 
     Returns:
         List of normalized paper dictionaries
     """
-    all_papers = []
-    seen_ids = set()
-
-    for query in queries:
-        print(f"\n[Query: {query}]")
-
-        # Semantic Scholar
-        if 'semantic_scholar' in sources:
-            print("  Searching Semantic Scholar...")
-            s2_results = search_semantic_scholar(query, year_from=year_from, limit=max_per_query)
-            for paper in s2_results:
-                normalized = normalize_paper_s2(paper, subtopic)
-                if normalized['id'] not in seen_ids:
-                    seen_ids.add(normalized['id'])
-                    all_papers.append(normalized)
-
-        # arXiv
-        if 'arxiv' in sources:
-            print("  Searching arXiv...")
-            arxiv_results = search_arxiv(query, max_results=max_per_query, year_from=year_from)
-            for paper in arxiv_results:
-                normalized = normalize_paper_arxiv(paper, subtopic)
-                if normalized['id'] not in seen_ids:
-                    seen_ids.add(normalized['id'])
-                    all_papers.append(normalized)
-
     # Score papers
     if scorer_type == "atmospheric":
         scorer = score_atmospheric_profile_paper
@@ -85,12 +78,79 @@ def search_papers(
     else:
         scorer = None
 
-    scored_papers = filter_by_relevance(all_papers, min_score=5.0, scorer_func=scorer)
-
-    print(f"\n  Total papers found: {len(all_papers)}")
-    print(f"  After relevance filtering (≥5.0): {len(scored_papers)}")
-
-    return scored_papers
+    all_papers = []
+    seen_ids = set()
+    seen_titles = set()
+    counters = Counter()
+    is_known = (lambda pid, view: registry.is_known(pid, view.get('title'))) if registry is not None else None
+
+    def relevant(raw_papers, paper_id, normalize=None, score_view=None):
+        return prefilter_by_relevance(
+            raw_papers, paper_id, normalize=normalize, min_score=min_score, scorer_func=scorer,
+            score_view=score_view, seen_ids=seen_ids, counters=counters, is_known=is_known,
+            seen_titles=seen_titles
+        )
+
+    def fetch(source: SearchSource, query: str) -> List[Dict]:
+        if run:
+            run.throttle(source.name, source.delay)
+        with instrumentation.span(f"source.{source.name}"):
+            results = source.search(query, year_from=year_from, limit=max_per_query)
+        if run:
+            run.record_call(source.name)
+        return results
+
+    # One worker per source: sources run concurrently, each keeps its own
+    # request rate by working through the queries in order
+    selected = select_sources(sources)
+    pending = [query for query in queries if not (run and run.is_query_done(query))]
+    executors = {source.name: ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"source-{source.name}")
+                 for source in selected}
+    try:
+        futures = {
+            (query, source.name): executors[source.name].submit(fetch, source, query)
+            for query in pending
+            for source in selected
+        }
+
+        for query in queries:
+            if run and run.is_query_done(query):
+                print(f"\n[Query: {query}] (checkpointed, skipping)")
+                all_papers.extend(relevant(run.query_results(query), lambda p: p['id']))
+                continue
+
+            print(f"\n[Query: {query}]")
+            query_papers = []
+
+            # Merge in registry order, so earlier sources win title duplicates
+            for source in selected:
+                results = futures[(query, source.name)].result()
+                print(f"  {source.label}: {len(results)} results")
+                query_papers.extend(relevant(
+                    results, source.paper_id,
+                    normalize=lambda p, source=source: source.normalize(p, subtopic),
+                    score_view=source.score_view
+                ))
+
+            if run:
+                run.record_query(query, query_papers)
+            all_papers.extend(query_papers)
+    finally:
+        for executor in executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    all_papers.sort(key=lambda x: x['relevance_score'], reverse=True)
+    for name, value in counters.items():
+        instrumentation.count(f"search.{name}", value)
+
+    print(f"\n  Total papers found: {counters['fetched']}")
+    print(f"  Duplicates dropped: {counters['duplicate']}")
+    if registry is not None:
+        print(f"  Already catalogued (skipped): {counters['known']}")
+    print(f"  Below relevance threshold (<{min_score}): {counters['below_threshold']}")
+    print(f"  After relevance filtering (≥{min_score}): {len(all_papers)}")
+
+    return all_papers
 
 
 def main():
@@ -99,49 +159,167 @@ def main():
     parser.add_argument('--query', type=str, help='Main search query')
     parser.add_argument('--queries-file', type=Path, help='File with multiple queries (one per line)')
     parser.add_argument('--subtopic', type=str, default='general', help='Subtopic category')
+    parser.add_argument('--subtopic-model', type=Path,
+                        help='Cluster papers into subtopics with this model directory (fitted if missing)')
+    parser.add_argument('--clusters', type=int, default=12, help='Subtopic clusters when --subtopic-model is fitted')
     parser.add_argument('--year-from', type=int, default=2021, help='Minimum publication year')
     parser.add_argument('--max-results', type=int, default=20, help='Max results per query')
     parser.add_argument('--sources', nargs='+', default=['arxiv', 'semantic_scholar'],
-                        choices=['arxiv', 'semantic_scholar'], help='Search sources')
+                        choices=list(SOURCES), help='Search sources (queried concurrently)')
     parser.add_argument('--scorer', type=str, default='atmospheric',
                         choices=['atmospheric', 'ml_weather', 'general'], help='Relevance scoring type')
 
+    parser.add_argument('--min-score', type=float, default=5.0, help='Minimum relevance score')
+    parser.add_argument('--fulltext-rescore', action='store_true',
+                        help='Download papers just below --min-score and rescore them from full text')
+    parser.add_argument('--fulltext-margin', type=float, default=1.5,
+                        help='Score distance below --min-score eligible for full-text rescoring')
+    parser.add_argument('--text-cache', type=Path, help='Extracted PDF text cache (default: <output-dir>/text_cache.sqlite)')
+    parser.add_argument('--retry-failed', action='store_true',
+                        help='Extract PDFs again whose text extraction failed in an earlier run')
+
     parser.add_argument('--download', action='store_true', help='Download PDFs')
     parser.add_argument('--max-downloads', type=int, default=50, help='Maximum PDFs to download')
+    parser.add_argument('--max-download-mb', type=float, help='Byte budget of the download stage (MB)')
+    parser.add_argument('--download-minutes', type=float, help='Wall-clock budget of the download stage')
+    parser.add_argument('--large-pdf-mb', type=float,
+                        help='Defer PDFs larger than this unless relevance >= --priority-score')
+    parser.add_argument('--priority-score', type=float, default=8.0,
+                        help='Relevance at which large PDFs are still downloaded')
     parser.add_argument('--output-dir', type=Path, default=Path('papers'), help='Output directory')
-
-    parser.add_argument('--catalog', type=Path, help='Output catalog JSON file')
+    parser.add_argument('--runs-dir', type=Path, help='Checkpoint directory for search runs (default: <output-dir>/runs)')
+    parser.add_argument('--resume', type=str, metavar='RUN_ID', help='Resume an interrupted search run')
+    parser.add_argument('--registry', type=Path,
+                        help='Known-paper registry shared across runs (default: <output-dir>/paper_registry.sqlite)')
+    parser.add_argument('--new-only', action='store_true', help='Skip papers already in the registry')
+
+    parser.add_argument('--catalog', type=Path, help='Output catalog JSON file (.json.zst / .json.gz to compress)')
+    parser.add_argument('--compact-catalog', action='store_true', help='Write catalog JSON without indentation')
+    parser.add_argument('--max-papers', type=int, help='Keep only the N most relevant papers in the catalog')
     parser.add_argument('--report', type=Path, help='Output report markdown file')
     parser.add_argument('--summary', type=Path, help='Output summary markdown file')
     parser.add_argument('--links', type=Path, help='Output links text file')
+    parser.add_argument('--parquet', type=Path, help='Output columnar Parquet export of the catalog')
+    parser.add_argument('--bibtex', type=Path, help='Output BibTeX file')
+    parser.add_argument('--vector-index', type=Path,
+                        help='Similarity index directory to append catalogued papers to (created if missing)')
+    parser.add_argument('--bibtex-incremental', action='store_true',
+                        help='Append only papers not already in the --bibtex file')
+
+    parser.add_argument('--profile', action='store_true', help='Print per-stage timings and counters at the end')
+    parser.add_argument('--profile-json', type=Path, help='Write the run profile as JSON')
+    parser.add_argument('--prometheus', type=Path, help='Write the run profile as a Prometheus textfile (.prom)')
 
     args = parser.parse_args()
+    profiler = instrumentation.get_profiler(reset=True)
+
+    runs_dir = args.runs_dir or (args.output_dir / "runs")
 
     # Get queries
     queries = []
-    if args.query:
-        queries = [args.query]
-    elif args.queries_file:
-        with open(args.queries_file, 'r') as f:
-            queries = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+    if args.resume:
+        try:
+            run = SearchRun.resume(runs_dir, args.resume)
+        except FileNotFoundError as e:
+            parser.error(str(e))
+        queries = run.state['queries']
+        for name, value in run.state['params'].items():
+            setattr(args, name, value)
     else:
-        parser.error("Must provide either --query or --queries-file")
+        if args.query:
+            queries = [args.query]
+        elif args.queries_file:
+            with open(args.queries_file, 'r') as f:
+                queries = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+        else:
+            parser.error("Must provide either --query, --queries-file or --resume")
+
+        run = SearchRun.create(runs_dir, queries, params={
+            'subtopic': args.subtopic,
+            'year_from': args.year_from,
+            'max_results': args.max_results,
+            'sources': args.sources,
+            'scorer': args.scorer,
+            'min_score': args.min_score,
+            'fulltext_rescore': args.fulltext_rescore,
+            'fulltext_margin': args.fulltext_margin,
+            'new_only': args.new_only
+        })
 
     # Search
     print("=" * 80)
     print("ACADEMIC PAPER SEARCH")
     print("=" * 80)
+    print(f"Run: {run.run_id} ({len(run.results)}/{len(queries)} queries checkpointed)")
 
-    papers = search_papers(
-        queries=queries,
-        subtopic=args.subtopic,
-        year_from=args.year_from,
-        max_per_query=args.max_results,
-        sources=args.sources,
-        scorer_type=args.scorer
-    )
+    try:
+        with PaperRegistry(args.registry or args.output_dir / "paper_registry.sqlite") as registry:
+            return run_search(args, queries, run, registry)
+    except KeyboardInterrupt:
+        print(f"\n\n⏸️  Interrupted. Resume with: --resume {run.run_id} --runs-dir {runs_dir}")
+        return 130
+    finally:
+        write_profile(args, profiler)
+
+
+def write_profile(args: argparse.Namespace, profiler: instrumentation.Profiler):
+    """Emit the run profile in the requested formats"""
+    if args.profile:
+        print(f"\n{'=' * 80}")
+        print("RUN PROFILE")
+        print("=" * 80)
+        print(profiler.format_table())
+    if args.profile_json:
+        profiler.write_json(args.profile_json)
+        print(f"✓ Profile: {args.profile_json}")
+    if args.prometheus:
+        profiler.write_prometheus(args.prometheus)
+        print(f"✓ Prometheus metrics: {args.prometheus}")
+
+
+def run_search(args: argparse.Namespace, queries: List[str], run: SearchRun, registry: PaperRegistry) -> int:
+    """Search, download and write outputs for a (possibly resumed) run"""
+    search_min_score = args.min_score - args.fulltext_margin if args.fulltext_rescore else args.min_score
+    with instrumentation.span('stage.search'):
+        papers = search_papers(
+            queries=queries,
+            subtopic=args.subtopic,
+            year_from=args.year_from,
+            max_per_query=args.max_results,
+            sources=args.sources,
+            scorer_type=args.scorer,
+            min_score=search_min_score,
+            run=run,
+            registry=registry if args.new_only else None
+        )
+
+    # Second-stage full-text rescoring of papers just below the threshold
+    if args.fulltext_rescore:
+        borderline = [p for p in papers if p['relevance_score'] < args.min_score]
+        papers = [p for p in papers if p['relevance_score'] >= args.min_score]
+
+        if borderline:
+            print(f"\n{'=' * 80}")
+            print(f"FULL-TEXT RESCORING ({len(borderline)} borderline papers)")
+            print("=" * 80)
+
+            keyword_sets = ML_WEATHER_KEYWORDS if args.scorer == 'ml_weather' else ATMOSPHERIC_PROFILE_KEYWORDS
+            with instrumentation.span('stage.fulltext'), \
+                    TextCache(args.text_cache or args.output_dir / "text_cache.sqlite") as cache:
+                batch_download_pdfs(borderline, args.output_dir / "downloaded", max_downloads=args.max_downloads)
+                promoted = rescore_with_fulltext(
+                    borderline, keyword_sets, cache,
+                    min_score=args.min_score, margin=args.fulltext_margin,
+                    retry_failed=args.retry_failed
+                )
+
+            print(f"  Promoted by full text (≥{args.min_score}): {len(promoted)}")
+            papers = sorted(papers + promoted, key=lambda x: x['relevance_score'], reverse=True)
 
     if not papers:
+        if args.new_only:
+            print("\n✓ No new papers since the last catalogued run")
+            return 0
         print("\n❌ No papers found matching criteria")
         return 1
 
@@ -152,24 +330,115 @@ def main():
         print("=" * 80)
 
         download_dir = args.output_dir / "downloaded"
-        stats = batch_download_pdfs(papers, download_dir, max_downloads=args.max_downloads)
+        with instrumentation.span('stage.download'):
+            stats = schedule_downloads(
+                papers, download_dir, max_downloads=args.max_downloads,
+                max_bytes=int(args.max_download_mb * 1e6) if args.max_download_mb else None,
+                max_seconds=args.download_minutes * 60 if args.download_minutes else None,
+                large_file_bytes=int(args.large_pdf_mb * 1e6) if args.large_pdf_mb else None,
+                priority_score=args.priority_score,
+                skip_ids=run.failed_download_ids(), on_result=run.record_download
+            )
 
         print(f"\nDownload Statistics:")
-        print(f"  Downloaded: {stats['downloaded']}")
+        print(f"  Downloaded: {stats['downloaded']} ({stats['bytes'] / 1e6:.1f} MB in {stats['seconds']}s)")
         print(f"  Failed: {stats['failed']}")
         print(f"  Skipped: {stats['skipped']}")
+        if stats['deferred']:
+            reasons = ', '.join(f"{reason}: {count}" for reason, count in stats['deferred_reasons'].items())
+            print(f"  Deferred to the next run: {stats['deferred']} ({reasons})")
 
+    with instrumentation.span('stage.outputs'):
+        catalog_file = write_outputs(args, queries, papers, registry)
+
+    print(f"\n{'=' * 80}")
+    print("SEARCH COMPLETE")
+    print("=" * 80 + "\n")
+    print(f"Total: {len(papers)} papers")
+    print(f"Catalog: {catalog_file}")
+
+    run.mark_complete(catalog_file)
+    return 0
+
+
+def write_outputs(args: argparse.Namespace, queries: List[str], papers: List[Dict], registry: PaperRegistry) -> Path:
+    """Write catalog and the requested exports; returns the catalog path"""
     # Generate outputs
     args.output_dir.mkdir(parents=True, exist_ok=True)
+    metadata = {'scorer': args.scorer}
+
+    # Subtopics from clusters instead of --subtopic
+    if args.subtopic_model:
+        from article_search import assign_subtopics  # numpy only when clustering
+
+        model = assign_subtopics(papers, args.subtopic_model, k=args.clusters)
+        if model is not None:
+            metadata['subtopic_model'] = str(args.subtopic_model)
+            metadata['subtopic_terms'] = model.cluster_terms()
+            print(f"\n✓ Subtopics: {model.k} clusters ({args.subtopic_model})")
+
+    # One statistics pass shared by catalog and report
+    stats = CatalogStats.from_papers(papers)
 
     # Catalog
     catalog_file = args.catalog or (args.output_dir / "papers_catalog.json")
-    catalog = build_catalog(papers, query=' | '.join(queries), output_file=catalog_file)
-    print(f"\n✓ Catalog: {catalog_file}")
+    catalog_papers, catalog_stats = papers, stats
+    if args.new_only and catalog_file.exists():
+        # New papers are merged into the cumulative catalog, never replace it
+        previous = load_catalog(catalog_file)
+        if previous is None:
+            raise SystemExit(f"❌ Cannot load {catalog_file}; not overwriting it with the new papers only")
+        new_ids = {paper['id'] for paper in papers}
+        catalog_papers = [p for p in previous.get('papers', []) if p.get('id') not in new_ids] + papers
+        catalog_stats = CatalogStats.from_papers(catalog_papers)
+        metadata = dict(carry_over_metadata(previous.get('search_metadata', {}), exclude=('query', 'date')),
+                        **metadata)
+        metadata['new_papers'] = len(papers)
+    vector_index = None
+    if args.vector_index:
+        from article_search import VectorIndex  # numpy only when indexing
+
+        if (args.vector_index / "index.json").exists():
+            vector_index = VectorIndex.open(args.vector_index)
+            indexed = len(vector_index)
+    catalog = build_catalog(catalog_papers, query=' | '.join(queries), output_file=catalog_file,
+                            metadata=metadata, stats=catalog_stats, max_papers=args.max_papers,
+                            compact=args.compact_catalog, vector_index=vector_index)
+    if catalog_papers is papers:
+        print(f"\n✓ Catalog: {catalog_file}")
+    else:
+        print(f"\n✓ Catalog: {catalog_file} ({len(papers)} new, {len(catalog['papers'])} total)")
+    registered = papers
+    if len(catalog['papers']) < len(catalog_papers):
+        print(f"  Kept the top {len(catalog['papers'])} of {len(catalog_papers)} papers (--max-papers)")
+        # Papers left out stay unregistered, so --new-only finds them again
+        kept_ids = {paper['id'] for paper in catalog['papers']}
+        registered = [paper for paper in papers if paper['id'] in kept_ids]
+
+    # Similarity index
+    if args.vector_index:
+        if vector_index is None:
+            vector_index = VectorIndex.create(args.vector_index, catalog['papers'])
+            indexed = 0
+        print(f"✓ Vector index: {args.vector_index} ({len(vector_index) - indexed} new, {len(vector_index)} indexed)")
+
+    # Remember catalogued papers for later --new-only runs
+    new_count = registry.add_papers(registered)
+    print(f"✓ Registry: {registry.registry_file} ({new_count} new, {len(registry)} known)")
+
+    # Parquet export
+    if args.parquet:
+        export_to_parquet(catalog['papers'], args.parquet)
+        print(f"✓ Parquet: {args.parquet}")
+
+    # BibTeX
+    if args.bibtex:
+        written = export_to_bibtex(catalog['papers'], args.bibtex, incremental=args.bibtex_incremental)
+        print(f"✓ BibTeX: {args.bibtex} ({written} entries written)")
 
     # Report
     if args.report:
-        generate_search_report(papers, ' | '.join(queries), args.report)
+        generate_search_report(papers, ' | '.join(queries), args.report, return_report=False, stats=stats)
         print(f"✓ Report: {args.report}")
 
     # Summary
@@ -185,13 +454,7 @@ def main():
         create_links_file(papers, links_file, group_by='subtopic')
         print(f"✓ Links: {links_file}")
 
-    print(f"\n{'=' * 80}")
-    print("SEARCH COMPLETE")
-    print("=" * 80)\n")
-    print(f"Total: {len(papers)} papers")
-    print(f"Catalog: {catalog_file}")
-
-    return 0
+    return catalog_file
 
 
 if __name__ == "__main__":
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+"More like this" tool
+Builds a local embedding index over catalog abstracts and finds the nearest papers
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# Add tools directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from article_search import (
+    instrumentation,
+    VectorIndex,
+    load_catalog
+)
+
+
+def load_papers(catalog_files: list) -> list:
+    """Papers of one or more catalogs (first occurrence of an id wins)"""
+    papers = {}
+    for catalog_file in catalog_files:
+        catalog = load_catalog(catalog_file)
+        if catalog is None:
+            raise SystemExit(f"❌ Cannot load catalog: {catalog_file}")
+        for paper in catalog.get('papers', []):
+            papers.setdefault(paper.get('id'), paper)
+    papers.pop(None, None)
+    return list(papers.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Find similar papers with a local embedding index')
+
+    parser.add_argument('--index', type=Path, default=Path('papers/vector_index'), help='Index directory')
+    parser.add_argument('--build', nargs='+', type=Path, metavar='CATALOG',
+                        help='(Re)build the index from catalogs, fitting a new embedding')
+    parser.add_argument('--add', nargs='+', type=Path, metavar='CATALOG',
+                        help='Append papers of catalogs that are not indexed yet')
+    parser.add_argument('--method', choices=['svd', 'model'], default='svd',
+                        help='Embedding for --build: hashing + SVD, or a local sentence-transformers model')
+    parser.add_argument('--dim', type=int, default=128, help='SVD dimensions for --build')
+    parser.add_argument('--model', type=str, default='sentence-transformers/all-MiniLM-L6-v2',
+                        help='Model for --method model')
+
+    parser.add_argument('--id', nargs='+', dest='ids', help='Paper ids to find neighbors of')
+    parser.add_argument('--text', type=str, help='Free-text query')
+    parser.add_argument('-k', '--top', type=int, default=10, help='Neighbors per query')
+    parser.add_argument('--json', type=Path, help='Write results as JSON')
+    parser.add_argument('--profile', action='store_true', help='Print timings and counters at the end')
+
+    args = parser.parse_args()
+    profiler = instrumentation.get_profiler(reset=True)
+
+    if args.build:
+        papers = load_papers(args.build)
+        print(f"Building index over {len(papers)} papers ({args.method})...")
+        started = time.perf_counter()
+        index = VectorIndex.create(args.index, papers, method=args.method, dim=args.dim, model_name=args.model)
+        print(f"✓ Index: {args.index} ({len(index)} papers, dim {index.dim}, "
+              f"{time.perf_counter() - started:.1f}s)")
+    else:
+        try:
+            index = VectorIndex.open(args.index)
+        except FileNotFoundError as e:
+            print(f"❌ {e} (create it with --build)")
+            return 1
+
+    if args.add:
+        added = index.add_papers(load_papers(args.add))
+        print(f"✓ Added {added} papers ({len(index)} indexed)")
+
+    results = {}
+    if args.ids:
+        missing = [paper_id for paper_id in args.ids if paper_id not in index.rows]
+        for paper_id in missing:
+            print(f"❌ Not indexed: {paper_id}")
+        found = [paper_id for paper_id in args.ids if paper_id in index.rows]
+        if found:
+            results.update(zip(found, index.similar_to(found, k=args.top)))
+    if args.text:
+        results[args.text] = index.search_text([args.text], k=args.top)[0]
+
+    for query, hits in results.items():
+        source = index.papers[index.rows[query]] if query in index.rows else None
+        print(f"\nSimilar to: {source['title'] if source else query}"[:100])
+        for paper, score in hits:
+            print(f"  {score:.3f}  [{paper.get('year')}] {(paper.get('title') or '')[:70]}  ({paper['id']})")
+
+    if args.json and results:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({query: [dict(paper, similarity=round(score, 4)) for paper, score in hits]
+                       for query, hits in results.items()}, f, indent=2, ensure_ascii=False)
+        print(f"\n✓ Results: {args.json}")
+
+    if args.profile:
+        print(f"\n{profiler.format_table()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
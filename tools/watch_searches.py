@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+Saved-search watch daemon
+Re-runs saved searches on a schedule in one long-lived process and reports new papers
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import signal
+import sys
+import threading
+import time
+import traceback
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Add tools directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from article_search import (
+    instrumentation,
+    SOURCES,
+    CatalogStats,
+    KnownPaperSet,
+    PaperRegistry,
+    build_catalog,
+    carry_over_metadata,
+    load_catalog,
+    close_session
+)
+from search_papers import search_papers
+
+# Defaults of a saved search entry
+SEARCH_DEFAULTS = {
+    'scorer': 'atmospheric',
+    'subtopic': 'general',
+    'sources': ['arxiv', 'semantic_scholar'],
+    'year_from': 2021,
+    'max_results': 20,
+    'min_score': 5.0,
+    'interval_minutes': 1440,
+    'compact': True,
+    'rewrite_after': 1000  # Delta papers before the catalog file is rewritten
+}
+
+DELTA_SUFFIX = '.delta.jsonl'
+
+
+class SavedSearch:
+    """
+    One saved search and its warm in-memory state
+
+    The papers, their statistics (CatalogStats, updated incrementally) and
+    the set of catalogued ids and titles stay in memory between runs. A run
+    only searches, scores and merges papers that are not catalogued yet.
+
+    New papers are appended to <catalog>.delta.jsonl, so a run writes only
+    its delta. The catalog file is rewritten (and the delta file removed)
+    once rewrite_after delta papers have piled up, and on rewrite_catalog().
+    Loading a search reads the catalog and then its delta file.
+    """
+
+    def __init__(self, config: Dict, output_dir: Path):
+        self.config = dict(SEARCH_DEFAULTS, **config)
+        self.name = self.config['name']
+        self.catalog_file = Path(self.config.get('catalog') or output_dir / f"{self.name}_catalog.json")
+        self.delta_file = self.catalog_file.with_name(self.catalog_file.name + DELTA_SUFFIX)
+        self.metadata = None
+        self.query = None
+        self.papers = None
+        self.pending = 0
+        self.stats = None
+        self.known = None
+
+    @property
+    def interval(self) -> float:
+        return self.config['interval_minutes'] * 60
+
+    def queries(self) -> List[str]:
+        """Queries of the search (re-read each run, so edits apply without a restart)"""
+        if self.config.get('queries_file'):
+            with open(self.config['queries_file'], 'r') as f:
+                return [q.strip() for q in f if q.strip() and not q.startswith('#')]
+        return list(self.config.get('queries', []))
+
+    def _load(self):
+        """Catalog plus delta file, statistics and known papers (once per process)"""
+        catalog = load_catalog(self.catalog_file) if self.catalog_file.exists() else None
+        if catalog is None and self.catalog_file.exists():
+            raise RuntimeError(f"Cannot load catalog {self.catalog_file}")
+        self.metadata = (catalog or {}).get('search_metadata', {})
+        self.query = self.metadata.get('query', '')
+        self.papers = (catalog or {}).get('papers', [])
+        self.known = KnownPaperSet(self.papers)
+
+        if self.delta_file.exists():
+            with open(self.delta_file, 'r', encoding='utf-8') as f:
+                delta = [json.loads(line) for line in f if line.strip()]
+            # Papers already folded into the catalog (interrupted rewrite) are skipped
+            delta = [paper for paper in delta if paper['id'] not in self.known.ids]
+            self.known.add_papers(delta)
+            self.papers.extend(delta)
+            self.pending = len(delta)
+        self.stats = CatalogStats.from_papers(self.papers)
+
+    def _append_delta(self, papers: List[Dict]):
+        """Append new papers to the delta file (one JSON object per line)"""
+        with instrumentation.span('watch.delta'), open(self.delta_file, 'a', encoding='utf-8') as f:
+            for paper in papers:
+                f.write(json.dumps(paper, ensure_ascii=False) + "\n")
+        instrumentation.count('watch.delta_papers', len(papers))
+        self.pending += len(papers)
+
+    def rewrite_catalog(self):
+        """Fold the delta file into the catalog file"""
+        if not self.pending:
+            return
+        metadata = carry_over_metadata(self.metadata, exclude=('query', 'date'))
+        metadata.update({'scorer': self.config['scorer'], 'watch_search': self.name,
+                         'watched': datetime.now().isoformat()})
+        with instrumentation.span('watch.catalog'):
+            catalog = build_catalog(self.papers, query=self.query, output_file=self.catalog_file,
+                                    metadata=metadata, stats=self.stats, compact=self.config['compact'])
+        self.metadata = catalog['search_metadata']
+        self.papers = catalog['papers']
+        self.delta_file.unlink(missing_ok=True)
+        self.pending = 0
+
+    def run(self, registry: Optional[PaperRegistry] = None, quiet: bool = True) -> Dict:
+        """
+        Search for papers not in the catalog and merge them in
+
+        Args:
+            registry: Shared registry; new papers are registered for --new-only CLI runs
+            quiet: Discard search_papers progress output
+
+        Returns:
+            Run summary {'search', 'started', 'seconds', 'queries', 'new', 'total', 'counters', 'new_papers'}
+        """
+        if self.known is None:
+            self._load()
+
+        started = time.perf_counter()
+        profiler = instrumentation.get_profiler(reset=True)
+        queries = self.queries()
+        self.query = ' | '.join(queries)
+        output = io.StringIO() if quiet else sys.stdout
+        with contextlib.redirect_stdout(output):
+            new_papers = search_papers(
+                queries,
+                subtopic=self.config['subtopic'],
+                year_from=self.config['year_from'],
+                max_per_query=self.config['max_results'],
+                sources=self.config['sources'],
+                scorer_type=self.config['scorer'],
+                min_score=self.config['min_score'],
+                registry=self.known
+            )
+
+        if new_papers:
+            # Apply the delta: statistics and known set are updated, not recomputed
+            self._append_delta(new_papers)
+            self.known.add_papers(new_papers)
+            self.stats.update(new_papers)
+            self.papers.extend(new_papers)
+            if self.pending >= self.config['rewrite_after']:
+                self.rewrite_catalog()
+            if registry is not None:
+                registry.add_papers(new_papers)
+
+        profile = profiler.to_dict()
+        return {
+            'search': self.name,
+            'started': datetime.now().isoformat(),
+            'seconds': round(time.perf_counter() - started, 2),
+            'queries': len(queries),
+            'new': len(new_papers),
+            'total': len(self.known),
+            'counters': profile['counters'],
+            'new_papers': new_papers
+        }
+
+
+def new_papers_report(summary: Dict, report_file: Path, top_n: int = 50):
+    """Compact markdown list of the papers a run added"""
+    counters = summary['counters']
+    lines = [
+        f"# New papers: {summary['search']}\n",
+        f"**Run**: {summary['started'][:16].replace('T', ' ')} | "
+        f"**New**: {summary['new']} | **Catalog**: {summary['total']} papers | "
+        f"**Fetched**: {counters.get('search.fetched', 0)} "
+        f"({counters.get('search.known', 0)} already catalogued) | **Time**: {summary['seconds']}s\n",
+    ]
+    for paper in summary['new_papers'][:top_n]:
+        lines.append(f"- **{paper.get('relevance_score', 0)}** [{paper.get('year', 'N/A')}] "
+                     f"{paper['title']} — {paper.get('url', '')}")
+    if summary['new'] > top_n:
+        lines.append(f"- ... and {summary['new'] - top_n} more (see the catalog)")
+
+    report_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(report_file, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines) + '\n')
+
+
+class WatchDaemon:
+    """
+    Scheduler for saved searches
+
+    The searches file is reloaded when it changes. Last-run times are kept
+    in the state file, so a restart resumes the schedule instead of
+    re-running every search. SIGTERM / SIGINT stop the loop after the
+    current search, and the catalogs are rewritten with their deltas.
+    """
+
+    def __init__(self, searches_file: Path, output_dir: Path, registry: Optional[PaperRegistry] = None,
+                 quiet: bool = True, prometheus: Optional[Path] = None):
+        self.searches_file = Path(searches_file)
+        self.output_dir = Path(output_dir)
+        self.state_file = self.output_dir / "watch_state.json"
+        self.log_file = self.output_dir / "watch_log.jsonl"
+        self.registry = registry
+        self.quiet = quiet
+        self.prometheus = prometheus
+        self.searches: Dict[str, SavedSearch] = {}
+        self.state: Dict[str, Dict] = {}
+        self.stop_event = threading.Event()
+        self._searches_mtime = None
+
+        if self.state_file.exists():
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                self.state = json.load(f)
+
+    def reload(self):
+        """(Re)load saved searches if the file changed; warm state of unchanged searches is kept"""
+        mtime = self.searches_file.stat().st_mtime
+        if mtime == self._searches_mtime:
+            return
+        self._searches_mtime = mtime
+        with open(self.searches_file, 'r', encoding='utf-8') as f:
+            configs = json.load(f)
+        configs = configs.get('searches', []) if isinstance(configs, dict) else configs
+
+        searches = {}
+        for config in configs:
+            unknown = set(config.get('sources', [])) - set(SOURCES)
+            if unknown:
+                print(f"❌ {config.get('name')}: unknown sources {', '.join(sorted(unknown))}")
+                continue
+            current = self.searches.get(config['name'])
+            if current and current.config == dict(SEARCH_DEFAULTS, **config):
+                searches[config['name']] = current
+            else:
+                searches[config['name']] = SavedSearch(config, self.output_dir)
+        for name, search in self.searches.items():
+            if searches.get(name) is not search:
+                search.rewrite_catalog()  # Changed or removed: fold its delta before dropping it
+        self.searches = searches
+        print(f"✓ Saved searches: {', '.join(self.searches) or 'none'}")
+
+    def next_due(self, search: SavedSearch) -> float:
+        last_run = self.state.get(search.name, {}).get('last_run', 0)
+        return last_run + search.interval
+
+    def _save_state(self):
+        tmp_file = self.state_file.with_name(self.state_file.name + '.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, indent=2)
+        tmp_file.replace(self.state_file)
+
+    def run_search(self, search: SavedSearch):
+        """Run one search, write its report and log line, and record it in the state"""
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+        try:
+            summary = search.run(self.registry, quiet=self.quiet)
+        except Exception as e:
+            # Retry at the next interval; the daemon keeps serving other searches
+            print(f"❌ {search.name}: {e}")
+            traceback.print_exc()
+            summary = {'search': search.name, 'started': datetime.now().isoformat(), 'error': str(e)}
+        else:
+            if summary['new']:
+                report_file = self.output_dir / "reports" / f"{search.name}_{stamp}.md"
+                new_papers_report(summary, report_file)
+                summary['report'] = str(report_file)
+            print(f"✓ {search.name}: {summary['new']} new papers "
+                  f"({summary['total']} catalogued, {summary['seconds']}s)")
+            if self.prometheus:
+                instrumentation.get_profiler().write_prometheus(self.prometheus)
+
+        self.state[search.name] = {'last_run': time.time(), 'last_summary': {
+            key: value for key, value in summary.items() if key not in ('new_papers', 'counters')
+        }}
+        self._save_state()
+
+        with open(self.log_file, 'a', encoding='utf-8') as f:
+            record = {key: value for key, value in summary.items() if key != 'new_papers'}
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def run_due(self) -> int:
+        """Run every search that is due; returns how many ran"""
+        ran = 0
+        for search in list(self.searches.values()):
+            if self.stop_event.is_set():
+                break
+            if self.next_due(search) <= time.time():
+                self.run_search(search)
+                ran += 1
+        return ran
+
+    def serve(self, poll_seconds: float = 30.0):
+        """Run searches as they become due until stopped"""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        while not self.stop_event.is_set():
+            self.reload()
+            self.run_due()
+            due = [self.next_due(search) for search in self.searches.values()]
+            wait = min(due) - time.time() if due else poll_seconds
+            # Wake up at least every poll_seconds to pick up edits of the searches file
+            self.stop_event.wait(max(1.0, min(wait, poll_seconds)))
+        self.rewrite_catalogs()
+
+    def rewrite_catalogs(self):
+        """Fold pending deltas of the searches run in this process into the catalog files"""
+        for search in self.searches.values():
+            if search.known is None:
+                continue  # Not run: its delta is folded in when it runs next
+            if search.pending:
+                search.rewrite_catalog()
+                print(f"✓ {search.name}: catalog rewritten ({search.catalog_file})")
+
+    def stop(self, *_):
+        print("\nStopping after the current search...")
+        self.stop_event.set()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Re-run saved searches on a schedule and report new papers')
+
+    parser.add_argument('searches', type=Path, help='Saved searches JSON file')
+    parser.add_argument('--output-dir', type=Path, default=Path('papers/watch'),
+                        help='Catalogs, reports, state and log directory')
+    parser.add_argument('--registry', type=Path,
+                        help='Known-paper registry to register new papers in (shared with search_papers.py --new-only)')
+    parser.add_argument('--once', action='store_true', help='Run the searches that are due, then exit')
+    parser.add_argument('--force', action='store_true', help='Treat every search as due (with --once)')
+    parser.add_argument('--keep-delta', action='store_true',
+                        help='With --once, leave new papers in the delta files instead of rewriting the catalogs')
+    parser.add_argument('--poll', type=float, default=30.0, help='Seconds between checks for due searches')
+    parser.add_argument('--verbose', action='store_true', help='Show search progress output')
+    parser.add_argument('--prometheus', type=Path, help='Write the last run profile as a Prometheus textfile (.prom)')
+
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("SAVED SEARCH WATCH")
+    print("=" * 80)
+
+    registry = PaperRegistry(args.registry) if args.registry else None
+    daemon = WatchDaemon(args.searches, args.output_dir, registry=registry, quiet=not args.verbose,
+                         prometheus=args.prometheus)
+    try:
+        if args.once:
+            args.output_dir.mkdir(parents=True, exist_ok=True)
+            daemon.reload()
+            if args.force:
+                daemon.state = {}
+            ran = daemon.run_due()
+            if not args.keep_delta:
+                daemon.rewrite_catalogs()
+            print(f"\n✓ {ran} searches run")
+        else:
+            signal.signal(signal.SIGTERM, daemon.stop)
+            signal.signal(signal.SIGINT, daemon.stop)
+            daemon.serve(poll_seconds=args.poll)
+    finally:
+        if registry is not None:
+            registry.close()
+        close_session()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())